@@ -3,8 +3,9 @@ import re
 import asyncio
 import wave
 from queue import Queue
+from functools import partial
 from os import environ
-from threading import Thread
+from threading import Event, Thread
 from time import sleep
 
 import numpy as np
@@ -21,8 +22,10 @@ from sic_framework.services.dialogflow.dialogflow import DialogflowConf
 from sic_framework.services.llm import GPTConf, GPTRequest
 from dotenv import load_dotenv
 
+from agents.playback_gate import PlaybackGate
 from agents.stt_manager import RealTimeSTTService, DialogFlowSTTService
-from agents.tts_manager import NaoqiTTSConf, TTSConf, TTSCacher, ElevenLabsTTSConf, ElevenLabsTTS
+from agents.tts_manager import NaoqiTTSConf, TTSConf, TTSCacher, ElevenLabsTTSConf, ElevenLabsTTS, PCMCache
+from interaction import session_store, tracing
 from interaction.utterance_log import build_utterance_log_path, format_utterance_log_line
 
 
@@ -30,7 +33,8 @@ class InteractionConf:
 
     def __init__(self, speaking_rate=None, sleep_time=0, animated=True, max_attempts=2, amplified=False,
                  always_regenerate=False, real_time_stt=True, external_audio_device_id=None, participant_id=None,
-                 adaptive=True):
+                 adaptive=True, stream_guesses=False, barge_in=False, early_clue_endpoint=True,
+                 profile_feature_worker=False, feature_workers=1):
         self.speaking_rate = speaking_rate
         self.sleep_time = sleep_time
         self.animated = animated
@@ -41,6 +45,11 @@ class InteractionConf:
         self.participant_id = participant_id
         self.external_audio_device_id = external_audio_device_id
         self.adaptive = adaptive
+        self.stream_guesses = stream_guesses
+        self.barge_in = barge_in
+        self.early_clue_endpoint = early_clue_endpoint
+        self.profile_feature_worker = profile_feature_worker
+        self.feature_workers = feature_workers
 
     @staticmethod
     def apply_config_defaults(config_attr, param_names):
@@ -97,6 +106,8 @@ class DialogManager:
         print('Complete')
 
         print("\n SETTING UP TTS")
+        # Playback timestamps for echo gating of the recorder and STT
+        self.playback_gate = PlaybackGate()
         self.tts_conf = tts_conf
         if isinstance(self.tts_conf, ElevenLabsTTSConf):
             self.sample_rate = 22050
@@ -105,14 +116,13 @@ class DialogManager:
                                      model_id=self.tts_conf.model_id,
                                      sample_rate=self.sample_rate,
                                      speaking_rate=self.tts_conf.speaking_rate,
-                                     stability=self.tts_conf.stability)
+                                     stability=self.tts_conf.stability,
+                                     pool_size=self.tts_conf.pool_size)
+            # The pool keeps its websockets alive with background pings, no keepalive synthesis needed
             connect_to_elevenlabs_future = asyncio.run_coroutine_threadsafe(self.tts.connect(),
                                                                             self.background_loop)
             try:
                 connect_to_elevenlabs_future.result()
-                asyncio.run_coroutine_threadsafe(self.tts.speak("Initializing text to speech"), self.background_loop).result()
-                elevenlabs_thread = Thread(target=self._connect_elevenlabs, daemon=True)
-                elevenlabs_thread.start()
                 print('Elevenlabs TTS activated')
             except Exception as e:
                 self.logger.error("Failed to connect to elevenlabs", exc_info=e)
@@ -121,6 +131,7 @@ class DialogManager:
         else:
             raise ValueError(f"Unknown tts_conf {self.tts_conf}")
         self.tts_cacher = TTSCacher()
+        self.pcm_cache = PCMCache()
         print("Complete")
 
         print("\n SETTING UP DEVICE MANAGER")
@@ -144,9 +155,12 @@ class DialogManager:
 
         print("\n SETTING UP STT")
         if self.interaction_conf.real_time_stt:
-            self.stt_service = RealTimeSTTService(mic_index=self.device_manager.mic.device_index)
+            self.stt_service = RealTimeSTTService(mic_index=self.device_manager.mic.device_index,
+                                                  playback_gate=self.playback_gate,
+                                                  early_clue_endpoint=self.interaction_conf.early_clue_endpoint)
         else:
-            self.stt_service = DialogFlowSTTService(mic_index=self.device_manager.mic, dialogflow_conf=dialogflow_conf)
+            self.stt_service = DialogFlowSTTService(mic_index=self.device_manager.mic, dialogflow_conf=dialogflow_conf,
+                                                    playback_gate=self.playback_gate)
         print("Complete and ready for interaction!")
 
         self._setup_utterance_logging()
@@ -169,6 +183,9 @@ class DialogManager:
                 f.flush()
 
     def log_utterance(self, speaker, text):
+        store = session_store.current()
+        if store is not None:
+            store.log_utterance(speaker, text)
         if self._log_queue:
             self._log_queue.put(format_utterance_log_line(speaker=speaker, text=text))
 
@@ -181,18 +198,10 @@ class DialogManager:
         self._log_queue = None
         self._log_thread = None
 
-    def _connect_elevenlabs(self):
-        while True:
-            try:
-                asyncio.run_coroutine_threadsafe(self.tts.speak("Initializing text to speech"), self.background_loop).result()
-                self.logger.info('Elevenlabs still connected')
-            except Exception as e:
-                self.logger.error("Failed to connect to elevenlabs", exc_info=e)
-            sleep(150)
-
     def naoqi_say(self, text, sleep_time=None, animated=False):
-        self.device_manager.tts.request(
-            NaoqiTextToSpeechRequest(text, animated=animated, language='English'))
+        with tracing.span("playback"), self.playback_gate.playing():
+            self.device_manager.tts.request(
+                NaoqiTextToSpeechRequest(text, animated=animated, language='English'))
 
         # Sleep if requested
         if sleep_time and sleep_time > 0:
@@ -203,13 +212,14 @@ class DialogManager:
     def say(self, text, speaking_rate, sleep_time=None, animated=None, amplified=False, always_regenerate=False):
         print("Saying: ", text)
         self.log_utterance(speaker='robot', text=text)
-        if isinstance(self.tts_conf, NaoqiTTSConf):
-            self.naoqi_say(text, sleep_time=sleep_time, animated=animated)
-        elif isinstance(self.tts_conf, ElevenLabsTTSConf):
-            self.elevenlabs_say(text, sleep_time=sleep_time, amplified=amplified,
-                                always_regenerate=always_regenerate, chunking=True)
-        else:
-            raise ValueError(f'Unsupported tts_conf type: {type(self.tts_conf)}')
+        with tracing.span("say", text=text):
+            if isinstance(self.tts_conf, NaoqiTTSConf):
+                self.naoqi_say(text, sleep_time=sleep_time, animated=animated)
+            elif isinstance(self.tts_conf, ElevenLabsTTSConf):
+                self.elevenlabs_say(text, sleep_time=sleep_time, amplified=amplified,
+                                    always_regenerate=always_regenerate, chunking=True)
+            else:
+                raise ValueError(f'Unsupported tts_conf type: {type(self.tts_conf)}')
 
     def elevenlabs_say(self, text, sleep_time=None, amplified=False, always_regenerate=False, chunking=True):
         if not chunking:
@@ -217,44 +227,82 @@ class DialogManager:
         else:
             text_chunks = self._split_text(text, max_len=80)
 
-        for chunk in text_chunks:
-            # Normalize and hash text
-            tts_key = self.tts_cacher.make_tts_key(chunk, self.tts_conf)
-
-            if not always_regenerate:
+        # Normalize and hash text
+        tts_keys = [self.tts_cacher.make_tts_key(chunk, self.tts_conf) for chunk in text_chunks]
+
+        # Request every chunk that needs new audio up front, so later chunks are synthesized on the
+        # connection pool while earlier ones are playing
+        pending = {}
+        started = {}
+        for chunk, tts_key in zip(text_chunks, tts_keys):
+            if tts_key not in pending and (always_regenerate or not self._is_audio_cached(tts_key)):
+                started[tts_key] = Event()
+                pending[tts_key] = asyncio.run_coroutine_threadsafe(self._synthesize(chunk, started[tts_key]),
+                                                                    self.background_loop)
+
+        self.playback_gate.clear_barge_in()
+        for chunk, tts_key in zip(text_chunks, tts_keys):
+            if self.playback_gate.barge_in_requested():
+                # The participant started talking: skip the rest of the utterance
+                print("[TTS] Barge-in, not playing: ", chunk)
+                self._drop_pending_audio(pending, started, amplified)
+                break
+            if tts_key not in pending:
+                # Hot clips are played straight from memory, without touching the disk
+                cached = self.pcm_cache.get(PCMCache.make_key(tts_key))
+                if cached:
+                    self._play_pcm(*cached)
+                    continue
                 audio_file = self.tts_cacher.load_audio_file(tts_key)
                 if audio_file:
-                    self.play_audio(audio_file, log=False)
+                    self.play_audio(audio_file, log=False, tts_key=tts_key)
                     continue
 
             # Generate new audio
-            audio_bytes = self.elevenlabs_generate_chunk_audio(chunk, amplified)
+            future = pending.pop(tts_key, None)
+            with tracing.span("tts_synth", chars=len(chunk)):
+                if future:
+                    audio_bytes = self._store_generated_audio(tts_key, future.result(), amplified)
+                else:
+                    audio_bytes = self.elevenlabs_generate_chunk_audio(chunk, amplified)
 
             # Play audio
-            self.speaker.request(AudioRequest(audio_bytes, self.sample_rate))
+            self._play_pcm(audio_bytes, self.sample_rate)
 
             # Sleep if requested
             if sleep_time and sleep_time > 0:
                 sleep(sleep_time)
 
-    def play_audio(self, audio_file, amplified=False, log=True):
-        with wave.open(audio_file, 'rb') as wf:
-            # Get parameters
-            sample_width = wf.getsampwidth()
-            framerate = wf.getframerate()
-            n_frames = wf.getnframes()
+    def play_audio(self, audio_file, amplified=False, log=True, tts_key=None):
+        pcm_key = PCMCache.make_key(tts_key or audio_file, amplified)
+        cached = self.pcm_cache.get(pcm_key)
+        if cached:
+            audio, framerate = cached
+        else:
+            with wave.open(audio_file, 'rb') as wf:
+                # Get parameters
+                sample_width = wf.getsampwidth()
+                framerate = wf.getframerate()
+                n_frames = wf.getnframes()
 
-            # Ensure format is 16-bit (2 bytes per sample)
-            if sample_width != 2:
-                raise ValueError("WAV file is not 16-bit audio. Sample width = {} bytes.".format(sample_width))
+                # Ensure format is 16-bit (2 bytes per sample)
+                if sample_width != 2:
+                    raise ValueError("WAV file is not 16-bit audio. Sample width = {} bytes.".format(sample_width))
 
-            audio = wf.readframes(n_frames)
+                audio = wf.readframes(n_frames)
             if amplified:
                 audio = self._amplify_audio(audio)
+            self.pcm_cache.put(pcm_key, audio, framerate)
 
+        self._play_pcm(audio, framerate)
+        if log:
+            self.log_utterance(speaker='robot', text=f'plays {audio_file}')
+
+    def _play_pcm(self, audio, framerate):
+        """Play mono 16-bit PCM and publish the playback interval to the playback gate."""
+        duration = len(audio) / (2 * framerate)
+        with tracing.span("playback", audio_s=round(duration, 3)), self.playback_gate.playing(duration=duration):
             self.speaker.request(AudioRequest(audio, framerate))
-            if log:
-                self.log_utterance(speaker='robot', text=f'plays {audio_file}')
 
     def elevenlabs_generate_audio(self, text, amplified=False, renew_all=False):
         text_chunks = self._split_text(text, max_len=80)
@@ -265,6 +313,9 @@ class DialogManager:
                     continue
             self.elevenlabs_generate_chunk_audio(chunk, amplified)
 
+    def _is_audio_cached(self, tts_key):
+        return PCMCache.make_key(tts_key) in self.pcm_cache or self.tts_cacher.load_audio_file(tts_key) is not None
+
     def elevenlabs_generate_chunk_audio(self, text, amplified=False):
         # Normalize and hash text
         tts_key = self.tts_cacher.make_tts_key(text, self.tts_conf)
@@ -272,11 +323,38 @@ class DialogManager:
         # ElevenLabs TTS returns bytes
         audio_bytes = asyncio.run_coroutine_threadsafe(self.tts.speak(text), self.background_loop).result()
 
+        return self._store_generated_audio(tts_key, audio_bytes, amplified)
+
+    async def _synthesize(self, chunk, started):
+        started.set()
+        return await self.tts.speak(chunk)
+
+    def _drop_pending_audio(self, pending, started, amplified=False):
+        """Cancel the requests of skipped chunks that have not started yet; the ones already being
+        synthesized finish in the background and are still stored in the cache."""
+        for tts_key, future in pending.items():
+            if not started[tts_key].is_set() and future.cancel():
+                continue
+            future.add_done_callback(partial(self._store_finished_audio, tts_key, amplified))
+        pending.clear()
+
+    def _store_finished_audio(self, tts_key, amplified, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        try:
+            self._store_generated_audio(tts_key, future.result(), amplified)
+        except Exception as e:
+            print(f"[TTS] Could not cache skipped chunk: {e}")
+
+    def _store_generated_audio(self, tts_key, audio_bytes, amplified=False):
         if audio_bytes and amplified:
             audio_bytes = self._amplify_audio(audio_bytes)
 
         # Save to cache file
         self.tts_cacher.save_audio_file(tts_key, audio_bytes, self.sample_rate)
+        self.pcm_cache.invalidate(tts_key)
+        if audio_bytes:
+            self.pcm_cache.put(PCMCache.make_key(tts_key), audio_bytes, self.sample_rate)
 
         return audio_bytes
 
@@ -326,6 +404,7 @@ class DialogManager:
 
         return chunks
 
+    @tracing.traced("listen")
     def listen(self):
         print("Listening...")
         if isinstance(self.device_manager, Pepper):
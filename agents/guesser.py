@@ -1,7 +1,6 @@
 import os.path
 import random
 import sys
-import time
 from json import load
 from PIL import Image
 
@@ -14,6 +13,7 @@ from agents.dialog_manager import DialogManager
 from agents.llm_agent import LLMAgent
 from agents.pepper_tablet.display_service import PepperTabletDisplayService
 from agents.stt_manager import RealTimeSTTService
+from interaction import tracing
 from interaction.audio_pipeline import AudioPipeline
 
 from interaction.continuity import get_baseline_continuity_utterance, get_adaptive_continuity_utterance
@@ -33,12 +33,18 @@ class Guesser:
         self.device_manager = device_manager
         self.dialog_manager = self.build_dialog_manager(device_manager, tts_conf, interaction_conf)
         self.llm_agent = LLMAgent()
+        # When set (by the asyncio game loop), echo_guard returns at once and listening waits instead
+        self.defer_echo_guard = False
 
         if isinstance(self.device_manager, Pepper):
             self.display_service = PepperTabletDisplayService(pepper=device_manager)
 
         self.audio_pipeline = (
-            AudioPipeline(interaction_conf.participant_id, interaction_conf.external_audio_device_id)
+            AudioPipeline(interaction_conf.participant_id, interaction_conf.external_audio_device_id,
+                          playback_gate=self.dialog_manager.playback_gate,
+                          detect_barge_in=interaction_conf.barge_in,
+                          profile_worker=interaction_conf.profile_feature_worker,
+                          feature_workers=interaction_conf.feature_workers)
             if interaction_conf.participant_id is not None
             else None
         )
@@ -61,14 +67,35 @@ class Guesser:
                              tts_conf=tts_conf,
                              interaction_conf=interaction_conf)
 
-    def prompt_llm(self, system_prompt: str, user_prompt: str) -> dict:
-        return self.llm_agent.prompt_llm(system_prompt, user_prompt)
+    def prompt_llm(self, system_prompt: str, user_prompt: str, prompt_cache_key: str = None) -> dict:
+        return self.llm_agent.prompt_llm(system_prompt, user_prompt, prompt_cache_key=prompt_cache_key)
 
-    def say(self, text, sleep_time=0, always_regenerate=True):
-        self.dialog_manager.animate_random()
+    def stream_llm(self, system_prompt: str, user_prompt: str, prompt_cache_key: str = None):
+        return self.llm_agent.stream_llm(system_prompt, user_prompt, prompt_cache_key=prompt_cache_key)
+
+    def say(self, text, sleep_time=0, always_regenerate=True, animated=True, echo_guard=True):
+        if animated:
+            self.dialog_manager.animate_random()
         self.dialog_manager.say(text, always_regenerate=always_regenerate, sleep_time=sleep_time)
-        if isinstance(self.dialog_manager.device_manager, Desktop):
-            time.sleep(2)  # To avoid hearing its own speech as feedback
+        if echo_guard:
+            self.echo_guard()
+
+    def echo_guard(self):
+        """Wait until the robot's own speech and its echo are over, so it does not hear itself."""
+        if not isinstance(self.dialog_manager.device_manager, Desktop) or self.defer_echo_guard:
+            return
+        self.dialog_manager.playback_gate.wait_until_quiet()
+
+    def echo_guard_remaining(self):
+        return self.dialog_manager.playback_gate.remaining()
+
+    @property
+    def playback_gate(self):
+        return self.dialog_manager.playback_gate
+
+    def stop_speaking(self):
+        """Skip the rest of the utterance being spoken; the clip that is playing still finishes."""
+        self.dialog_manager.playback_gate.signal_barge_in()
 
     def listen(self) -> str:
         return self.dialog_manager.listen()
@@ -92,6 +119,22 @@ class Guesser:
             return self.audio_pipeline.stop_and_process(clue_word, turn_number)
         return None, None
 
+    def submit_audio(self, clue_word, turn_number):
+        """Stop recording and analyse it in the background: a future of ``(features, confidence_level)``,
+        or ``None`` without an audio pipeline."""
+        if self.audio_pipeline:
+            return self.audio_pipeline.submit(clue_word, turn_number)
+        return None
+
+    def speculate_audio(self, turn_number):
+        """Start analysing the paused recording before the clue is confirmed (see ``AudioPipeline.speculate``)."""
+        if self.audio_pipeline:
+            self.audio_pipeline.speculate(turn_number)
+
+    def discard_audio_speculation(self):
+        if self.audio_pipeline:
+            self.audio_pipeline.discard_speculation()
+
     def stop_recording_if_active(self):
         if self.audio_pipeline:
             self.audio_pipeline.stop_recording_if_active()
@@ -99,6 +142,9 @@ class Guesser:
     def is_adaptive(self):
         return self.dialog_manager.interaction_conf.adaptive
 
+    def streams_guesses(self):
+        return self.dialog_manager.interaction_conf.stream_guesses
+
     @staticmethod
     def get_continuity_remark(game_state, adaptive=None):
         """Return a context-aware remark referencing previous turn performance,
@@ -484,6 +530,7 @@ class Guesser:
         ]
         self.say(random.choice(reactions))
 
+    @tracing.traced("display_guess")
     def display_guess(self, file_path):
         if isinstance(self.device_manager, Pepper):
             self.display_service.show_image(file_path)
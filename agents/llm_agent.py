@@ -1,9 +1,13 @@
 import os
 import json
+import time
 
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from agents.streaming_json import StreamingJSONParser, SentenceSplitter
+from interaction import tracing
+
 load_dotenv("../config/.env")
 
 
@@ -12,14 +16,18 @@ class LLMAgent:
             self,
             model="gpt-4.1-mini",
             temperature=0.2,
-            max_tokens=300
+            max_tokens=300,
+            client=None
     ):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # ``client`` replaces the OpenAI client, e.g. with the offline stand-in of interaction.simulation
+        self.client = client or OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.last_stream_metrics = None
 
-    def prompt_llm(self, system_prompt: str, user_prompt: str) -> dict:
+    @tracing.traced("prompt_llm")
+    def prompt_llm(self, system_prompt: str, user_prompt: str, prompt_cache_key: str = None) -> dict:
         response = self.client.chat.completions.create(
             model=self.model,
             temperature=self.temperature,
@@ -28,10 +36,94 @@ class LLMAgent:
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
+            **self._cache_kwargs(prompt_cache_key),
         )
+        self._log_cached_tokens(response.usage)
 
         content = response.choices[0].message.content.strip()
+        return self._parse_json(content)
+
+    def stream_llm(self, system_prompt: str, user_prompt: str, sentence_field: str = "reason",
+                   prompt_cache_key: str = None):
+        """
+        Stream a JSON completion and yield events as soon as they can be acted on.
+
+        Yields ``("field", key, value)`` when a top-level field is complete,
+        ``("sentence", text)`` for every finished sentence of ``sentence_field``,
+        and finally ``("done", response)`` with the fully parsed JSON dict.
+
+        Timing of the stream is stored in ``last_stream_metrics``: seconds until the
+        first token, until each field completed and until the first sentence was ready.
+        """
+        start = time.perf_counter()
+        wall_start = time.time()
+        metrics = {"time_to_first_token_s": None, "time_to_first_sentence_s": None, "field_times_s": {},
+                   "total_s": None}
+        self.last_stream_metrics = metrics
+        events = []
+        splitter = SentenceSplitter()
+
+        def on_field(key, value):
+            metrics["field_times_s"][key] = time.perf_counter() - start
+            if key == sentence_field:
+                events.extend(("sentence", s) for s in splitter.flush())
+            events.append(("field", key, value))
+
+        def on_string_delta(key, text):
+            if key == sentence_field:
+                events.extend(("sentence", s) for s in splitter.feed(text))
+
+        parser = StreamingJSONParser(on_field=on_field, on_string_delta=on_string_delta)
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            **self._cache_kwargs(prompt_cache_key),
+        )
+
+        content = []
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                self._log_cached_tokens(chunk.usage)
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            if metrics["time_to_first_token_s"] is None:
+                metrics["time_to_first_token_s"] = time.perf_counter() - start
+            content.append(delta)
+            parser.feed(delta)
+            for event in events:
+                if event[0] == "sentence" and metrics["time_to_first_sentence_s"] is None:
+                    metrics["time_to_first_sentence_s"] = time.perf_counter() - start
+                yield event
+            events.clear()
+
+        metrics["total_s"] = time.perf_counter() - start
+        # The generator is consumed across the caller's own spans, so it is recorded afterwards
+        tracing.record_span("stream_llm", wall_start, metrics["total_s"],
+                            time_to_first_token_s=metrics["time_to_first_token_s"])
+        yield "done", self._parse_json("".join(content).strip())
+
+    @staticmethod
+    def _cache_kwargs(prompt_cache_key):
+        # Requests sharing a key are routed to the same provider-side cache of the static prompt prefix
+        return {"prompt_cache_key": prompt_cache_key} if prompt_cache_key else {}
+
+    @staticmethod
+    def _log_cached_tokens(usage):
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None)
+        if usage is not None and cached is not None:
+            print(f"[LLMAgent] prompt tokens: {usage.prompt_tokens} (cached: {cached})")
 
+    @staticmethod
+    def _parse_json(content: str) -> dict:
         try:
             return json.loads(content)
         except json.JSONDecodeError as e:
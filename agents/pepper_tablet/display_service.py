@@ -1,8 +1,4 @@
 import os
-import threading
-import time
-import socket
-from http.server import HTTPServer, SimpleHTTPRequestHandler
 from sic_framework.devices import Pepper
 from sic_framework.devices.common_pepper.pepper_tablet import (
     UrlMessage,
@@ -10,29 +6,22 @@ from sic_framework.devices.common_pepper.pepper_tablet import (
 )
 from sic_framework.core import utils
 
-DISPLAY_TIME = 5
+from agents.pepper_tablet.tablet_channel import TabletChannel, start_tablet_server, list_images
 
-class _ImageHTTPRequestHandler(SimpleHTTPRequestHandler):
-    """HTTP handler for Pepper-safe static serving."""
-
-    def log_error(self, format, *args):
-        if "favicon.ico" in str(args) or "Broken pipe" in str(args):
-            return
-        super().log_error(format, *args)
-
-    def do_GET(self):
-        if self.path == "/":
-            self.path = "/index.html"
-        super().do_GET()
+# Seconds to wait for the tablet to load the page and open its event stream
+PAGE_LOAD_TIMEOUT = 10
+# Seconds to wait for the tablet to confirm that an image is on screen
+DISPLAY_ACK_TIMEOUT = 3
+IDLE_IMAGE = "images/codenames.png"
 
 
 class PepperTabletDisplayService:
     """
     Service that:
     - starts a local HTTP server once
-    - serves an idle screen by default
-    - allows updating the displayed image
-    - controls Pepper tablet reloads
+    - loads a persistent page on the Pepper tablet, which preloads all images
+    - pushes image updates to that page and waits for its acknowledgement
+    - only reloads the tablet page when the page is not connected
     """
 
     def __init__(
@@ -44,17 +33,12 @@ class PepperTabletDisplayService:
         self.port = port
 
         self.work_dir = os.path.dirname(os.path.abspath(__file__))
+        self.channel = TabletChannel(preload=list_images(self.work_dir))
 
-        self.index_html = os.path.join(self.work_dir, "index.html")
-
-        os.makedirs(self.work_dir, exist_ok=True)
-        # os.chdir(self.work_dir)
-
-        self._create_idle_screen()
         self._start_server()
         self.server_url = f"http://{utils.get_ip_adress()}:{self.port}"
 
-        self._reload_tablet()
+        self._load_page()
 
     # ─────────────────────────────────────────────────────────────
     # Public API
@@ -62,98 +46,54 @@ class PepperTabletDisplayService:
 
     def show_idle(self):
         """Show idle screen on Pepper."""
-        self._create_idle_screen()
-        self._reload_tablet()
+        return self._display(IDLE_IMAGE)
 
     def show_image(self, image_path: str):
         """
         Update the displayed image.
 
-        image_path: path to an image file (any size/format)
+        image_path: file name of an image in ``images/``
+        Returns True once the tablet confirmed the image is shown.
         """
-        image_path = os.path.join("images/", image_path)
-        self._create_image_page(image_path)
-        self._reload_tablet()
+        return self._display("images/" + image_path)
 
     def clear(self):
         """Clear Pepper tablet."""
         self.pepper.tablet.send_message(ClearDisplayMessage())
 
+    def clear_display(self):
+        return self.show_idle()
+
     # ─────────────────────────────────────────────────────────────
     # Internal helpers
     # ─────────────────────────────────────────────────────────────
 
     def _start_server(self):
-        """Start HTTP server in background thread and block until ready."""
-
-        server_ready = threading.Event()
-        from functools import partial
-        def _serve():
-            handler = partial(
-                _ImageHTTPRequestHandler,
-                directory=self.work_dir
-            )
-            self._httpd = HTTPServer(("", self.port), handler)
-
-            # 🔔 Socket is now bound and listening
-            server_ready.set()
-
-            self._httpd.serve_forever()
-
-        thread = threading.Thread(target=_serve, daemon=True)
-        thread.start()
-
-        # ⏳ Block until server thread signals readiness
-        if not server_ready.wait(timeout=5.0):
+        """Start the HTTP server (static files + push endpoints) in a background thread."""
+        try:
+            self._httpd = start_tablet_server(self.work_dir, self.channel, self.port)
+        except OSError as e:
             raise RuntimeError(
                 f"Pepper tablet display server failed to start on port {self.port}"
-            )
+            ) from e
 
-    def _reload_tablet(self):
-        """Reload the tablet page."""
+    def _load_page(self):
+        """(Re)load the persistent page on the tablet and wait until it is connected."""
         self.pepper.tablet.send_message(UrlMessage(self.server_url))
-        time.sleep(DISPLAY_TIME)
-
-    def clear_display(self):
-        self._create_idle_screen()
-        self._reload_tablet()
-
-    def _create_idle_screen(self):
-        self._create_image_page("images/codenames.png")
-
-    def _create_image_page(self, image_path: str):
-        """Create HTML page showing current image."""
-        html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Image</title>
-    <style>
-        body {{
-            margin: 0;
-            padding: 0;
-            background-color: #000;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            height: 100vh;
-            overflow: hidden;
-        }}
-        img {{
-            max-width: 100%;
-            max-height: 100%;
-            object-fit: contain;
-        }}
-    </style>
-</head>
-<body>
-    <img src="{image_path}" alt="Displayed Image">
-</body>
-</html>
-"""
-        with open(self.index_html, "w") as f:
-            f.write(html)
+        if not self.channel.wait_for_client(timeout=PAGE_LOAD_TIMEOUT):
+            print("[TABLET] Page did not connect to the display server")
+            return False
+        return True
+
+    def _display(self, image_src: str):
+        if self.channel.clients == 0:
+            # The tablet lost the page (e.g. it went to sleep); the reloaded page picks up image_src
+            self._load_page()
+        seq = self.channel.show(image_src)
+        if self.channel.wait_ack(seq, timeout=DISPLAY_ACK_TIMEOUT):
+            return True
+        print(f"[TABLET] No acknowledgement for {image_src}")
+        return False
 
 
 if __name__ == "__main__":
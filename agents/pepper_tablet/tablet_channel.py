@@ -0,0 +1,155 @@
+"""Push channel between the display service and the persistent page on Pepper's tablet.
+
+The tablet loads ``index.html`` once. The page keeps an EventSource connection to ``/events``,
+preloads every image it is told about, swaps the displayed image in place on each ``show`` event
+and acknowledges it with ``POST /ack`` once the new image has been painted.
+"""
+
+import json
+import os
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# Seconds between keepalive comments on an idle /events stream
+KEEPALIVE_SECONDS = 15
+# Browser cache lifetime for the (static) card images
+IMAGE_MAX_AGE = 3600
+
+
+class TabletChannel:
+    """Current display state plus acknowledgements, shared by the HTTP handlers and the service."""
+
+    def __init__(self, preload=()):
+        self.preload = list(preload)
+        self.seq = 0
+        self.image = None
+        self.acked_seq = 0
+        self.clients = 0
+        self._cond = threading.Condition()
+
+    def show(self, image_src: str) -> int:
+        """Publish ``image_src`` to connected pages; returns the sequence number to wait for."""
+        with self._cond:
+            self.seq += 1
+            self.image = image_src
+            self._cond.notify_all()
+            return self.seq
+
+    def ack(self, seq: int):
+        with self._cond:
+            if seq > self.acked_seq:
+                self.acked_seq = seq
+                self._cond.notify_all()
+
+    def wait_ack(self, seq: int, timeout=None) -> bool:
+        """Block until the page confirmed ``seq`` (or a later update); False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.acked_seq >= seq, timeout)
+
+    def wait_for_client(self, timeout=None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self.clients > 0, timeout)
+
+    def wait_update(self, seen_seq: int, timeout=None):
+        """Return ``(seq, image)`` once something newer than ``seen_seq`` is shown, or None on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.seq > seen_seq, timeout):
+                return None
+            return self.seq, self.image
+
+    def _connected(self, delta):
+        with self._cond:
+            self.clients += delta
+            self._cond.notify_all()
+
+
+class TabletRequestHandler(SimpleHTTPRequestHandler):
+    """Static files plus the ``/events`` stream and ``/ack`` endpoint of the tablet page."""
+
+    def __init__(self, *args, channel: TabletChannel, **kwargs):
+        self.channel = channel
+        super().__init__(*args, **kwargs)
+
+    def log_error(self, format, *args):
+        if "favicon.ico" in str(args) or "Broken pipe" in str(args):
+            return
+        super().log_error(format, *args)
+
+    def log_message(self, format, *args):
+        # /events and /ack are hit on every display update; keep the console quiet
+        pass
+
+    def do_GET(self):
+        if self.path == "/":
+            self.path = "/index.html"
+        if self.path.startswith("/events"):
+            self._stream_events()
+            return
+        super().do_GET()
+
+    def do_POST(self):
+        if not self.path.startswith("/ack"):
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            seq = int(self.rfile.read(length) or 0)
+        except ValueError:
+            self.send_error(400)
+            return
+        self.channel.ack(seq)
+        self.send_response(204)
+        self.end_headers()
+
+    def end_headers(self):
+        if self.path.startswith("/images/"):
+            self.send_header("Cache-Control", f"public, max-age={IMAGE_MAX_AGE}")
+        elif self.path == "/index.html":
+            self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def _stream_events(self):
+        channel = self.channel
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        channel._connected(+1)
+        try:
+            self._send_event("preload", channel.preload)
+            seen = 0
+            while True:
+                update = channel.wait_update(seen, timeout=KEEPALIVE_SECONDS)
+                if update is None:
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+                    continue
+                seen, image = update
+                self._send_event("show", {"seq": seen, "src": image})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            channel._connected(-1)
+
+    def _send_event(self, event, data):
+        self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+
+def start_tablet_server(directory: str, channel: TabletChannel, port: int = 8000):
+    """Serve ``directory`` and the push endpoints on ``port`` from a daemon thread."""
+    handler = partial(TabletRequestHandler, directory=directory, channel=channel)
+    httpd = ThreadingHTTPServer(("", port), handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def list_images(directory: str, subdir: str = "images"):
+    """Relative URLs of every image under ``directory/subdir``, for preloading on the tablet."""
+    folder = os.path.join(directory, subdir)
+    return sorted(
+        f"{subdir}/{name}" for name in os.listdir(folder)
+        if name.lower().endswith((".png", ".jpg", ".jpeg", ".gif"))
+    )
@@ -0,0 +1,165 @@
+"""Timeline of the robot's own audio playback.
+
+The TTS layer records when each clip starts and ends playing. The participant recorder drops the
+audio blocks that overlap those intervals and the STT waits only until the last clip (plus a short
+echo tail) is over, instead of pausing recordings by hand and sleeping a fixed time after speaking.
+The recorder can also report user barge-in, which makes the TTS skip the rest of an utterance.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Seconds after playback ends during which the room/device echo can still be picked up
+ECHO_TAIL_SECONDS = 0.3
+# Number of finished playback intervals remembered for overlap checks
+INTERVAL_HISTORY = 256
+# Participant-mic level (RMS of float samples) below which a block never counts as speech
+BARGE_IN_RMS = 0.05
+# Seconds of continuous speech during playback before it counts as barge-in
+BARGE_IN_MIN_SECONDS = 0.3
+# The participant mic also picks up the robot's own voice: during playback a block only counts as
+# speech when it is this many times louder than the measured echo level
+BARGE_IN_ECHO_RATIO = 2.0
+# Seconds of robot playback used to measure the echo level before barge-in can be detected
+BARGE_IN_CALIBRATION_SECONDS = 1.5
+# Echo level: this quantile of the mic level over the recent playback blocks without speech
+ECHO_QUANTILE = 0.9
+ECHO_HISTORY_BLOCKS = 500
+
+
+class PlaybackGate:
+    def __init__(self, echo_tail=ECHO_TAIL_SECONDS):
+        self.echo_tail = echo_tail
+        self._intervals = deque(maxlen=INTERVAL_HISTORY)  # (start, end) in time.time(), tail included
+        self._playing_since = None
+        self._lock = threading.Lock()
+        self._barge_in = threading.Event()
+        self._barge_in_listeners = []
+
+    @contextmanager
+    def playing(self, duration=None):
+        """
+        Mark the wrapped block as robot playback. ``duration`` (seconds of audio) covers players that
+        return before the clip has finished.
+        """
+        start = time.time()
+        with self._lock:
+            self._playing_since = start
+        try:
+            yield
+        finally:
+            end = time.time()
+            if duration:
+                end = max(end, start + duration)
+            with self._lock:
+                self._playing_since = None
+                self._intervals.append((start, end + self.echo_tail))
+
+    def is_playing(self, at=None):
+        at = time.time() if at is None else at
+        return self.overlaps(at, at)
+
+    def overlaps(self, start, end):
+        """True if ``[start, end]`` (time.time() seconds) overlaps robot playback or its echo tail."""
+        with self._lock:
+            if self._playing_since is not None and end >= self._playing_since:
+                return True
+            return any(s <= end and start <= e for s, e in reversed(self._intervals))
+
+    def remaining(self):
+        """Seconds until the last playback and its echo tail are over (0 if quiet)."""
+        with self._lock:
+            if self._playing_since is not None:
+                return self.echo_tail
+            if not self._intervals:
+                return 0.0
+            return max(0.0, self._intervals[-1][1] - time.time())
+
+    def wait_until_quiet(self, timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            remaining = self.remaining()
+            if remaining <= 0:
+                return True
+            if deadline is not None:
+                if time.time() >= deadline:
+                    return False
+                remaining = min(remaining, deadline - time.time())
+            time.sleep(remaining)
+
+    # Barge-in -----------------------------------------------------------
+
+    def signal_barge_in(self):
+        if not self._barge_in.is_set():
+            print("[PlaybackGate] Barge-in detected")
+        self._barge_in.set()
+        with self._lock:
+            listeners = list(self._barge_in_listeners)
+        for callback in listeners:
+            callback()
+
+    def add_barge_in_listener(self, callback):
+        """Call ``callback()`` (from the signalling thread) on every barge-in until it is removed."""
+        with self._lock:
+            self._barge_in_listeners.append(callback)
+
+    def remove_barge_in_listener(self, callback):
+        with self._lock:
+            if callback in self._barge_in_listeners:
+                self._barge_in_listeners.remove(callback)
+
+    def barge_in_requested(self):
+        return self._barge_in.is_set()
+
+    def clear_barge_in(self):
+        self._barge_in.clear()
+
+
+class BargeInDetector:
+    """
+    Flags barge-in when the participant mic stays well above the robot's own echo for a while
+    during robot playback.
+
+    The first ``calibration_seconds`` of playback only measure the echo level (the robot speaking
+    alone, e.g. its greeting). Afterwards, playback blocks that are not speech keep updating it, so
+    the threshold follows changes in speaker volume.
+    """
+
+    def __init__(self, gate: PlaybackGate, rms_threshold=BARGE_IN_RMS, min_seconds=BARGE_IN_MIN_SECONDS,
+                 echo_ratio=BARGE_IN_ECHO_RATIO, calibration_seconds=BARGE_IN_CALIBRATION_SECONDS):
+        self.gate = gate
+        self.rms_threshold = rms_threshold
+        self.min_seconds = min_seconds
+        self.echo_ratio = echo_ratio
+        self.calibration_seconds = calibration_seconds
+        self._calibrated_seconds = 0.0
+        self._echo_levels = deque(maxlen=ECHO_HISTORY_BLOCKS)
+        self._loud_seconds = 0.0
+
+    def echo_level(self):
+        """Mic level of the robot's own playback (0 before anything was measured)."""
+        if not self._echo_levels:
+            return 0.0
+        levels = sorted(self._echo_levels)
+        return levels[min(len(levels) - 1, int(ECHO_QUANTILE * len(levels)))]
+
+    def threshold(self):
+        return max(self.rms_threshold, self.echo_ratio * self.echo_level())
+
+    def feed(self, rms, block_seconds, during_playback):
+        if not during_playback:
+            self._loud_seconds = 0.0
+            return
+        if self._calibrated_seconds < self.calibration_seconds:
+            self._calibrated_seconds += block_seconds
+            self._echo_levels.append(rms)
+            return
+        if rms < self.threshold():
+            self._loud_seconds = 0.0
+            self._echo_levels.append(rms)
+            return
+        self._loud_seconds += block_seconds
+        if self._loud_seconds >= self.min_seconds:
+            self.gate.signal_barge_in()
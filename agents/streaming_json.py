@@ -0,0 +1,148 @@
+"""Incremental parsing of the flat JSON objects returned by the guesser LLM.
+
+The parser is fed the completion text piece by piece as it streams in. It reports
+each top-level scalar field as soon as its value is complete and forwards string
+values character-wise, so callers can act on ``guess_index`` and start speaking the
+``reason`` long before the closing brace arrives.
+"""
+
+import json
+import re
+
+_END_OF_STRING = object()
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+# A sentence ends at . ! ? or … (optionally followed by closing quotes) when whitespace follows
+_SENTENCE_END = re.compile(r'[.!?…]+["\')\]]*\s')
+
+
+class StreamingJSONParser:
+    """
+    Push parser for a single flat JSON object (string, number, bool and null values).
+
+    Parameters
+    ----------
+    on_field : callable(key, value) | None
+        Called once per top-level field as soon as its value is complete.
+    on_string_delta : callable(key, text) | None
+        Called with every decoded piece of a string value while it streams in.
+    """
+
+    def __init__(self, on_field=None, on_string_delta=None):
+        self.on_field = on_field
+        self.on_string_delta = on_string_delta
+        self.fields = {}
+        self._state = "start"
+        self._key = None
+        self._buffer = []
+        self._escape = None  # None, "" after a backslash, or the hex digits of a \u escape
+
+    @property
+    def done(self):
+        return self._state == "done"
+
+    def feed(self, text: str):
+        for ch in text:
+            self._feed_char(ch)
+
+    def _feed_char(self, ch):
+        state = self._state
+        if state in ("start", "done"):
+            # Skip anything (e.g. a markdown fence) before the opening brace
+            if ch == "{" and state == "start":
+                self._state = "before_key"
+        elif state == "before_key":
+            if ch == '"':
+                self._buffer = []
+                self._state = "key"
+            elif ch == "}":
+                self._state = "done"
+        elif state == "key":
+            decoded = self._decode_string_char(ch)
+            if decoded is _END_OF_STRING:
+                self._key = "".join(self._buffer)
+                self._state = "colon"
+            elif decoded:
+                self._buffer.append(decoded)
+        elif state == "colon":
+            if ch == ":":
+                self._state = "before_value"
+        elif state == "before_value":
+            if ch == '"':
+                self._buffer = []
+                self._state = "string_value"
+            elif not ch.isspace():
+                self._buffer = [ch]
+                self._state = "scalar_value"
+        elif state == "string_value":
+            decoded = self._decode_string_char(ch)
+            if decoded is _END_OF_STRING:
+                self._complete_field("".join(self._buffer))
+            elif decoded:
+                self._buffer.append(decoded)
+                if self.on_string_delta:
+                    self.on_string_delta(self._key, decoded)
+        elif state == "scalar_value":
+            if ch in ",}" or ch.isspace():
+                self._complete_field(json.loads("".join(self._buffer)))
+                self._after_value(ch)
+            else:
+                self._buffer.append(ch)
+        elif state == "after_value":
+            self._after_value(ch)
+
+    def _after_value(self, ch):
+        if ch == ",":
+            self._state = "before_key"
+        elif ch == "}":
+            self._state = "done"
+
+    def _complete_field(self, value):
+        self.fields[self._key] = value
+        self._state = "after_value"
+        if self.on_field:
+            self.on_field(self._key, value)
+
+    def _decode_string_char(self, ch):
+        """Return the decoded text for ``ch``, ``""`` while inside an escape, or ``_END_OF_STRING``."""
+        if self._escape is None:
+            if ch == "\\":
+                self._escape = ""
+                return ""
+            if ch == '"':
+                return _END_OF_STRING
+            return ch
+        if self._escape == "" and ch != "u":
+            self._escape = None
+            return _ESCAPES.get(ch, ch)
+        self._escape += ch
+        if len(self._escape) < 5:
+            return ""
+        code = int(self._escape[1:], 16)
+        self._escape = None
+        return chr(code)
+
+
+class SentenceSplitter:
+    """Collects streamed text and hands out complete sentences as soon as they end."""
+
+    def __init__(self):
+        self._pending = ""
+
+    def feed(self, text: str) -> list:
+        self._pending += text
+        sentences = []
+        while True:
+            match = _SENTENCE_END.search(self._pending)
+            if not match:
+                break
+            sentence = self._pending[:match.end()].strip()
+            self._pending = self._pending[match.end():]
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+
+    def flush(self) -> list:
+        sentence = self._pending.strip()
+        self._pending = ""
+        return [sentence] if sentence else []
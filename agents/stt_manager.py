@@ -4,6 +4,13 @@ from sic_framework.services.dialogflow import Dialogflow, GetIntentRequest
 from RealtimeSTT.RealtimeSTT import AudioToTextRecorder
 from abc import ABC, abstractmethod
 
+from interaction.utils import StreamingClueDetector
+
+# Silence that ends an utterance in general (the spymaster may pause while thinking)
+POST_SPEECH_SILENCE_SECONDS = 3
+# Shorter silence once the partial transcripts contain a stable "word number" clue
+EARLY_CLUE_ENDPOINT_SECONDS = 0.7
+
 
 class STTService(ABC):
     def __init__(self):
@@ -19,16 +26,21 @@ class STTService(ABC):
 
 
 class RealTimeSTTService(STTService):
-    def __init__(self, mic_index):
+    def __init__(self, mic_index, playback_gate=None, early_clue_endpoint=True):
         super().__init__()
+        self.playback_gate = playback_gate
+        # Partial transcripts are only needed to end clue utterances early
+        self.clue_detector = StreamingClueDetector() if early_clue_endpoint else None
         self.recorder = AudioToTextRecorder(
             input_device_index=mic_index,
             model="small.en",
             language="en",
             realtime_processing_pause=0.2,
-            post_speech_silence_duration=3,
+            post_speech_silence_duration=POST_SPEECH_SILENCE_SECONDS,
             use_microphone=True,
-            enable_realtime_transcription=False,  # final result only
+            enable_realtime_transcription=early_clue_endpoint,
+            realtime_model_type="tiny.en",
+            on_realtime_transcription_update=self._on_partial_transcript if early_clue_endpoint else None,
             beam_size=5,
             initial_prompt=(
                 "This is a board game called Codenames. "
@@ -42,17 +54,37 @@ class RealTimeSTTService(STTService):
         Blocks until speech is detected and transcription is finalized.
         Returns recognized text (lowercased).
         """
+        if self.playback_gate is not None:
+            # Start listening right after the robot's own speech (and its echo) is over,
+            # and forget whatever the microphone buffered while it was playing
+            self.playback_gate.wait_until_quiet()
+            self.recorder.clear_audio_queue()
+        if self.clue_detector is not None:
+            self.clue_detector.reset()
+            self.recorder.post_speech_silence_duration = POST_SPEECH_SILENCE_SECONDS
         text = self.recorder.text()
         return text.strip().lower() if text else ""
 
+    def _on_partial_transcript(self, text):
+        """Shorten the end-of-speech silence while a complete clue is stable in the partials."""
+        endpoint = POST_SPEECH_SILENCE_SECONDS
+        if self.clue_detector.feed(text):
+            endpoint = EARLY_CLUE_ENDPOINT_SECONDS
+        if self.recorder.post_speech_silence_duration != endpoint:
+            print(f"[STT] End-of-speech silence set to {endpoint}s ('{text}')")
+            self.recorder.post_speech_silence_duration = endpoint
+
 
 class DialogFlowSTTService(STTService):
-    def __init__(self, mic_index, dialogflow_conf):
+    def __init__(self, mic_index, dialogflow_conf, playback_gate=None):
         super().__init__()
+        self.playback_gate = playback_gate
         self.dialogflow = Dialogflow(ip="localhost", conf=dialogflow_conf, input_source=mic_index)
         self.request_id = np.random.randint(10000)
 
     def listen(self) -> str:
+        if self.playback_gate is not None:
+            self.playback_gate.wait_until_quiet()
         try:
             reply = self.dialogflow.request(GetIntentRequest(self.request_id), timeout=10)
             if reply.response.query_result.query_text:
@@ -4,7 +4,9 @@ import logging
 import os
 import hashlib
 import string
+import threading
 import wave
+from collections import OrderedDict
 from json import dumps, loads, load, dump
 
 import websockets
@@ -13,6 +15,15 @@ from sic_framework import AudioRequest
 from enum import Enum
 
 
+PCM_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+ELEVENLABS_BASE_URL = "wss://api.elevenlabs.io"
+PING_TIMEOUT = 2.0
+RECONNECT_ATTEMPTS = 4
+RECONNECT_BASE_DELAY = 0.5
+RECONNECT_MAX_DELAY = 8.0
+
+
 class TTSService(Enum):
     GOOGLE = 1
     ELEVENLABS = 2
@@ -34,12 +45,14 @@ class GoogleTTSConf(TTSConf):
 
 
 class ElevenLabsTTSConf(TTSConf):
-    def __init__(self, speaking_rate=None, voice_id='yO6w2xlECAQRFP6pX7Hw', model_id='eleven_flash_v2_5', stability=0.5):
+    def __init__(self, speaking_rate=None, voice_id='yO6w2xlECAQRFP6pX7Hw', model_id='eleven_flash_v2_5', stability=0.5,
+                 pool_size=2):
         super().__init__()
         self.speaking_rate = None if speaking_rate == 1.0 else speaking_rate
         self.voice_id = voice_id
         self.model_id = model_id
         self.stability = stability
+        self.pool_size = pool_size
         # self.model_id = "eleven_multilingual_v2"
         # self.model_id = "eleven_v3"
 
@@ -49,60 +62,75 @@ class NaoqiTTSConf(TTSConf):
         super().__init__()
 
 
-class ElevenLabsTTS:
-    def __init__(self, elevenlabs_key, voice_id, model_id, sample_rate=22050, speaking_rate=None, stability=0.5):
-        self.elevenlabs_key = elevenlabs_key
-        self.voice_id = voice_id
-        self.model_id = model_id
-        self.sample_rate = sample_rate
+class _ElevenLabsConnection:
+    """A single pre-authenticated stream-input websocket owned by an ``ElevenLabsTTS`` pool."""
+
+    def __init__(self, tts):
+        self.tts = tts
         self.websocket = None
-        self.speaking_rate = max(0.7, min(speaking_rate, 1.2)) if speaking_rate else speaking_rate
-        self.stability = stability
-        self.lock = asyncio.Lock()
-        # Development logging
-        self.logger = logging.getLogger("codenames")
+        self.healthy = False
+        self.last_ok = 0.0
+        self.logger = tts.logger
 
-    async def connect(self):
-        uri = (
-            f"wss://api.elevenlabs.io/v1/text-to-speech/{self.voice_id}/stream-input"
-            f"?model_id={self.model_id}"
-            f"&output_format=pcm_{self.sample_rate}"
-            f"&inactivity_timeout=180"
-            f"&auto_mode=false"
-        )
-        self.websocket = await websockets.connect(uri)
+    def mark_ok(self):
+        self.healthy = True
+        self.last_ok = asyncio.get_running_loop().time()
+
+    def is_known_healthy(self, max_age):
+        """True when the last successful ping or synthesis happened less than ``max_age`` seconds ago."""
+        if not self.healthy or not self.websocket:
+            return False
+        return asyncio.get_running_loop().time() - self.last_ok < max_age
+
+    async def open(self):
+        self.websocket = await websockets.connect(self.tts.uri)
 
         voice_settings = {
-                "stability": self.stability,
+                "stability": self.tts.stability,
                 "similarity_boost": 0.8,
                 "use_speaker_boost": False,
                 "chunk_length_schedule": [120, 160, 250, 290]}
-        if self.speaking_rate is not None:
-            voice_settings["speed"] = self.speaking_rate
+        if self.tts.speaking_rate is not None:
+            voice_settings["speed"] = self.tts.speaking_rate
 
         # Send initial config once
         await self.websocket.send(dumps({
             "text": " ",
             "voice_settings": voice_settings,
             "auto_mode": True,
-            "xi_api_key": self.elevenlabs_key,
+            "xi_api_key": self.tts.elevenlabs_key,
         }))
+        self.mark_ok()
 
-    async def disconnect(self):
+    async def close(self):
+        self.healthy = False
         if self.websocket:
             try:
                 await self.websocket.send(dumps({"text": ""}))  # end marker
-                await self.websocket.closed()
+                await self.websocket.close()
             except Exception as e:
                 self.logger.error(f"[TTS] Error while closing websocket: {e}")
             finally:
                 self.websocket = None
 
-    async def ping_connection(self):
+    async def ping(self, timeout=PING_TIMEOUT):
+        """Round-trip a websocket ping and wait for the pong."""
+        try:
+            pong_waiter = await self.websocket.ping()
+            await asyncio.wait_for(pong_waiter, timeout=timeout)
+            self.mark_ok()
+            return True
+        except Exception:
+            self.healthy = False
+            return False
+
+    async def keepalive(self):
+        """Reset the server-side inactivity timer; a lone space is buffered and never synthesized."""
         try:
-            await self.websocket.ping()
+            await self.websocket.send(dumps({"text": " "}))
             return True
-        except:
+        except Exception:
+            self.healthy = False
             return False
 
     async def drain_socket(self):
@@ -113,48 +141,164 @@ class ElevenLabsTTS:
         except (asyncio.TimeoutError, websockets.exceptions.ConnectionClosed):
             pass
 
-    async def speak(self, text):
-        async with self.lock:
-            # Reconnect if no active connection.
-            if not self.websocket:
-                self.logger.warning("[TTS] Websocket not connected. Initiating reconnect.")
-                await self.connect()
-            if not await self.ping_connection():
-                self.logger.warning("[TTS] Websocket not connected. Initiating reconnect.")
-                await self.connect()
+    async def synthesize(self, text):
+        await self.drain_socket()
+        # Send sentence
+        await self.websocket.send(dumps({"text": text, "flush": True}))
 
-            await self.drain_socket()
-            # Send sentence
-            await self.websocket.send(dumps({"text": text, "flush": True}))
+        while True:
+            try:
+                message = await asyncio.wait_for(self.websocket.recv(), timeout=5.0)
+                data = loads(message)
 
-            while True:
-                try:
-                    message = await asyncio.wait_for(self.websocket.recv(), timeout=5.0)
-                    data = loads(message)
-
-                    if data.get("audio"):
-                        return base64.b64decode(data["audio"])
-                    if data.get("isFinal"):
-                        return None
-                except asyncio.TimeoutError:
-                    self.logger.error('[TTS] No audio received from Elevenlabs')
-                    self.websocket = None
-                    return None
-                except websockets.exceptions.ConnectionClosedOK:
-                    # Normal closure (1000), nothing to worry about
-                    self.logger.warning("[TTS] WebSocket closed cleanly by server.")
-                    self.websocket = None
+                if data.get("audio"):
+                    self.mark_ok()
+                    return base64.b64decode(data["audio"])
+                if data.get("isFinal"):
                     return None
-                except websockets.exceptions.ConnectionClosedError as e:
-                    # Abnormal closure
-                    self.logger.error(f"[TTS] WebSocket closed with error: {e}")
-                    self.websocket = None
+            except asyncio.TimeoutError:
+                self.logger.error('[TTS] No audio received from Elevenlabs')
+                self.healthy = False
+                return None
+            except websockets.exceptions.ConnectionClosedOK:
+                # Normal closure (1000), nothing to worry about
+                self.logger.warning("[TTS] WebSocket closed cleanly by server.")
+                self.healthy = False
+                return None
+            except websockets.exceptions.ConnectionClosedError as e:
+                # Abnormal closure
+                self.logger.error(f"[TTS] WebSocket closed with error: {e}")
+                self.healthy = False
+                return None
+            except Exception as e:
+                # Catch-all for JSON parsing or other issues
+                self.logger.error(f"[TTS] Other failure in elevenlabs tts: {e}")
+                self.healthy = False
+                return None
+
+
+class ElevenLabsTTS:
+    """
+    Pool of ElevenLabs stream-input websockets.
+
+    Each ``speak`` call checks out its own connection, so several utterances can be synthesized concurrently. A
+    background task pings idle connections every ``health_check_interval`` seconds and keeps them open, so ``speak``
+    only pays for a ping round trip when a connection has not been confirmed healthy recently. Broken connections
+    are reopened with exponential backoff.
+    """
+
+    def __init__(self, elevenlabs_key, voice_id, model_id, sample_rate=22050, speaking_rate=None, stability=0.5,
+                 pool_size=2, health_check_interval=30, base_url=ELEVENLABS_BASE_URL):
+        self.elevenlabs_key = elevenlabs_key
+        self.voice_id = voice_id
+        self.model_id = model_id
+        self.sample_rate = sample_rate
+        self.speaking_rate = max(0.7, min(speaking_rate, 1.2)) if speaking_rate else speaking_rate
+        self.stability = stability
+        self.pool_size = max(1, pool_size)
+        self.health_check_interval = health_check_interval
+        self.base_url = base_url
+        self.connections = []
+        # Created in connect() so the queue belongs to the event loop that runs the pool
+        self._idle = None
+        self._health_task = None
+        # Development logging
+        self.logger = logging.getLogger("codenames")
+
+    @property
+    def uri(self):
+        return (
+            f"{self.base_url}/v1/text-to-speech/{self.voice_id}/stream-input"
+            f"?model_id={self.model_id}"
+            f"&output_format=pcm_{self.sample_rate}"
+            f"&inactivity_timeout=180"
+            f"&auto_mode=false"
+        )
+
+    async def connect(self):
+        """Open the connection pool and start the background health checks."""
+        if self._idle is not None:
+            return
+        self._idle = asyncio.Queue()
+        for _ in range(self.pool_size):
+            connection = _ElevenLabsConnection(self)
+            await connection.open()
+            self.connections.append(connection)
+            self._idle.put_nowait(connection)
+        self._health_task = asyncio.get_running_loop().create_task(self._health_check_loop())
+
+    async def disconnect(self):
+        if self._health_task:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for connection in self.connections:
+            await connection.close()
+        self.connections = []
+        self._idle = None
+
+    async def speak(self, text):
+        # Open the pool if it was never connected.
+        if self._idle is None:
+            self.logger.warning("[TTS] Websocket pool not connected. Connecting.")
+            await self.connect()
+
+        connection = await self._idle.get()
+        try:
+            # Only ping when the connection was not recently confirmed by a health check or synthesis
+            if not connection.is_known_healthy(self.health_check_interval) and not await connection.ping():
+                self.logger.warning("[TTS] Websocket not connected. Initiating reconnect.")
+                if not await self._reconnect(connection):
                     return None
-                except Exception as e:
-                    # Catch-all for JSON parsing or other issues
-                    self.logger.error(f"[TTS] Other failure in elevenlabs tts: {e}")
-                    self.websocket = None
+            try:
+                return await connection.synthesize(text)
+            except websockets.exceptions.ConnectionClosed:
+                # The socket died since it was last confirmed healthy; reopen it and retry once
+                self.logger.warning("[TTS] Websocket closed before sending. Initiating reconnect.")
+                if not await self._reconnect(connection):
                     return None
+                return await connection.synthesize(text)
+        finally:
+            self._idle.put_nowait(connection)
+
+    async def _reconnect(self, connection):
+        """Reopen ``connection`` with exponential backoff; return whether it succeeded."""
+        delay = RECONNECT_BASE_DELAY
+        for attempt in range(1, RECONNECT_ATTEMPTS + 1):
+            await connection.close()
+            try:
+                await connection.open()
+                return True
+            except Exception as e:
+                self.logger.warning(f"[TTS] Reconnect attempt {attempt}/{RECONNECT_ATTEMPTS} failed: {e}")
+            if attempt < RECONNECT_ATTEMPTS:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+        self.logger.error("[TTS] Could not reconnect to Elevenlabs.")
+        return False
+
+    async def check_health(self):
+        """Ping every idle connection once, keep healthy ones alive and reopen broken ones."""
+        for _ in range(self._idle.qsize()):
+            connection = self._idle.get_nowait()
+            try:
+                if await connection.ping() and await connection.keepalive():
+                    continue
+                self.logger.warning("[TTS] Health check failed. Initiating reconnect.")
+                await self._reconnect(connection)
+            finally:
+                self._idle.put_nowait(connection)
+
+    async def _health_check_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                self.logger.error(f"[TTS] Health check error: {e}")
 
 
 class TTSCacher:
@@ -231,3 +375,69 @@ class TTSCacher:
     def _save_cache(self):
         with open(self.tts_cache_map_file, "w") as f:
             dump(self.tts_cache, f, indent=2)
+
+
+class PCMCache:
+    """
+    In-memory LRU of decoded PCM clips, bounded by a total byte budget.
+
+    Entries are keyed by the TTS key plus the amplification parameters that were applied, so the same
+    utterance played with and without amplification is cached separately.
+    """
+
+    def __init__(self, max_bytes=PCM_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._clips = OrderedDict()  # key -> (audio_bytes, framerate)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(tts_key, amplified=False, compression_strength=2.0, target_level=0.9):
+        """Combine a TTS key with the amplification parameters applied to the clip."""
+        if not amplified:
+            return tts_key, None
+        return tts_key, (compression_strength, target_level)
+
+    def get(self, key):
+        """Return ``(audio_bytes, framerate)`` for ``key`` and mark it as recently used, or ``None``."""
+        with self._lock:
+            clip = self._clips.get(key)
+            if clip is not None:
+                self._clips.move_to_end(key)
+            return clip
+
+    def put(self, key, audio_bytes, framerate):
+        """Store a clip, evicting the least recently used clips until the budget is met."""
+        size = len(audio_bytes)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._clips.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[0])
+            self._clips[key] = (audio_bytes, framerate)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (evicted, _) = self._clips.popitem(last=False)
+                self._size -= len(evicted)
+
+    def invalidate(self, tts_key):
+        """Drop every cached variant of ``tts_key`` (e.g. after the audio was regenerated)."""
+        with self._lock:
+            for key in [k for k in self._clips if k[0] == tts_key]:
+                self._size -= len(self._clips.pop(key)[0])
+
+    def clear(self):
+        with self._lock:
+            self._clips.clear()
+            self._size = 0
+
+    @property
+    def size_bytes(self):
+        return self._size
+
+    def __contains__(self, key):
+        return key in self._clips
+
+    def __len__(self):
+        return len(self._clips)
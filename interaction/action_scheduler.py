@@ -0,0 +1,145 @@
+"""Small scheduler for the robot's concurrent actions (display, animation, speech).
+
+Actions run on a thread pool. An action may depend on other actions (``after``), and actions that
+share a ``resource`` run one at a time in submission order, e.g. two speech actions never overlap.
+Every action's waiting and running time is recorded so slow steps of a guess are easy to spot.
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+
+SPEECH = "speech"
+DISPLAY = "display"
+MOTION = "motion"
+
+
+class Action:
+    def __init__(self, name, fn, args, kwargs, after, resource):
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.after = after
+        self.resource = resource
+        self.future = Future()
+        # Run in the submitter's context, so e.g. tracing spans nest under the submitting step
+        self.context = contextvars.copy_context()
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+    def timing(self):
+        """Seconds spent waiting for dependencies/resource and running, once finished."""
+        return {
+            "action": self.name,
+            "resource": self.resource,
+            "wait_s": round(self.started_at - self.submitted_at, 3) if self.started_at else None,
+            "run_s": round(self.finished_at - self.started_at, 3) if self.finished_at and self.started_at else None,
+        }
+
+
+class ActionScheduler:
+    """
+    Run actions concurrently with dependencies and per-resource serialisation.
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of actions that can run at the same time.
+    log : bool
+        Print the timing of every finished action.
+    """
+
+    def __init__(self, max_workers=4, log=True):
+        self.log = log
+        self.timings = []  # one dict per finished action, see Action.timing
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="action")
+        self._lock = threading.Lock()
+        self._last_on_resource = {}
+        self._pending = set()
+
+    def submit(self, name, fn, *args, after=(), resource=None, **kwargs) -> Action:
+        """
+        Schedule ``fn(*args, **kwargs)``. It starts once every action in ``after`` has finished
+        (successfully or not) and the previous action on ``resource`` is done.
+        """
+        with self._lock:
+            action = Action(name, fn, args, kwargs, [a for a in after if a is not None], resource)
+            if resource is not None:
+                previous = self._last_on_resource.get(resource)
+                if previous is not None:
+                    action.after.append(previous)
+                self._last_on_resource[resource] = action
+            self._pending.add(action)
+
+        waiting_for = [a for a in action.after if not a.done()]
+        if not waiting_for:
+            self._start(action)
+            return action
+
+        remaining = [len(waiting_for)]
+        counter_lock = threading.Lock()
+
+        def dependency_done(_):
+            with counter_lock:
+                remaining[0] -= 1
+                ready = remaining[0] == 0
+            if ready:
+                self._start(action)
+
+        for dependency in waiting_for:
+            dependency.future.add_done_callback(dependency_done)
+        return action
+
+    def wait(self, timeout=None) -> bool:
+        """Block until every submitted action has finished; False on timeout."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            with self._lock:
+                pending = list(self._pending)
+            if not pending:
+                return True
+            for action in pending:
+                remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+                try:
+                    action.future.exception(remaining)
+                except TimeoutError:
+                    return False
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start(self, action):
+        self._executor.submit(self._run, action)
+
+    def _run(self, action):
+        action.started_at = time.perf_counter()
+        try:
+            result = action.context.run(action.fn, *action.args, **action.kwargs)
+        except Exception as e:
+            print(f"[Actions] {action.name} failed: {e}")
+            action.finished_at = time.perf_counter()
+            self._finish(action)
+            action.future.set_exception(e)
+            return
+        action.finished_at = time.perf_counter()
+        self._finish(action)
+        action.future.set_result(result)
+
+    def _finish(self, action):
+        timing = action.timing()
+        with self._lock:
+            self.timings.append(timing)
+            self._pending.discard(action)
+            if self._last_on_resource.get(action.resource) is action:
+                del self._last_on_resource[action.resource]
+        if self.log:
+            print(f"[Actions] {timing['action']}: waited {timing['wait_s']:.2f}s, ran {timing['run_s']:.2f}s")
@@ -0,0 +1,97 @@
+"""Asyncio facade over the blocking ``Guesser`` used by the game loop.
+
+Listening, speaking, recording control, LLM calls and feature extraction are blocking calls into
+SIC, the STT service and the audio worker. ``AsyncGuesser`` runs each of them in a worker thread so
+the game loop can await them as tasks, run independent steps side by side and cancel work it no
+longer needs (a cancelled task that has not started yet never runs).
+
+``speak_and_listen`` runs the robot's speech and the next ``listen()`` as concurrent tasks: when
+the participant starts talking over the robot (barge-in on the ``PlaybackGate``), the speech task
+is cancelled, the rest of the utterance is skipped and listening starts right away.
+"""
+
+import asyncio
+from concurrent.futures import Future
+
+
+class AsyncGuesser:
+    """
+    Coroutine versions of the ``Guesser`` calls the game loop needs.
+
+    The desktop echo guard (not listening while the robot's speech may still be heard) is deferred:
+    ``say`` returns when playback ends, and ``listen`` waits out whatever is left of the echo tail.
+    Work done between speaking and listening therefore overlaps the guard instead of adding to it.
+    """
+
+    def __init__(self, guesser):
+        self.guesser = guesser
+        guesser.defer_echo_guard = True
+
+    async def run(self, fn, *args, **kwargs):
+        """Run any blocking ``fn`` in a worker thread."""
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    def spawn(self, fn, *args, **kwargs) -> Future:
+        """
+        Start ``fn`` as a task on the running loop. The returned future can be waited on and
+        cancelled from any thread, e.g. by the turn manager running in a worker thread.
+        """
+        return asyncio.run_coroutine_threadsafe(self.run(fn, *args, **kwargs), asyncio.get_running_loop())
+
+    async def say(self, text, **kwargs):
+        try:
+            await self.run(self.guesser.say, text, **kwargs)
+        except asyncio.CancelledError:
+            # The worker thread keeps going until the playing clip ends; the gate makes it skip the rest
+            self.guesser.stop_speaking()
+            raise
+
+    async def speak_and_listen(self, speech) -> str:
+        """
+        Run the ``speech`` coroutine and ``listen()`` as concurrent tasks and return what was heard.
+        Listening starts once the speech is over, or as soon as the participant barges in, which
+        cancels the speech task.
+        """
+        loop = asyncio.get_running_loop()
+        speech_task = asyncio.ensure_future(speech)
+
+        def barge_in():
+            loop.call_soon_threadsafe(speech_task.cancel)
+
+        gate = self.guesser.playback_gate
+        gate.add_barge_in_listener(barge_in)
+        listen_task = asyncio.create_task(self._listen_after(speech_task))
+        try:
+            return await listen_task
+        finally:
+            gate.remove_barge_in_listener(barge_in)
+            speech_task.cancel()
+
+    async def _listen_after(self, speech_task):
+        await asyncio.wait([speech_task])
+        if speech_task.cancelled():
+            self.guesser.stop_speaking()
+            print("[AsyncGuesser] Participant started speaking, robot speech cut off")
+        elif speech_task.exception() is not None:
+            print(f"[AsyncGuesser] Speech failed, listening anyway: {speech_task.exception()}")
+        return await self.listen()
+
+    async def listen(self) -> str:
+        remaining = self.guesser.echo_guard_remaining()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        return await self.run(self.guesser.listen)
+
+    async def start_recording(self):
+        await self.run(self.guesser.start_recording)
+
+    async def pause_recording(self):
+        await self.run(self.guesser.pause_recording)
+
+    async def resume_recording(self):
+        await self.run(self.guesser.resume_recording)
+
+    async def submit_audio(self, clue_word, turn_number):
+        """Stop recording; returns the future of the turn's audio analysis without waiting for it."""
+        return await self.run(self.guesser.submit_audio, clue_word, turn_number)
+
@@ -0,0 +1,195 @@
+"""Compressed archive of the participants' turn recordings.
+
+``AudioRecorder`` writes raw stereo 16-bit WAVs. ``AudioArchive.add`` stores each one as a mono
+FLAC (lossless, so features recomputed later match) or Opus file under
+``<root>/<participant_id>/``. The encoding runs on a background thread after the turn.
+Every archived clip gets one line in that folder's ``manifest.jsonl``, with its duration, sample
+rate and SHA-256.
+
+``AudioArchiveReader`` lists the clips from the manifests and reads any range of a clip by seeking
+in the compressed file, so reprocessing can stream clips without decoding them whole.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import soundfile as sf
+
+ARCHIVE_FORMATS = {
+    "flac": ("flac", "FLAC", "PCM_16"),
+    "opus": ("ogg", "OGG", "OPUS"),  # lossy: much smaller, but features recomputed from it drift slightly
+}
+DEFAULT_ARCHIVE_FORMAT = "flac"
+MANIFEST_NAME = "manifest.jsonl"
+FAILED_DIR = "failed"  # recordings that could not be archived are kept here, under the participant's folder
+CALIBRATION_TURN_PREFIX = "calibration_"  # "turn" of calibration recordings: calibration_<config id>
+
+
+class AudioArchive:
+    """
+    Writes one participant's turn recordings into the archive.
+
+    Parameters
+    ----------
+    root : str
+        Archive root; clips go to ``<root>/<participant_id>/``.
+    participant_id : str
+        Participant whose recordings are archived.
+    fmt : str
+        One of ``ARCHIVE_FORMATS``.
+    """
+
+    def __init__(self, root, participant_id, fmt=DEFAULT_ARCHIVE_FORMAT):
+        if fmt not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format {fmt!r}, expected one of {list(ARCHIVE_FORMATS)}")
+        self.root = root
+        self.participant_id = str(participant_id)
+        self.fmt = fmt
+        self.directory = os.path.join(root, self.participant_id)
+        os.makedirs(self.directory, exist_ok=True)
+        self.manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+        self._manifest_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-archive")
+
+    def add(self, wav_path, turn, delete_source=True):
+        """
+        Queue ``wav_path`` for archiving and return ``(archive_path, future)`` right away; the future
+        resolves to the manifest entry once the clip is encoded (and the source removed). If
+        encoding fails, the future raises and the source is moved to ``FAILED_DIR`` instead.
+        """
+        extension = ARCHIVE_FORMATS[self.fmt][0]
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        archive_path = os.path.join(self.directory, f"turn_{turn}_{timestamp}.{extension}")
+        future = self._executor.submit(self._archive, wav_path, archive_path, turn, delete_source)
+        return archive_path, future
+
+    def close(self, wait=True):
+        """Finish the queued clips (with ``wait``) and stop the encoder thread."""
+        self._executor.shutdown(wait=wait)
+
+    def _archive(self, wav_path, archive_path, turn, delete_source):
+        try:
+            entry = self._encode(wav_path, archive_path, turn)
+        except Exception as e:
+            kept = self._keep_failed(wav_path, archive_path, delete_source)
+            print(f"[AudioArchive] Turn {turn}: archiving failed ({type(e).__name__}: {e}), recording kept at {kept}")
+            raise
+        if delete_source:
+            os.unlink(wav_path)
+        print(f"[AudioArchive] Turn {turn}: {entry['source_bytes']} -> {entry['archived_bytes']} bytes")
+        return entry
+
+    def _encode(self, wav_path, archive_path, turn):
+        _, container, subtype = ARCHIVE_FORMATS[self.fmt]
+        audio, sample_rate = sf.read(wav_path, dtype="float32", always_2d=True)
+        mono = audio.mean(axis=1)
+        sf.write(archive_path, mono, sample_rate, format=container, subtype=subtype)
+        entry = {
+            "participant_id": self.participant_id,
+            "turn": turn,
+            "file": os.path.basename(archive_path),
+            "format": self.fmt,
+            "sample_rate": sample_rate,
+            "frames": len(mono),
+            "duration_s": round(len(mono) / sample_rate, 3),
+            "sha256": file_sha256(archive_path),
+            "source_bytes": os.path.getsize(wav_path),
+            "archived_bytes": os.path.getsize(archive_path),
+            "archived_at": time.time(),
+        }
+        with self._manifest_lock, open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return entry
+
+    def _keep_failed(self, wav_path, archive_path, delete_source):
+        """Drop the partial archive file and move the source out of the temp folder; returns where it is."""
+        if os.path.exists(archive_path):
+            os.unlink(archive_path)
+        if not delete_source or not os.path.exists(wav_path):
+            return wav_path
+        failed_dir = os.path.join(self.directory, FAILED_DIR)
+        os.makedirs(failed_dir, exist_ok=True)
+        try:
+            return shutil.move(wav_path, os.path.join(failed_dir, os.path.basename(wav_path)))
+        except OSError:
+            return wav_path
+
+
+class AudioArchiveReader:
+    """Random access to the archived clips of all participants under ``root``."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def entries(self, participant_id=None):
+        """Manifest entries (oldest first), each with its absolute ``path`` added."""
+        participants = [str(participant_id)] if participant_id is not None else sorted(os.listdir(self.root))
+        entries = []
+        for pid in participants:
+            manifest_path = os.path.join(self.root, pid, MANIFEST_NAME)
+            if not os.path.isfile(manifest_path):
+                continue
+            with open(manifest_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entry["path"] = os.path.join(self.root, pid, entry["file"])
+                        entries.append(entry)
+        return entries
+
+    def find(self, participant_id, turn):
+        """The latest clip archived for ``participant_id``'s ``turn``, or ``None``."""
+        matches = [e for e in self.entries(participant_id) if e["turn"] == turn]
+        return matches[-1] if matches else None
+
+    @staticmethod
+    def read(entry, start_s=0.0, duration_s=None):
+        """``(samples, sample_rate)`` of ``duration_s`` seconds (default: to the end) from ``start_s``."""
+        return read_clip(entry["path"], start_s, duration_s)
+
+    def read_last(self, entry, seconds):
+        """The last ``seconds`` of a clip, e.g. the window the feature extractor looks at."""
+        return self.read(entry, start_s=max(0.0, entry["duration_s"] - seconds))
+
+    def stream(self, entry, block_s=1.0, start_s=0.0):
+        """Yield consecutive blocks of ``block_s`` seconds without decoding the whole clip."""
+        with sf.SoundFile(entry["path"]) as f:
+            f.seek(min(int(start_s * f.samplerate), f.frames))
+            for block in f.blocks(blocksize=max(1, int(block_s * f.samplerate)), dtype="float32"):
+                yield block
+
+    @staticmethod
+    def verify(entry):
+        """True if the clip on disk still matches the hash in the manifest."""
+        return file_sha256(entry["path"]) == entry["sha256"]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_clip(path, start_s=0.0, duration_s=None):
+    """Seek to ``start_s`` in an audio file and decode only the requested range."""
+    with sf.SoundFile(path) as f:
+        f.seek(min(int(start_s * f.samplerate), f.frames))
+        frames = -1 if duration_s is None else int(duration_s * f.samplerate)
+        return f.read(frames, dtype="float32"), f.samplerate
+
+
+def write_wav_copy(entry, out_path, start_s=0.0, duration_s=None):
+    """Decode (part of) an archived clip into a WAV file, for tools that need a path."""
+    samples, sample_rate = read_clip(entry["path"], start_s, duration_s)
+    sf.write(out_path, samples, sample_rate)
+    return out_path
@@ -1,34 +1,25 @@
-import json
+import contextvars
 import os
 import subprocess
 import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
 import soundfile as sf
 
+from agents.playback_gate import BargeInDetector
+from interaction import session_store, tracing
+from interaction.audio_archive import AudioArchive, DEFAULT_ARCHIVE_FORMAT
+from interaction.feature_workers import FeatureExtractionError, FeatureWorkerPool, PRIORITY_BACKGROUND, PRIORITY_LIVE
+from interaction.session_log import SessionLog
 from multimodal_perception.model.confidence_classifier import ConfidenceClassifier
-from multimodal_perception.audio.important_feature_extractor import ImportantFeaturesExtractor
 from multimodal_perception.audio.recorder import AudioRecorder
-from multimodal_perception.audio.transcribe_audio import WhisperTranscriber
-from multiprocessing import Process, Queue
 
 _HERE = os.path.dirname(os.path.abspath(__file__))
 LOG_DIR = os.path.join(_HERE, "..", "logs")
 
 
-def worker_loop(task_q, result_q):
-    # Initialize heavy objects once in the worker process
-    whisper = WhisperTranscriber()
-    extractor = ImportantFeaturesExtractor(whisper)
-    while True:
-        audio_path = task_q.get()
-        if audio_path is None:
-            break
-        features = extractor.extract(audio_path)
-        result_q.put(features)
-
-
 class AudioPipeline:
     """
     Per-turn audio pipeline: record → extract features → classify confidence
@@ -43,28 +34,52 @@ class AudioPipeline:
         Index of the audio input device to record from.  ``None`` uses the
         system default.
     log_dir : str
-        Directory where the JSON log file is written.
+        Directory where the JSONL session log is written (read it with
+        ``interaction.session_log.read_session_log``).
+    playback_gate : PlaybackGate or None
+        Robot playback timeline; audio recorded while the robot speaks is dropped.
+    detect_barge_in : bool
+        Signal barge-in on ``playback_gate`` when the participant talks over the robot.
+    background_log : bool
+        Write the session log on a background thread instead of in ``stop_and_process``.
+    archive_format : str
+        Format the turn recordings are archived in (see ``interaction.audio_archive``).
+    profile_worker : bool
+        Record per-stage wall/CPU time and peak RSS of the feature worker for every turn; the
+        profile is added to the session log entry as ``worker_profile``.
+    feature_workers : int
+        Size of the feature worker pool. One worker is kept for live turns; with more, calibration
+        and reprocessing jobs (``submit_features``) run next to the game without delaying it.
     """
 
-    def __init__(self, participant_id: str, audio_device_index=None, log_dir=LOG_DIR):
+    def __init__(self, participant_id: str, audio_device_index=None, log_dir=LOG_DIR,
+                 playback_gate=None, detect_barge_in=False, background_log=True,
+                 archive_format=DEFAULT_ARCHIVE_FORMAT, profile_worker=False,
+                 feature_workers=1):
         self.participant_id = participant_id
-        self.recorder = AudioRecorder(device_index=audio_device_index)
+        self.log_dir = log_dir
+        self.last_worker_profile = None
+        # Analysis started while the clue is confirmed: (frame count, snapshot path, future)
+        self._speculation = None
+        self.speculation_stats = {"issued": 0, "committed": 0, "discarded": 0}
+        barge_in_detector = BargeInDetector(playback_gate) if playback_gate and detect_barge_in else None
+        self.recorder = AudioRecorder(device_index=audio_device_index, playback_gate=playback_gate,
+                                      barge_in_detector=barge_in_detector)
         # construct classifier with participant so it can auto-load calibration
         self.classifier = ConfidenceClassifier(participant_id=self.participant_id)
 
         os.makedirs(log_dir, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.log_path = os.path.join(log_dir, f"session_{participant_id}_{timestamp}.json")
-        self._log_entries = []
+        self.log_path = os.path.join(log_dir, f"session_{participant_id}_{timestamp}.jsonl")
+        self.session_log = SessionLog(self.log_path, background=background_log)
 
-        self.audio_dir = os.path.join(log_dir, "audio", self.participant_id)
-        os.makedirs(self.audio_dir, exist_ok=True)
+        # Turn recordings are stored compressed under <log_dir>/audio/<participant_id>/
+        self.archive = AudioArchive(os.path.join(log_dir, "audio"), self.participant_id, fmt=archive_format)
+        self.audio_dir = self.archive.directory
 
-        # Persistent worker setup
-        self.task_q = Queue()
-        self.result_q = Queue()
-        self._worker_proc = Process(target=worker_loop, args=(self.task_q, self.result_q), daemon=True)
-        self._worker_proc.start()
+        # Persistent feature workers
+        self.pool = FeatureWorkerPool(feature_workers, trace_path=tracing.trace_path(), profile=profile_worker)
+        self._analysis_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-analysis")
 
     def __del__(self):
         try:
@@ -73,24 +88,40 @@ class AudioPipeline:
             pass
 
     def shutdown(self, timeout: Optional[float] = 5.0):
-        """Cleanly stop the worker process by sending None and joining."""
-        proc = getattr(self, "_worker_proc", None)
-        if proc is None:
-            return
-        try:
-            # Signal worker to exit
-            self.task_q.put(None)
-            proc.join(timeout)
-        except Exception:
-            pass
-        finally:
-            try:
-                if proc.is_alive():
-                    proc.terminate()
-                    proc.join()
-            except Exception:
-                pass
-            self._worker_proc = None
+        """Finish the submitted turns, close the logs and stop the feature workers."""
+        if getattr(self, "_speculation", None) is not None:
+            self.discard_speculation()
+        analysis_executor = getattr(self, "_analysis_executor", None)
+        if analysis_executor is not None:
+            analysis_executor.shutdown(wait=True)
+        # The archive goes first: its pending clips still append their turns to the session log
+        archive = getattr(self, "archive", None)
+        if archive is not None:
+            archive.close()
+        session_log = getattr(self, "session_log", None)
+        if session_log is not None:
+            session_log.close()
+        pool = getattr(self, "pool", None)
+        if pool is not None:
+            pool.shutdown(timeout)
+            self.pool = None
+
+    def submit_features(self, audio_path, priority=PRIORITY_BACKGROUND):
+        """
+        Extract the features of another recording (calibration, reprocessing) on the worker pool;
+        returns a future of ``(features, profile)``. Never delays the live turns.
+        """
+        return self.pool.submit(audio_path, priority)
+
+    def request_profile_dump(self, path=None, jobs=1):
+        """
+        Sample the feature workers' stacks during their next ``jobs`` jobs and write them (collapsed
+        stacks) to ``path``; returns the paths. Works with or without ``profile_worker``.
+        """
+        if path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(self.log_dir, "profiles", f"worker_{self.participant_id}_{timestamp}.txt")
+        return self.pool.request_profile_dump(path, jobs)
 
     def start_recording(self):
         """Start capturing audio from the configured input device."""
@@ -166,6 +197,61 @@ class AudioPipeline:
                 pass
             return audio_path
 
+    def speculate(self, turn):
+        """
+        Start analysing the recording while it is paused for the clue confirmation. ``submit``
+        uses the result if nothing was recorded since; ``discard_speculation`` drops it when the
+        spymaster has to repeat the clue.
+        """
+        self.discard_speculation()
+        frames = self.recorder.frame_count()
+        snapshot_path = self.recorder.snapshot()
+        if snapshot_path is None:
+            return
+        if self.recorder.frame_count() != frames:
+            # Still recording: the snapshot would not be the final audio
+            os.unlink(snapshot_path)
+            return
+        context = contextvars.copy_context()
+        future = self._analysis_executor.submit(context.run, self._analyse_snapshot, snapshot_path, turn)
+        self._speculation = (frames, snapshot_path, future)
+        self.speculation_stats["issued"] += 1
+
+    def discard_speculation(self):
+        """Drop the speculative analysis; it is ignored if it is already running."""
+        if self._speculation is None:
+            return
+        _, snapshot_path, future = self._speculation
+        self._speculation = None
+        if future.cancel():
+            os.unlink(snapshot_path)
+        self.speculation_stats["discarded"] += 1
+
+    def submit(self, clue, turn) -> Future:
+        """
+        Stop recording and return at once; the recording is analysed (features, confidence,
+        archive and log, as in ``stop_and_process``) in the background. The future resolves to
+        ``(features, confidence_level)``. Turns are analysed one after another, in order.
+        """
+        with tracing.span("recorder_stop", turn=turn):
+            audio_path = self.recorder.stop()
+        speculative = self._take_speculation()
+        # Keep the caller's tracing context, so the analysis spans nest under its turn
+        context = contextvars.copy_context()
+        return self._analysis_executor.submit(context.run, self._process, audio_path, clue, turn, speculative)
+
+    def _take_speculation(self):
+        """The speculative analysis if it was made of exactly the audio recorded, else ``None``."""
+        if self._speculation is None:
+            return None
+        frames, _, future = self._speculation
+        if self.recorder.frame_count() != frames:
+            self.discard_speculation()
+            return None
+        self._speculation = None
+        self.speculation_stats["committed"] += 1
+        return future
+
     def stop_and_process(self, clue, turn):
         """
         Stop recording, run the feature-extraction and classification pipeline,
@@ -184,19 +270,36 @@ class AudioPipeline:
         tuple[dict, str]
             A ``(features, confidence_level)`` pair where *features* is the
             raw feature dict and *confidence_level* is ``"low"``,
-            ``"medium"``, or ``"high"``.
+            ``"medium"``, or ``"high"`` (both ``None`` when extraction failed).
         """
-        audio_path = self.recorder.stop()
+        return self.submit(clue, turn).result()
 
+    def _analyse_snapshot(self, snapshot_path, turn):
+        try:
+            with tracing.span("speculative_analysis", turn=turn):
+                return self._analyse(snapshot_path, turn)
+        finally:
+            os.unlink(snapshot_path)
+
+    def _analyse(self, audio_path, turn):
+        """Features, confidence level and worker profile of a recording (``None``s when extraction fails)."""
         # Clip the last 60 seconds of the recording before extracting features.
-        clipped_path = self._clip_last_seconds(audio_path, seconds=60)
+        with tracing.span("clip_audio"):
+            clipped_path = self._clip_last_seconds(audio_path, seconds=60)
 
-        # Submit to persistent worker and wait for result
-        self.task_q.put(clipped_path)
-        features = self.result_q.get()
+        # Submit to the worker pool ahead of any background job and wait for the result
+        features, confidence_level, worker_profile = None, None, None
+        with tracing.span("wait_for_features"):
+            try:
+                features, worker_profile = self.pool.submit(clipped_path, PRIORITY_LIVE).result()
+            except FeatureExtractionError as e:
+                # Play the turn without a confidence level rather than stop the game
+                print(f"[AudioPipeline] Feature extraction failed for turn {turn}: {e}")
 
         # Classify confidence level based on extracted features
-        _, confidence_level = self.classifier.classify(features)
+        if features is not None:
+            with tracing.span("classify"):
+                _, confidence_level = self.classifier.classify(features)
 
         # Clean up the temporary audio files now that features have been extracted
         # Remove clipped file if it is a different temporary file
@@ -205,19 +308,20 @@ class AudioPipeline:
                 os.unlink(clipped_path)
             except OSError:
                 pass
+        return features, confidence_level, worker_profile
 
-        # Save original recording in participant-specific folder
-        saved_audio_path = None
-        if audio_path is not None:
-            try:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                saved_audio_path = os.path.join(
-                    self.audio_dir,
-                    f"turn_{turn}_{timestamp}.wav"
-                )
-                os.rename(audio_path, saved_audio_path)
-            except Exception:
-                saved_audio_path = None
+    def _process(self, audio_path, clue, turn, speculative=None):
+        with tracing.span("stop_and_process", turn=turn, speculative=speculative is not None):
+            result = None
+            if speculative is not None:
+                try:
+                    result = speculative.result()
+                    print(f"[AudioPipeline] Turn {turn}: using the analysis started during clue confirmation")
+                except Exception as e:
+                    print(f"[AudioPipeline] Speculative analysis failed, analysing again: {e}")
+            if result is None:
+                result = self._analyse(audio_path, turn)
+            features, confidence_level, self.last_worker_profile = result
 
         entry = {
             "participant_id": self.participant_id,
@@ -225,17 +329,35 @@ class AudioPipeline:
             "clue": clue,
             "features": _to_serializable(features),
             "confidence_level": confidence_level,
-            "audio_file": saved_audio_path,
+            "audio_file": None,
         }
-        self._log_entries.append(entry)
-        self._save_log()
+        if self.last_worker_profile is not None:
+            entry["worker_profile"] = self.last_worker_profile
+            print(f"[AudioPipeline] Worker profile: {_format_profile(self.last_worker_profile)}")
+        store = session_store.current()
+        if audio_path is None:
+            self._log_turn(entry, store)
+        else:
+            # Archive the original recording (compressed on a background thread) in the participant's
+            # folder; the turn is logged once the clip is in the manifest, or with the reason it is not
+            archive_path, archived = self.archive.add(audio_path, turn)
+            archived.add_done_callback(lambda future: self._log_turn(entry, store, archive_path, future))
 
         print(f"[AudioPipeline] Turn {turn} | clue='{clue}' | confidence={confidence_level}")
         return features, confidence_level
 
-    def _save_log(self):
-        with open(self.log_path, "w", encoding="utf-8") as f:
-            json.dump(self._log_entries, f, indent=2)
+    def _log_turn(self, entry, store, archive_path=None, archived=None):
+        """Append the turn to the session log; ``archived`` is the archive future of its recording."""
+        if archived is not None:
+            try:
+                archived.result()
+            except Exception as e:
+                entry["audio_error"] = f"{type(e).__name__}: {e}"
+            else:
+                entry["audio_file"] = archive_path
+                if store is not None:
+                    store.log_audio(entry["turn"], archive_path)
+        self.session_log.append(entry)
 
     def stop_recording_if_active(self):
         """Stop the recorder if it's currently active and remove the temporary
@@ -281,6 +403,14 @@ class AudioPipeline:
             return None
 
 
+def _format_profile(profile):
+    stages = ", ".join(f"{name} {t['wall_s']:.2f}s" for name, t in profile.get("stages", {}).items())
+    summary = f"{stages} | peak RSS {profile.get('peak_rss_mb')} MiB"
+    if "sampling_dump" in profile:
+        summary += f" | stacks in {profile['sampling_dump']}"
+    return summary
+
+
 def _to_serializable(obj):
     if isinstance(obj, dict):
         return {k: _to_serializable(v) for k, v in obj.items()}
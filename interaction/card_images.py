@@ -0,0 +1,89 @@
+"""In-memory, pre-resized card images for the game state server."""
+
+import hashlib
+import io
+import threading
+from mimetypes import guess_type
+
+from PIL import Image
+
+# Widths (px) of the resized variants; requested widths are snapped up to the nearest one
+IMAGE_WIDTHS = (200, 400)
+WEBP_QUALITY = 85
+
+
+class ImageVariant:
+    def __init__(self, data: bytes, mimetype: str):
+        self.data = data
+        self.mimetype = mimetype
+        self.etag = hashlib.md5(data).hexdigest()
+
+
+class CardImageCache:
+    """
+    Keeps encoded image variants in memory so they are read and resized only once.
+
+    A variant is identified by the image path, the target width (``None`` for the original size)
+    and whether it is encoded as WebP (otherwise PNG, or the untouched file at original size).
+    """
+
+    def __init__(self, widths=IMAGE_WIDTHS):
+        self.widths = tuple(sorted(widths))
+        self._variants = {}
+        self._lock = threading.Lock()
+
+    def snap_width(self, width):
+        """Map a requested width to a precomputed one; ``None`` means the original size."""
+        if not width:
+            return None
+        for w in self.widths:
+            if w >= width:
+                return w
+        return None
+
+    def get(self, path: str, width=None, webp=False) -> ImageVariant:
+        key = (path, self.snap_width(width), webp)
+        variant = self._variants.get(key)
+        if variant is None:
+            variant = self._encode(*key)
+            with self._lock:
+                self._variants[key] = variant
+        return variant
+
+    def warm(self, paths, widths=None, webp_too=True):
+        """
+        Precompute the variants of ``paths`` at ``widths`` (default: every snapped width); unreadable
+        files are skipped. Original-size variants are never warmed: re-encoding a full-size card
+        costs far more than the UI ever asks for, so they are encoded when first requested.
+        """
+        snapped = {self.snap_width(w) for w in (widths or self.widths)} - {None}
+        for path in paths:
+            for width in sorted(snapped):
+                for webp in ((False, True) if webp_too else (False,)):
+                    try:
+                        self.get(path, width, webp)
+                    except (OSError, ValueError) as e:
+                        print(f"[IMAGES] Could not prepare {path}: {e}")
+
+    def warm_in_background(self, paths, widths=None):
+        thread = threading.Thread(target=self.warm, args=(list(paths), widths), daemon=True)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def _encode(path, width, webp):
+        if width is None and not webp:
+            with open(path, "rb") as f:
+                return ImageVariant(f.read(), guess_type(path)[0] or "application/octet-stream")
+
+        with Image.open(path) as img:
+            img.load()
+            if width is not None and img.width > width:
+                height = max(1, round(img.height * width / img.width))
+                img = img.resize((width, height), Image.LANCZOS)
+            buffer = io.BytesIO()
+            if webp:
+                img.save(buffer, format="WEBP", quality=WEBP_QUALITY)
+                return ImageVariant(buffer.getvalue(), "image/webp")
+            img.save(buffer, format="PNG", optimize=True)
+            return ImageVariant(buffer.getvalue(), "image/png")
@@ -1,11 +1,22 @@
-"""Experiment CSV logger – records per-turn measures for every game."""
+"""Experiment CSV logger – records per-turn measures for every game.
+
+Rows go through one open CSV handle that is flushed every ``flush_every`` rows. At the end of a
+session (or offline with ``python -m interaction.experiment_logger [LOG_DIR]``) the CSV is
+compacted into a typed Parquet file next to it, so all sessions load with one ``load_experiments``
+call. Parquet needs ``pyarrow``; without it the CSV files are read instead.
+"""
 
 import csv
+import glob
 import json
 import os
+import sys
 from datetime import datetime
 
 import numpy as np
+import pandas as pd
+
+from interaction import session_store
 
 _HERE = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_LOG_DIR = os.path.join(_HERE, "..", "logs")
@@ -27,6 +38,27 @@ FIELDNAMES = [
     "turn_duration_s",
 ]
 
+# Audio features (see ImportantFeaturesExtractor) that also get a typed column of their own,
+# named ``feature_<name>``; the ``features`` column keeps the complete dict as JSON
+FEATURE_KEYS = [
+    "duration",
+    "pause_max",
+    "pause_count",
+    "pause_mid_speech",
+    "speech_rate",
+    "verbal_hesitation_count",
+    "mfcc_2_mean",
+    "hnr",
+    "energy_std",
+]
+FEATURE_COLUMNS = [f"feature_{key}" for key in FEATURE_KEYS]
+FIELDNAMES = FIELDNAMES + FEATURE_COLUMNS
+
+# Column types of the compacted table
+INT_COLUMNS = ["turn", "clue_number", "score"]
+FLOAT_COLUMNS = ["turn_duration_s"] + FEATURE_COLUMNS
+LIST_COLUMNS = ["guesses", "outcomes"]
+
 
 def _make_json_serializable(obj):
     """Recursively convert numpy types/arrays to native Python types so
@@ -73,14 +105,18 @@ class ExperimentLogger:
         Key-map identifier (preferred) or map data.
     log_dir : str
         Directory where the CSV file is written.
+    flush_every : int
+        Flush the CSV after this many rows (1: every turn is on disk right away).
     """
 
     def __init__(self, participant_id, is_adaptive, board, key_map=None,
-                 log_dir=DEFAULT_LOG_DIR):
+                 log_dir=DEFAULT_LOG_DIR, flush_every=1):
         self.participant_id = participant_id
         self.condition = "adaptive" if is_adaptive else "baseline"
         self.board = board
         self.key_map = key_map
+        self.flush_every = flush_every
+        self._unflushed = 0
 
         os.makedirs(log_dir, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -88,10 +124,15 @@ class ExperimentLogger:
             log_dir, f"experiment_{participant_id}_{timestamp}.csv"
         )
 
-        # Write header
-        with open(self.csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
-            writer.writeheader()
+        # One handle for the whole session; the header is on disk right away
+        self._file = open(self.csv_path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=FIELDNAMES)
+        self._writer.writeheader()
+        self._file.flush()
+
+        store = session_store.current()
+        if store is not None:
+            store.set_session_info(board=board, key_map=key_map)
 
     def log_turn(self, turn, clue_word, clue_number, features, confidence_level,
                  guesses, outcomes, score, turn_duration_s):
@@ -106,7 +147,8 @@ class ExperimentLogger:
         clue_number : int
             Number of guesses allowed for the clue.
         features : dict | None
-            Extracted audio features (serialised as JSON string).
+            Extracted audio features (serialised as JSON string, and the
+            ``FEATURE_KEYS`` as typed columns).
         confidence_level : str | None
             Inferred confidence level (``"low"`` / ``"medium"`` / ``"high"``).
         guesses : list[str]
@@ -151,7 +193,124 @@ class ExperimentLogger:
             "score": score,
             "turn_duration_s": round(turn_duration_s, 2),
         }
+        for key, column in zip(FEATURE_KEYS, FEATURE_COLUMNS):
+            value = (features_serializable or {}).get(key)
+            row[column] = "" if value is None else value
+
+        store = session_store.current()
+        if store is not None:
+            store.log_turn(turn, clue_word, clue_number, confidence_level or None, guesses, outcomes, score,
+                           turn_duration_s, features=features_serializable)
+
+        self._writer.writerow(row)
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._file.closed:
+            return
+        self._file.flush()
+        self._unflushed = 0
+
+    def close(self, compact=True):
+        """Flush and close the CSV; with ``compact`` also write the typed Parquet copy."""
+        if self._file.closed:
+            return None
+        self._file.close()
+        return compact_csv(self.csv_path) if compact else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def read_experiment_csv(csv_path):
+    """Read one experiment CSV into a typed DataFrame (lists decoded, numbers as numbers)."""
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    for column in FIELDNAMES:
+        if column not in df.columns:  # CSV written before the column existed
+            df[column] = ""
+    for column in INT_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int64")
+    for column in FLOAT_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+    for column in LIST_COLUMNS:
+        df[column] = pd.Series([json.loads(value) if value else [] for value in df[column]],
+                               index=df.index, dtype=object)
+    return df[FIELDNAMES]
+
+
+def parquet_schema():
+    """
+    Arrow schema of the compacted files. It is fixed rather than inferred per file: a session
+    without turns (or without any guess) would otherwise get null columns that no longer load
+    together with the other sessions.
+    """
+    import pyarrow as pa
+
+    def column_type(column):
+        if column in INT_COLUMNS:
+            return pa.int64()
+        if column in FLOAT_COLUMNS:
+            return pa.float64()
+        if column in LIST_COLUMNS:
+            return pa.list_(pa.string())
+        return pa.string()
+
+    return pa.schema([(column, column_type(column)) for column in FIELDNAMES])
+
+
+def compact_csv(csv_path):
+    """Write ``csv_path`` as Parquet next to it; returns the Parquet path, or ``None`` without pyarrow."""
+    parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("[ExperimentLogger] pyarrow is not installed, keeping the CSV only")
+        return None
+    table = pa.Table.from_pandas(read_experiment_csv(csv_path), schema=parquet_schema(), preserve_index=False)
+    pq.write_table(table, parquet_path)
+    return parquet_path
+
+
+def compact_logs(log_dir=DEFAULT_LOG_DIR):
+    """Compact every experiment CSV in ``log_dir`` that has no up-to-date Parquet copy yet."""
+    written = []
+    for csv_path in sorted(glob.glob(os.path.join(log_dir, "experiment_*.csv"))):
+        parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+        if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+            continue
+        if compact_csv(csv_path) is None:
+            break
+        written.append(parquet_path)
+    return written
+
+
+def load_experiments(log_dir=DEFAULT_LOG_DIR):
+    """All sessions in ``log_dir`` as one DataFrame: the Parquet copies, plus CSVs not compacted yet."""
+    frames = []
+    parquet_paths = sorted(glob.glob(os.path.join(log_dir, "experiment_*.parquet")))
+    if parquet_paths:
+        import pyarrow.parquet as pq  # only needed once sessions have been compacted
+        df = pq.read_table(parquet_paths, schema=parquet_schema()).to_pandas()
+        for column in INT_COLUMNS:
+            df[column] = df[column].astype("Int64")
+        frames.append(df)
+    compacted = {os.path.splitext(p)[0] for p in parquet_paths}
+    for csv_path in sorted(glob.glob(os.path.join(log_dir, "experiment_*.csv"))):
+        if os.path.splitext(csv_path)[0] not in compacted:
+            frames.append(read_experiment_csv(csv_path))
+    if not frames:
+        return pd.DataFrame(columns=FIELDNAMES)
+    return pd.concat(frames, ignore_index=True)
+
 
-        with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
-            writer.writerow(row)
+if __name__ == "__main__":
+    for directory in sys.argv[1:] or [DEFAULT_LOG_DIR]:
+        for path in compact_logs(directory):
+            print(path)
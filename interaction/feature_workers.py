@@ -0,0 +1,250 @@
+"""Pool of feature-extraction worker processes with prioritised jobs.
+
+Each worker process loads Whisper and the ``ImportantFeaturesExtractor`` once and extracts one
+audio file at a time. ``FeatureWorkerPool.submit`` returns a ``Future`` per job, so callers never
+share a result queue and results may complete in any order.
+
+Pending jobs start in priority order: live turn, then calibration, then background reprocessing.
+Jobs are never preempted. To make sure a background job never delays a live turn,
+``reserved_live_workers`` workers only ever take live jobs. With the default of one reserved
+worker, a pool of size 1 runs nothing but live turns. Give it two or more workers to also process
+calibration and reprocessing jobs during a session.
+"""
+
+import heapq
+import itertools
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import Process, Queue
+
+from interaction import tracing
+from interaction.profiling import SamplingProfiler, StageProfiler
+
+PRIORITY_LIVE = 0
+PRIORITY_CALIBRATION = 1
+PRIORITY_BACKGROUND = 2
+
+_POLL_S = 0.5  # how often the collector checks that busy workers are still alive
+
+
+class FeatureExtractionError(RuntimeError):
+    """Feature extraction failed in the worker (or the worker died while extracting)."""
+
+
+def default_extractor():
+    # Imported here: only the worker processes load Whisper
+    from multimodal_perception.audio.important_feature_extractor import ImportantFeaturesExtractor
+    from multimodal_perception.audio.transcribe_audio import WhisperTranscriber
+    return ImportantFeaturesExtractor(WhisperTranscriber())
+
+
+def worker_loop(task_q, result_q, trace_path=None, profile=False, make_extractor=default_extractor, worker_id=0):
+    """
+    Extract the features of each ``(job_id, audio_path)`` put on ``task_q``. For each job, put
+    ``(worker_id, job_id, features, profile, error)`` on ``result_q``. ``profile`` holds the
+    per-stage times when profiling is on, else ``None``.
+
+    A control message ``{"control": "sample", "path": ..., "jobs": n}`` samples the stacks of the
+    next ``n`` jobs and writes them to ``path`` (reported as the profile's ``sampling_dump``).
+    ``None`` stops the worker.
+    """
+    # The worker appends its spans to the session trace of the parent process
+    if trace_path:
+        tracing.configure(path=trace_path)
+    # Initialize heavy objects once in the worker process
+    extractor = make_extractor()
+    profiler = StageProfiler() if profile else None
+    sampler, sample_jobs, sample_path = None, 0, None
+    while True:
+        task = task_q.get()
+        if task is None:
+            break
+        if isinstance(task, dict):
+            if task.get("control") == "sample":
+                sample_jobs, sample_path = max(1, task.get("jobs", 1)), task["path"]
+            continue
+        job_id, audio_path = task
+        if sample_jobs and sampler is None:
+            sampler = SamplingProfiler()
+            sampler.start()
+        if profiler is not None:
+            profiler.reset()
+        features, error = None, None
+        try:
+            with tracing.span("extract_features", worker=worker_id):
+                features = extractor.extract(audio_path, profiler=profiler)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        job_profile = profiler.result() if profiler is not None else None
+        if sampler is not None:
+            sample_jobs -= 1
+            if sample_jobs == 0:
+                sampler.stop()
+                job_profile = dict(job_profile or {}, sampling_dump=sampler.dump(sample_path))
+                sampler = None
+        result_q.put((worker_id, job_id, features, job_profile, error))
+    tracing.disable()
+
+
+class _Worker:
+    def __init__(self, worker_id, result_q, trace_path, profile, make_extractor):
+        self.worker_id = worker_id
+        self.task_q = Queue()
+        self.job = None  # (job_id, future) being extracted
+        self.process = Process(target=worker_loop, daemon=True, name=f"feature-worker-{worker_id}",
+                               args=(self.task_q, result_q, trace_path, profile, make_extractor, worker_id))
+        self.process.start()
+
+
+class FeatureWorkerPool:
+    """
+    Parameters
+    ----------
+    size : int
+        Number of worker processes (each loads its own Whisper model).
+    trace_path : str or None
+        Session trace the workers append their spans to.
+    profile : bool
+        Profile every job; futures then resolve to ``(features, profile)`` with the stage times.
+    make_extractor : callable
+        Builds the extractor in each worker; must be picklable (a module-level function).
+    reserved_live_workers : int
+        Workers that only take live jobs, so lower-priority jobs never delay a live turn.
+    """
+
+    def __init__(self, size=1, trace_path=None, profile=False, make_extractor=default_extractor,
+                 reserved_live_workers=1):
+        if size < 1:
+            raise ValueError("A feature worker pool needs at least one worker")
+        self.size = size
+        self.reserved_live_workers = min(reserved_live_workers, size)
+        self._worker_args = (trace_path, profile, make_extractor)
+        self._result_q = Queue()
+        self._lock = threading.Lock()
+        self._pending = []  # heap of (priority, job_id, audio_path, future)
+        self._job_ids = itertools.count()
+        self._closed = False
+        self._workers = [self._start_worker(i) for i in range(size)]
+        self._collector = threading.Thread(target=self._collect_loop, daemon=True, name="feature-pool-collector")
+        self._collector.start()
+
+    def submit(self, audio_path, priority=PRIORITY_LIVE) -> Future:
+        """Queue ``audio_path`` for extraction; the future resolves to ``(features, profile)``."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The feature worker pool is shut down")
+            heapq.heappush(self._pending, (priority, next(self._job_ids), audio_path, future))
+            self._dispatch()
+        return future
+
+    def pending(self):
+        """Number of jobs waiting for a free worker."""
+        with self._lock:
+            return len(self._pending)
+
+    def request_profile_dump(self, path, jobs=1):
+        """
+        Sample the stacks of each worker's next ``jobs`` jobs and write them to ``path`` (with a
+        ``_worker<i>`` suffix when there is more than one worker). Returns the paths.
+        """
+        root, ext = os.path.splitext(path)
+        paths = []
+        with self._lock:
+            for worker in self._workers:
+                worker_path = path if self.size == 1 else f"{root}_worker{worker.worker_id}{ext}"
+                worker.task_q.put({"control": "sample", "path": worker_path, "jobs": jobs})
+                paths.append(worker_path)
+        return paths
+
+    def shutdown(self, timeout=5.0):
+        """Stop the workers; jobs that have not started are cancelled."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for *_, future in self._pending:
+                future.cancel()
+            self._pending = []
+            workers = list(self._workers)
+        for worker in workers:
+            try:
+                worker.task_q.put(None)
+            except Exception:
+                pass
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            if worker.job is not None:
+                _set_exception(worker.job[1], FeatureExtractionError("Feature worker pool shut down"))
+        self._result_q.put(None)
+        self._collector.join(timeout)
+
+    def _start_worker(self, worker_id):
+        return _Worker(worker_id, self._result_q, *self._worker_args)
+
+    def _dispatch(self):
+        """Start pending jobs on idle workers; called with the lock held."""
+        idle = [w for w in self._workers if w.job is None]
+        while self._pending and idle:
+            priority, job_id, audio_path, future = self._pending[0]
+            if priority != PRIORITY_LIVE and len(idle) <= self.reserved_live_workers:
+                break
+            heapq.heappop(self._pending)
+            if not future.set_running_or_notify_cancel():
+                continue
+            worker = idle.pop()
+            worker.job = (job_id, future)
+            worker.task_q.put((job_id, audio_path))
+
+    def _collect_loop(self):
+        next_check = time.monotonic() + _POLL_S
+        while True:
+            # Check on every pass, not only when no result arrives: the other workers may keep the
+            # queue busy while a crashed worker's job is never answered
+            if time.monotonic() >= next_check:
+                self._replace_dead_workers()
+                next_check = time.monotonic() + _POLL_S
+            try:
+                item = self._result_q.get(timeout=_POLL_S)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            worker_id, job_id, features, profile, error = item
+            with self._lock:
+                worker = self._workers[worker_id]
+                job = worker.job
+                if job is None or job[0] != job_id:
+                    # Late result of a worker that was replaced: the new worker's job is still running
+                    continue
+                worker.job = None
+                self._dispatch()
+            if error is not None:
+                _set_exception(job[1], FeatureExtractionError(error))
+            elif not job[1].done():
+                job[1].set_result((features, profile))
+
+    def _replace_dead_workers(self):
+        with self._lock:
+            if self._closed:
+                return
+            for i, worker in enumerate(self._workers):
+                if worker.process.is_alive():
+                    continue
+                print(f"[FeatureWorkerPool] Worker {i} exited (code {worker.process.exitcode}), restarting it")
+                if worker.job is not None:
+                    _set_exception(worker.job[1], FeatureExtractionError(
+                        f"Feature worker {i} exited with code {worker.process.exitcode}"))
+                self._workers[i] = self._start_worker(i)
+            self._dispatch()
+
+
+def _set_exception(future, exception):
+    if not future.done():
+        future.set_exception(exception)
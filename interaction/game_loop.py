@@ -1,10 +1,13 @@
+import asyncio
 import time
 
 from sic_framework.devices.desktop import Desktop
 
 from agents.guesser import Guesser
+from interaction import tracing
+from interaction.async_core import AsyncGuesser
 from interaction.audio_pipeline import AudioPipeline
-from interaction.experiment_logger import ExperimentLogger
+from interaction.experiment_logger import ExperimentLogger, DEFAULT_LOG_DIR
 from interaction.game_state import GameState
 from interaction.turn_manager import TurnManager
 from interaction.utils import parse_clue
@@ -23,11 +26,12 @@ MAX_LONG_WAIT_REACTIONS = 2
 
 class GameLoop:
     def __init__(self, guesser: Guesser, game_state: GameState, max_turns=5,
-                 participant_id=None, is_adaptive=False, board=None, key_map=None):
+                 participant_id=None, is_adaptive=False, board=None, key_map=None, log_dir=DEFAULT_LOG_DIR):
         self.guesser = guesser
         self.game_state = game_state
         self.max_turns = max_turns
         self.turn_manager = TurnManager(guesser, game_state)
+        self.io = AsyncGuesser(guesser)
 
         pid = participant_id or ""
  
@@ -36,101 +40,115 @@ class GameLoop:
             is_adaptive=is_adaptive,
             board=board if board is not None else game_state.board,
             key_map=key_map,
+            log_dir=log_dir,
         )
 
     def play(self):
-        self.guesser.say_random_start_game()
-        self.guesser.say("I'm waiting for you to place the red cards, let me know when you're ready.", sleep_time=0.5)
+        asyncio.run(self.play_async())
+
+    async def play_async(self):
+        io = self.io
+        await io.run(self.guesser.say_random_start_game)
+        await io.say("I'm waiting for you to place the red cards, let me know when you're ready.", sleep_time=0.5)
 
         # Wait for the spymaster to place the initial red cards
-        response = self.guesser.listen()
+        response = await io.listen()
         red_cards_placed = self.game_state.are_initial_red_cards_placed()
         while not response or response == "" or "ready" not in response or not red_cards_placed:
             print("Spymaster not ready yet, waiting...")
-            response = self.guesser.listen()
+            response = await io.listen()
             red_cards_placed = self.game_state.are_initial_red_cards_placed()
 
         # Start recording for the first turn after initial red cards are placed
-        self.guesser.start_recording()
+        await io.start_recording()
 
         while not self.game_state.game_over and self.game_state.turn < self.max_turns:
-            print(f"Playing Turn {self.game_state.turn}")
-            turn_start = time.time()
-            self.guesser.pause_recording()
-
-            if self.game_state.turn > 0:
-                continuity_text = self.guesser.get_continuity_remark(self.game_state,  adaptive=self.guesser.is_adaptive())
-                if continuity_text:
-                    self.guesser.say(continuity_text)
-
-            self.guesser.say_random_human_turn()
-            self.guesser.resume_recording()
-
-            clue_word, num = self.receive_clue()
-
-            # Stop recording immediately after the clue is received and classify
-            features = None
-            confidence_level = None
-            if self.guesser.is_adaptive():
-                self.guesser.say_random_sounds()  # to fill the silent gap while processing audio and make it feel more natural
-                print("Processing audio for confidence level classification...")
-                features, confidence_level = self.guesser.stop_and_process_audio(clue_word, self.game_state.turn)
-
-            current_turn = self.game_state.turn
-            # Default to medium confidence for the first turn, because it usually takes a moment for the spymaster to give a clue
-            # which could lead to low confidence predictions that don't reflect the user's true confidence level.
-            if current_turn == 0 and self.guesser.is_adaptive():
-                confidence_level = CONFIDENCE_MEDIUM
-
-            turn_result = self.turn_manager.play_turn(clue_word, num, confidence_level, features)
-            turn_duration = time.time() - turn_start
-
-            self.experiment_logger.log_turn(
-                turn=current_turn,
-                clue_word=clue_word,
-                clue_number=num,
-                features=features,
-                confidence_level=confidence_level,
-                guesses=turn_result["guesses"],
-                outcomes=turn_result["outcomes"],
-                score=turn_result["score"],
-                turn_duration_s=turn_duration,
-            )
-
-            if not self.game_state.game_over:
-                self.guesser.say("Go ahead, place a red card.")
-                input("Press enter after red card is placed.")
-                # Start recording for the next turn after the red card is placed
-                self.guesser.start_recording()
+            with tracing.span("turn", turn=self.game_state.turn):
+                print(f"Playing Turn {self.game_state.turn}")
+                turn_start = time.time()
+
+                if self.game_state.turn > 0:
+                    continuity_text = self.guesser.get_continuity_remark(self.game_state,  adaptive=self.guesser.is_adaptive())
+                    if continuity_text:
+                        await io.say(continuity_text)
+
+                await io.run(self.guesser.say_random_human_turn)
+
+                with tracing.span("receive_clue"):
+                    clue_word, num = await self.receive_clue()
+
+                # Stop recording immediately after the clue is received; the audio is analysed in the
+                # background and the turn only waits for the confidence level where it uses it
+                analysis = None
+                if self.guesser.is_adaptive():
+                    print("Processing audio for confidence level classification...")
+                    analysis = await io.submit_audio(clue_word, self.game_state.turn)
+
+                current_turn = self.game_state.turn
+                # Default to medium confidence for the first turn, because it usually takes a moment for the spymaster to give a clue
+                # which could lead to low confidence predictions that don't reflect the user's true confidence level.
+                confidence_level = None
+                if current_turn == 0 and self.guesser.is_adaptive():
+                    confidence_level = CONFIDENCE_MEDIUM
+
+                turn_result = await io.run(self.turn_manager.play_turn, clue_word, num, confidence_level,
+                                           analysis=analysis)
+                turn_duration = time.time() - turn_start
+                features, confidence_level = turn_result["features"], turn_result["confidence_level"]
+
+                self.experiment_logger.log_turn(
+                    turn=current_turn,
+                    clue_word=clue_word,
+                    clue_number=num,
+                    features=features,
+                    confidence_level=confidence_level,
+                    guesses=turn_result["guesses"],
+                    outcomes=turn_result["outcomes"],
+                    score=turn_result["score"],
+                    turn_duration_s=turn_duration,
+                )
+
+                if not self.game_state.game_over:
+                    await io.say("Go ahead, place a red card.")
+                    await io.run(self.wait_for_red_card)
+                    # Start recording for the next turn after the red card is placed
+                    await io.start_recording()
 
         if not self.game_state.game_over:
-            self.guesser.say_random_game_over()
+            await io.run(self.guesser.say_random_game_over)
 
         if self.game_state.win is True:
-            self.guesser.say_random_win_reaction()
+            await io.run(self.guesser.say_random_win_reaction)
         elif self.game_state.win is False:
-            self.guesser.say_random_loss_reaction()
+            await io.run(self.guesser.say_random_loss_reaction)
 
-        self.guesser.stop_recording_if_active()
+        await io.run(self.guesser.stop_recording_if_active)
+        # Session end: close the turn log and compact it for analysis
+        await io.run(self.experiment_logger.close)
 
-    def receive_clue(self) -> tuple[str, int]:
+    def wait_for_red_card(self):
+        input("Press enter after red card is placed.")
+
+    async def receive_clue(self) -> tuple[str, int]:
+        io = self.io
         receive_start = time.time()
         long_wait_count = 0
         hesitation_said = False
         failed_attempts = 0
         while True:
             # --- Listen until we get some non-empty input ---
-            raw_clue = self.guesser.listen()
+            raw_clue = await io.listen()
             while not raw_clue:
                 print("No input detected from listener; listening again")
                 # Say a long-wait utterance (up to MAX_LONG_WAIT_REACTIONS times)
                 # if the spymaster has been silent for a while (adaptive only).
+                # It is cut off as soon as the spymaster starts talking.
+                utterance = None
                 if (self.guesser.is_adaptive()
                         and long_wait_count < MAX_LONG_WAIT_REACTIONS
                         and time.time() - receive_start > LONG_WAIT_THRESHOLD_SECONDS * (long_wait_count + 1)):
                     is_first_long_wait = long_wait_count == 0
                     long_wait_count += 1
-                    self.guesser.pause_recording()
                     if is_first_long_wait:
                         utterance = self.guesser.get_waiting_for_clue_long_wait_utterance()
                     else:
@@ -138,9 +156,10 @@ class GameLoop:
                             self.guesser.get_continuity_remark(self.game_state, adaptive=self.guesser.is_adaptive())
                             or self.guesser.get_waiting_for_clue_long_wait_utterance()
                         )
-                    self.guesser.say(utterance)
-                    self.guesser.resume_recording()
-                raw_clue = self.guesser.listen()
+                if utterance:
+                    raw_clue = await io.speak_and_listen(io.say(utterance))
+                else:
+                    raw_clue = await io.listen()
 
             # --- Ignore utterances that are only filler/hesitation words ---
             if self._is_filler_only(raw_clue):
@@ -152,16 +171,15 @@ class GameLoop:
                     hesitation_said = True
                     continuity_utterance = self.guesser.get_continuity_remark(self.game_state, adaptive=self.guesser.is_adaptive())
                     if continuity_utterance:
-                        self.guesser.pause_recording()
-                        self.guesser.say(continuity_utterance)
-                        self.guesser.resume_recording()
+                        await io.say(continuity_utterance)
                 else:
                     print(f"Filler-only input detected ('{raw_clue}'); listening again silently")
                 continue
 
             # --- Try to parse the clue ---
             try:
-                clue_word, num = parse_clue(raw_clue)
+                with tracing.span("parse_clue"):
+                    clue_word, num = parse_clue(raw_clue)
             except Exception:
                 failed_attempts += 1
                 if failed_attempts <= GRACE_PERIOD_RETRIES:
@@ -176,22 +194,18 @@ class GameLoop:
                         hesitation_said = True
                         continuity_utterance = self.guesser.get_continuity_remark(self.game_state, adaptive=self.guesser.is_adaptive())
                         if continuity_utterance:
-                            self.guesser.pause_recording()
-                            self.guesser.say(continuity_utterance)
-                            self.guesser.resume_recording()
+                            await io.say(continuity_utterance)
                     else:
                         print(
                             f"Could not parse clue (attempt {failed_attempts}/{GRACE_PERIOD_RETRIES}); "
                             "waiting silently before retrying"
                         )
-                    time.sleep(GRACE_PERIOD_WAIT_SECONDS)
+                    await asyncio.sleep(GRACE_PERIOD_WAIT_SECONDS)
                     continue
 
                 # Grace period exhausted → ask the user to repeat
                 failed_attempts = 0
-                self.guesser.pause_recording()
-                self.guesser.say_random_clue_not_understood()
-                self.guesser.resume_recording()
+                await io.run(self.guesser.say_random_clue_not_understood)
                 continue  # restart from listening
 
             failed_attempts = 0  # reset on successful parse
@@ -199,19 +213,31 @@ class GameLoop:
             # --- Pause recording before confirmation: the verification exchange
             #     (robot repeating the clue, user saying yes/no, robot asking to
             #     repeat) should not be included in the confidence analysis. ---
-            self.guesser.pause_recording()
-            self.guesser.say_random_repeat_clue(clue_word, num)
-            self.guesser.say_verify_received_clue()
-
-            feedback = self.guesser.listen()
+            await io.pause_recording()
+            if self.guesser.is_adaptive():
+                # The audio to analyse is final now: extract the features while the clue is confirmed
+                await io.run(self.guesser.speculate_audio, self.game_state.turn)
+            else:
+                # Without audio features the first prompt only depends on the clue:
+                # ask the LLM (as a task of this loop) while the clue is being confirmed
+                self.turn_manager.prefetch_guess(clue_word, submit=io.spawn)
+
+            # A quick "yes" over the confirmation question cuts it short
+            feedback = await io.speak_and_listen(self._confirm_clue(clue_word, num))
             if self.is_clue_well_received(feedback):
                 # Recording stays paused; the caller will stop and process it.
                 return clue_word, num
 
-            # --- Not confirmed → ask to repeat and resume recording for the
-            #     next clue attempt. ---
-            self.guesser.say("Oh, could you repeat the clue?")
-            self.guesser.resume_recording()
+            # --- Not confirmed → drop the prefetched guess, ask to repeat and
+            #     resume recording for the next clue attempt. ---
+            self.turn_manager.discard_speculation()
+            self.guesser.discard_audio_speculation()
+            await io.say("Oh, could you repeat the clue?")
+            await io.resume_recording()
+
+    async def _confirm_clue(self, clue_word, num):
+        await self.io.run(self.guesser.say_random_repeat_clue, clue_word, num)
+        await self.io.run(self.guesser.say_verify_received_clue)
 
     @staticmethod
     def _is_filler_only(text: str) -> bool:
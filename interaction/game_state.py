@@ -1,6 +1,7 @@
 import json
+import threading
 
-from interaction.game_state_server import start_game_state_server
+from interaction.game_state_server import start_game_state_server, DEFAULT_SERVER_MODE
 
 RED = 'red'
 BLUE = 'blue'
@@ -15,7 +16,7 @@ CARD_DESCRIPTIONS_PATH = "../assets/card_descriptions.json"
 
 
 class GameState:
-    def __init__(self, board):
+    def __init__(self, board, server_mode=DEFAULT_SERVER_MODE, server_port=8765):
         self.board = board  # list of card filenames
         self.card_descriptions = json.load(open(CARD_DESCRIPTIONS_PATH))
         self.revealed = {}  # idx -> blue | red | neutral | assassin
@@ -25,7 +26,12 @@ class GameState:
         self.game_over = False
         self.win = None
 
-        start_game_state_server(self)
+        # Change notification: waiters block on the condition, subscribers get a callback per change
+        self.version = 0  # incremented on every reveal/unreveal
+        self._changed = threading.Condition()
+        self._subscribers = []
+
+        start_game_state_server(self, port=server_port, mode=server_mode)
 
     def is_revealed(self, idx):
         return idx in self.revealed
@@ -40,7 +46,9 @@ class GameState:
         if not self.is_valid_team(team):
             return False
 
-        self.revealed[idx] = team
+        with self._changed:
+            self.revealed[idx] = team
+            self._record_change({"type": "reveal", "idx": idx, "team": team})
         print(f"[GAMESTATE] Card {idx} revealed as {team}")
         return True
 
@@ -49,12 +57,68 @@ class GameState:
         return team in {RED, BLUE, NEUTRAL, ASSASSIN}
 
     def unreveal_card(self, idx):
-        if idx in self.revealed:
-            prev = self.revealed[idx]
-            del self.revealed[idx]
-            print(f"[GAMESTATE] Card {idx} unrevealed (was {prev})")
-            return True
-        return False
+        with self._changed:
+            if idx not in self.revealed:
+                return False
+            prev = self.revealed.pop(idx)
+            self._record_change({"type": "unreveal", "idx": idx, "team": None})
+        print(f"[GAMESTATE] Card {idx} unrevealed (was {prev})")
+        return True
+
+    def reset(self):
+        """Start a new game on the same board and server; subscribers see every card unrevealed."""
+        for idx in list(self.revealed):
+            self.unreveal_card(idx)
+        self.history = []
+        self.confidence_history = []
+        self.turn = 0
+        self.game_over = False
+        self.win = None
+
+    def snapshot(self):
+        """Return ``(version, revealed)`` as one consistent copy."""
+        with self._changed:
+            return self.version, dict(self.revealed)
+
+    def wait_for_reveal(self, idx, timeout=None):
+        """
+        Block until card ``idx`` is revealed and return its team, or ``None`` on timeout.
+        Wakes up as soon as the reveal happens, from any thread.
+        """
+        with self._changed:
+            if not self._changed.wait_for(lambda: idx in self.revealed, timeout):
+                return None
+            return self.revealed[idx]
+
+    def subscribe(self, callback):
+        """
+        Call ``callback(change)`` after every reveal/unreveal, from the thread that made the change.
+        ``change`` is a dict with ``version``, ``type`` (``"reveal"`` | ``"unreveal"``), ``idx`` and ``team``.
+        Callbacks run while the state lock is held, so they see the changes in version order; keep
+        them short and never wait on another thread that changes the state.
+        """
+        with self._changed:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._changed:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _record_change(self, change):
+        # Caller holds self._changed: publishing under the lock keeps concurrent changes in version order
+        self.version += 1
+        change["version"] = self.version
+        self._changed.notify_all()
+        self._notify_subscribers(change)
+        return change
+
+    def _notify_subscribers(self, change):
+        for callback in list(self._subscribers):
+            try:
+                callback(change)
+            except Exception as e:
+                print(f"[GAMESTATE] Subscriber failed: {e}")
 
     def are_initial_red_cards_placed(self):
         red_placed = sum(1 for color in self.revealed.values() if color == RED)
@@ -0,0 +1,164 @@
+"""Small IPC channel so the game state server can run in its own process.
+
+The game process keeps the authoritative ``GameState`` and exposes it with ``GameStateIPCServer``.
+The web server process talks to it through ``RemoteGameState``, which offers the subset of the
+``GameState`` interface the Flask routes use. Calls travel as pickled tuples over
+``multiprocessing.connection``; change notifications are pushed over a separate connection.
+
+The connections are authenticated with ``ipc_authkey()``: the value of ``IPC_AUTHKEY_ENV`` when it
+is set, else a random key generated for this run and handed to the server process it spawns.
+"""
+
+import os
+import queue
+import secrets
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+
+IPC_ADDRESS = ("127.0.0.1", 8766)
+IPC_AUTHKEY_ENV = "CODENAMES_IPC_AUTHKEY"
+# Seconds between checks that a change subscriber is still connected
+SUBSCRIBER_POLL_SECONDS = 1.0
+
+_run_authkey = secrets.token_bytes(32)
+
+
+def ipc_authkey():
+    """Key both ends of the IPC channel authenticate with (see the module docstring)."""
+    key = os.environ.get(IPC_AUTHKEY_ENV)
+    return key.encode("utf-8") if key else _run_authkey
+
+# Methods the web server process may call on the game state
+REMOTE_METHODS = {"reveal_card", "unreveal_card", "snapshot", "is_revealed"}
+# Attributes it may read
+REMOTE_ATTRIBUTES = {"board", "version", "board_image"}
+
+
+class GameStateIPCServer:
+    """Serves ``game_state`` to ``RemoteGameState`` clients, one thread per connection."""
+
+    def __init__(self, game_state, address=IPC_ADDRESS, authkey=None):
+        self.game_state = game_state
+        self.authkey = authkey or ipc_authkey()
+        self._listener = Listener(address, authkey=self.authkey)
+        self.address = self._listener.address
+        self._closed = False
+
+    def start(self):
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        print(f"[STATE IPC] Listening on {self.address}")
+        return self
+
+    def close(self):
+        self._closed = True
+        self._listener.close()
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except AuthenticationError:
+                print("[STATE IPC] Rejected a connection with the wrong authkey")
+                continue
+            except (OSError, EOFError):
+                if self._closed:
+                    return
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        try:
+            while True:
+                request = conn.recv()
+                if request[0] == "subscribe":
+                    self._push_changes(conn)
+                    return
+                conn.send(self._handle(*request))
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+
+    def _handle(self, kind, name, args=()):
+        try:
+            if kind == "call" and name in REMOTE_METHODS:
+                return "ok", getattr(self.game_state, name)(*args)
+            if kind == "get" and name in REMOTE_ATTRIBUTES:
+                return "ok", getattr(self.game_state, name, None)
+            return "error", f"{kind} {name!r} is not allowed"
+        except Exception as e:
+            return "error", f"{type(e).__name__}: {e}"
+
+    def _push_changes(self, conn):
+        """
+        Forward every change to ``conn`` until the client goes away. Subscribers run under the game
+        state's lock, so they only queue the change; this thread does the (possibly slow) sending.
+        """
+        changes = queue.Queue()
+        self.game_state.subscribe(changes.put)
+        try:
+            while True:
+                try:
+                    conn.send(changes.get(timeout=SUBSCRIBER_POLL_SECONDS))
+                except queue.Empty:
+                    # The client never sends on this connection; recv only returns once it is closed
+                    if conn.poll(0):
+                        conn.recv()
+        except (EOFError, OSError, ValueError):
+            pass
+        finally:
+            self.game_state.unsubscribe(changes.put)
+
+
+class RemoteGameState:
+    """Proxy for a ``GameState`` living in another process; calls are serialised over one connection."""
+
+    def __init__(self, address=IPC_ADDRESS, authkey=None):
+        self.address = address
+        self.authkey = authkey or ipc_authkey()
+        self._conn = Client(address, authkey=self.authkey)
+        self._lock = threading.Lock()
+        self.board = self._request("get", "board")
+        self.board_image = self._request("get", "board_image")
+
+    @property
+    def version(self):
+        return self._request("get", "version")
+
+    def reveal_card(self, idx, team):
+        return self._request("call", "reveal_card", (idx, team))
+
+    def unreveal_card(self, idx):
+        return self._request("call", "unreveal_card", (idx,))
+
+    def is_revealed(self, idx):
+        return self._request("call", "is_revealed", (idx,))
+
+    def snapshot(self):
+        return self._request("call", "snapshot")
+
+    def subscribe(self, callback):
+        """Call ``callback(change)`` for every change pushed by the game process."""
+        conn = Client(self.address, authkey=self.authkey)
+        conn.send(("subscribe",))
+
+        def receive():
+            try:
+                while True:
+                    callback(conn.recv())
+            except (EOFError, OSError):
+                print("[STATE IPC] Change subscription closed")
+
+        threading.Thread(target=receive, daemon=True).start()
+
+    def close(self):
+        self._conn.close()
+
+    def _request(self, kind, name, args=()):
+        with self._lock:
+            self._conn.send((kind, name, args))
+            status, value = self._conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"[STATE IPC] {value}")
+        return value
@@ -1,28 +1,179 @@
-from flask import Flask, request, jsonify, render_template_string, send_from_directory
+from collections import deque
+from flask import Flask, request, jsonify, render_template_string, abort, Response
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
 import threading
 
+from werkzeug.serving import BaseWSGIServer
+
+from interaction.card_images import CardImageCache
+from interaction.game_state_ipc import GameStateIPCServer, RemoteGameState, IPC_ADDRESS
+
+# Number of recent changes kept for /events clients that reconnect
+EVENT_BUFFER_SIZE = 256
+# Seconds between keepalive comments on an idle /events stream
+SSE_KEEPALIVE_SECONDS = 15
+
+ASSETS_DIR = "../assets"
+CARDS_DIR = os.path.join(ASSETS_DIR, "cards")
+# Width requested by the /ui grid (cards are ~190px wide, 400px covers high-DPI screens)
+UI_CARD_WIDTH = 400
+# URLs carrying the current board token never change content, so browsers may keep them this long
+IMMUTABLE_MAX_AGE = 24 * 3600
+
+# "dev": Flask's development server in a thread of the game process
+# "pooled": threaded server with a bounded worker pool, still in the game process
+# "process": pooled server in a separate process, talking to the GameState over IPC
+SERVER_MODES = ("dev", "pooled", "process")
+DEFAULT_SERVER_MODE = "pooled"
+# Each open /ui tab keeps one worker busy with its /events stream
+SERVER_WORKERS = 8
+# Workers never taken by /events streams, so /reveal, /state and /card always get served
+SERVER_SPARE_WORKERS = 4
+# Seconds a client turned away for lack of a free stream slot waits before reconnecting
+SSE_RETRY_SECONDS = 5
+
 app = Flask(__name__)
 
 # This will be injected from the main program
 game_state = None
+change_feed = None
+image_cache = None
+sse_slots = None  # bounds the open /events streams on the pooled server
 
 
-def start_game_state_server(gs, port=8765):
-    print("\nSTARTING GAME STATE SERVER...")
-    global game_state
-    game_state = gs
+class ChangeFeed:
+    """Buffers the most recent game-state changes so /events clients can catch up after reconnecting."""
+
+    def __init__(self, maxlen=EVENT_BUFFER_SIZE):
+        self._changes = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+        self.closed = False
+
+    def close(self):
+        """Wake every waiting stream; ``_event_stream`` ends once the feed is closed."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def publish(self, change):
+        with self._cond:
+            self._changes.append(change)
+            self._cond.notify_all()
+
+    def since(self, version):
+        """Return the changes newer than ``version``, or ``None`` if some were already dropped."""
+        with self._cond:
+            return self._since(version)
+
+    def wait(self, version, timeout=None):
+        """Like ``since`` but blocks up to ``timeout`` seconds until a change newer than ``version`` arrives."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self.closed or (self._changes and self._changes[-1]["version"] > version), timeout)
+            return self._since(version)
+
+    def _since(self, version):
+        if self._changes and self._changes[0]["version"] > version + 1:
+            return None
+        return [c for c in self._changes if c["version"] > version]
+
 
-    thread = threading.Thread(
-        target=lambda: app.run(
-            host="0.0.0.0",
-            port=port,
-            debug=False,
-            use_reloader=False
-        ),
-        daemon=True
-    )
+class PooledWSGIServer(BaseWSGIServer):
+    """
+    Werkzeug server handing each connection to a fixed set of worker threads instead of a new thread.
+    The workers are daemon threads, so an open /events stream never keeps the process alive.
+    """
+
+    def __init__(self, host, port, wsgi_app, workers=SERVER_WORKERS):
+        super().__init__(host, port, wsgi_app)
+        self.workers = workers
+        self._requests = queue.Queue()
+        for i in range(workers):
+            threading.Thread(target=self._worker_loop, daemon=True, name=f"state-server-{i}").start()
+
+    def process_request(self, request, client_address):
+        self._requests.put((request, client_address))
+
+    def _worker_loop(self):
+        while True:
+            item = self._requests.get()
+            if item is None:
+                break
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        # End the /events streams so their workers pick up the stop signal
+        if change_feed is not None:
+            change_feed.close()
+        for _ in range(self.workers):
+            self._requests.put(None)
+
+
+def max_sse_clients(workers=SERVER_WORKERS):
+    """Open /events streams the pooled server allows with ``workers`` worker threads."""
+    return max(1, workers - SERVER_SPARE_WORKERS)
+
+
+def start_game_state_server(gs, port=8765, mode=DEFAULT_SERVER_MODE, workers=SERVER_WORKERS):
+    """
+    Serve ``gs`` on ``port``. See ``SERVER_MODES``; in "process" mode the returned object is the
+    server process, otherwise the server thread.
+    """
+    print(f"\nSTARTING GAME STATE SERVER ({mode})...")
+    if mode not in SERVER_MODES:
+        raise ValueError(f"Unknown server mode {mode!r}, expected one of {SERVER_MODES}")
+
+    if mode == "process":
+        ipc = GameStateIPCServer(gs).start()
+        # Spawn rather than fork: the game process already runs audio and network threads
+        process = multiprocessing.get_context("spawn").Process(
+            target=run_remote_server,
+            args=(ipc.address, ipc.authkey, port, workers),
+            daemon=True
+        )
+        process.start()
+        print(f"[STATE SERVER] Running on port {port} (pid {process.pid})")
+        return process
+
+    _attach(gs, sse_clients=None if mode == "dev" else max_sse_clients(workers))
+    if mode == "dev":
+        target = lambda: app.run(host="0.0.0.0", port=port, debug=False, use_reloader=False)
+    else:
+        server = PooledWSGIServer("0.0.0.0", port, app, workers=workers)
+        target = server.serve_forever
+
+    thread = threading.Thread(target=target, daemon=True)
     thread.start()
     print(f"[STATE SERVER] Running on port {port}")
+    return thread
+
+
+def run_remote_server(address=IPC_ADDRESS, authkey=None, port=8765, workers=SERVER_WORKERS):
+    """Entry point of the out-of-process server: serve a ``RemoteGameState`` until killed."""
+    _attach(RemoteGameState(address, authkey), sse_clients=max_sse_clients(workers))
+    PooledWSGIServer("0.0.0.0", port, app, workers=workers).serve_forever()
+
+
+def _attach(gs, sse_clients=None):
+    """Point the routes at ``gs`` and start following its changes; ``sse_clients`` caps the /events streams."""
+    global game_state, change_feed, image_cache, sse_slots
+    game_state = gs
+    change_feed = ChangeFeed()
+    sse_slots = threading.BoundedSemaphore(sse_clients) if sse_clients else None
+    gs.subscribe(change_feed.publish)
+    image_cache = CardImageCache()
+    image_cache.warm_in_background((_card_path(card) for card in gs.board), widths=(UI_CARD_WIDTH,))
 
 
 @app.route("/reveal", methods=["POST"])
@@ -130,16 +281,30 @@ def ui():
                 overlay.className = "overlay " + team;
             }
 
+            function removeOverlay(card) {
+                const overlay = card.querySelector(".overlay");
+                if (overlay) overlay.remove();
+            }
+
             function renderState(state) {
+                cards.forEach(removeOverlay);
                 for (const idx in state.revealed) {
                     applyOverlay(cards[idx], state.revealed[idx]);
                 }
             }
 
-            function fetchState() {
-                fetch("/state")
-                    .then(res => res.json())
-                    .then(renderState);
+            function subscribeToChanges() {
+                // The browser resumes from the last event id after a reconnect
+                const events = new EventSource("/events");
+                events.addEventListener("snapshot", e => renderState(JSON.parse(e.data)));
+                events.addEventListener("change", e => {
+                    const change = JSON.parse(e.data);
+                    if (change.type === "reveal") {
+                        applyOverlay(cards[change.idx], change.team);
+                    } else {
+                        removeOverlay(cards[change.idx]);
+                    }
+                });
             }
 
             for (let i = 0; i < NUM_CARDS; i++) {
@@ -147,7 +312,7 @@ def ui():
                 container.className = "card";
 
                 const img = document.createElement("img");
-                img.src = "/card/" + i;
+                img.src = "/card/" + i + "?w={{ card_width }}&b={{ board_token }}";
                 img.style.width = "100%";
 
                 container.onclick = () => {
@@ -158,10 +323,7 @@ def ui():
                             method: "POST",
                             headers: {"Content-Type": "application/json"},
                             body: JSON.stringify({idx: i})
-                        }).then(() => {
-                            const overlay = container.querySelector(".overlay");
-                            if (overlay) overlay.remove();
-                        });
+                        }).then(() => removeOverlay(container));
                         return;
                     }
                 
@@ -179,33 +341,120 @@ def ui():
                 cards.push(container);
             }
 
-            fetchState();
+            subscribeToChanges();
         </script>
     </body>
     </html>
     """
-    return render_template_string(html)
+    return render_template_string(html, card_width=UI_CARD_WIDTH, board_token=board_token())
+
+
+def board_token():
+    """Short hash of the board layout; it changes whenever /card/<idx> would serve different images."""
+    return hashlib.md5(json.dumps(game_state.board).encode("utf-8")).hexdigest()[:12]
+
+
+def _card_path(card):
+    return os.path.join(CARDS_DIR, card)
+
+
+def _image_response(path):
+    """
+    Serve a cached variant of ``path``. ``?w=`` selects a resized variant, WebP is used when the
+    browser accepts it, and ``If-None-Match`` requests for an unchanged image get a 304.
+    """
+    global image_cache
+    if image_cache is None:
+        image_cache = CardImageCache()
+    webp = "image/webp" in request.headers.get("Accept", "")
+    try:
+        variant = image_cache.get(path, request.args.get("w", type=int), webp)
+    except FileNotFoundError:
+        abort(404)
+
+    response = Response(variant.data, mimetype=variant.mimetype)
+    response.set_etag(variant.etag)
+    response.vary.add("Accept")
+    if request.args.get("b") == board_token():
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        # Same URL may show another card in the next game: always revalidate (cheap 304s)
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 @app.route("/board_image")
 def board_image():
-    # Adjust path if needed
-    return send_from_directory("../assets", game_state.board_image)
+    image = getattr(game_state, "board_image", None)
+    if not image:
+        abort(404)
+    return _image_response(os.path.join(ASSETS_DIR, image))
 
 
 @app.route("/card/<int:idx>")
 def card_image(idx):
-    path = game_state.board[idx]
-    return send_from_directory("../assets/cards", path)
+    if not 0 <= idx < len(game_state.board):
+        abort(404)
+    return _image_response(_card_path(game_state.board[idx]))
 
 
 @app.route("/state")
 def state():
+    version, revealed = game_state.snapshot()
     return {
-        "revealed": game_state.revealed
+        "revealed": revealed,
+        "version": version
     }
 
 
+def _sse(event, version, data):
+    return f"event: {event}\nid: {version}\ndata: {json.dumps(data)}\n\n"
+
+
+def _event_stream(since=None, keepalive=SSE_KEEPALIVE_SECONDS):
+    """
+    Yield server-sent events: a ``snapshot`` of all revealed cards when the client has no (usable)
+    version, then one ``change`` event per reveal/unreveal. Every event id is the state version.
+    """
+    version = since
+    while not change_feed.closed:
+        changes = None
+        if version is not None and version <= game_state.version:
+            changes = change_feed.wait(version, timeout=keepalive)
+        if changes is None:
+            # New client, unknown version or missed changes: send the whole state
+            version, revealed = game_state.snapshot()
+            yield _sse("snapshot", version, {"version": version, "revealed": revealed})
+            continue
+        if not changes:
+            yield ": keepalive\n\n"
+        for change in changes:
+            yield _sse("change", change["version"], change)
+            version = change["version"]
+
+
+@app.route("/events")
+def events():
+    # EventSource sends the id of the last event it received when it reconnects
+    since = request.headers.get("Last-Event-ID") or request.args.get("since")
+    try:
+        since = int(since) if since is not None else None
+    except ValueError:
+        since = None
+    slots = sse_slots
+    if slots is not None and not slots.acquire(blocking=False):
+        # All stream slots taken: an ended stream makes EventSource reconnect after the retry delay
+        return Response(f"retry: {SSE_RETRY_SECONDS * 1000}\n\n", mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache"})
+    response = Response(_event_stream(since), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    if slots is not None:
+        response.call_on_close(slots.release)
+    return response
+
+
 @app.route("/unreveal", methods=["POST"])
 def unreveal():
     data = request.json
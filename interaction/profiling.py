@@ -0,0 +1,107 @@
+"""Opt-in profiling of the feature-extraction worker.
+
+``StageProfiler`` measures wall and CPU time per extraction stage (load, trim, normalize,
+denoise, transcribe, vad, mfcc, energy, hnr) and the worker's peak RSS. ``SamplingProfiler`` is a
+small stack sampler: a thread samples another thread's Python stack at a fixed interval, and
+``dump`` writes the counts as collapsed stacks (``frame;frame;frame count``). Open the dump with
+flamegraph.pl or https://www.speedscope.app.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB, or ``None`` where it is not available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB on Linux
+    return round(peak / (1 << 20) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+class StageProfiler:
+    """Wall and CPU time of named stages of one job; ``reset`` before each job."""
+
+    def __init__(self):
+        self.stages = {}
+        self._started = time.perf_counter()
+
+    def reset(self):
+        self.stages = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.stages.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0})
+            totals["wall_s"] += time.perf_counter() - wall
+            totals["cpu_s"] += time.process_time() - cpu
+
+    def result(self):
+        return {
+            "stages": {name: {k: round(v, 4) for k, v in t.items()} for name, t in self.stages.items()},
+            "total_wall_s": round(time.perf_counter() - self._started, 4),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+class SamplingProfiler:
+    """
+    Parameters
+    ----------
+    thread_id : int or None
+        Thread to sample; the thread that constructs the profiler by default.
+    interval : float
+        Seconds between samples.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True, name="sampling-profiler")
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def dump(self, path):
+        """Write the collapsed stacks, most frequent first, and return ``path``."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
@@ -1,3 +1,4 @@
+import hashlib
 import json
 
 
@@ -197,39 +198,124 @@ JSON schema:
 """
 
 
-def build_user_prompt(clue_word, game_state, confidence_level=None, transcript=""):
-    unrevealed = []
-
-    for idx, card in enumerate(game_state.board):
-        if idx in game_state.revealed:
-            continue
-
-        unrevealed.append({
-            "index": idx,
-            "card": card,
-            "description": game_state.card_descriptions[card]
-        })
-
-    # Summarise previous turns: one entry per (turn, clue) with all guess outcomes
-    turns_seen = {}
-    for entry in game_state.history:
+def compact_card_description(description) -> str:
+    """Flatten a card description into a single line: ``key: a, b; key: c``."""
+    if not isinstance(description, dict):
+        return str(description)
+    parts = []
+    for key, value in description.items():
+        if isinstance(value, (list, tuple)):
+            value = ", ".join(str(v) for v in value)
+        parts.append(f"{key}: {value}")
+    return "; ".join(parts)
+
+
+class PromptBuilder:
+    """
+    Builds the guesser prompts for one game, reusing everything that does not change between guesses.
+
+    Compact card description lines are computed once per card, and the summary of previous clues is
+    updated incrementally from new ``game_state.history`` entries instead of being rebuilt every guess.
+
+    ``system_prompt`` appends the full board to the static system prompt. That prefix is identical for
+    every guess of a game, so the provider can serve it from its prompt cache, and the per-guess user
+    prompt (``build_user_prompt(..., board_in_system_prompt=True)``) only lists unrevealed indices.
+    """
+
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self._card_lines = {}
+        self._system_prompts = {}
+        self._history = None
+        self._history_seen = 0
+        self._previous_clues = {}  # (turn, clue) -> summary entry
+        self._previous_clues_json = "[]"
+
+    def card_line(self, idx) -> str:
+        line = self._card_lines.get(idx)
+        if line is None:
+            card = self.game_state.board[idx]
+            description = compact_card_description(self.game_state.card_descriptions[card])
+            line = f"{idx} | {card} | {description}"
+            self._card_lines[idx] = line
+        return line
+
+    def board_prefix(self) -> str:
+        lines = "\n".join(self.card_line(idx) for idx in range(len(self.game_state.board)))
+        return f"BOARD (index | card | description):\n{lines}"
+
+    def system_prompt(self, base_prompt: str) -> str:
+        """Return ``base_prompt`` followed by the board, which stays the same for the whole game."""
+        prompt = self._system_prompts.get(base_prompt)
+        if prompt is None:
+            prompt = f"{base_prompt.rstrip()}\n\n---\n\n{self.board_prefix()}\n"
+            self._system_prompts[base_prompt] = prompt
+        return prompt
+
+    def prompt_cache_key(self, base_prompt: str) -> str:
+        """Stable key for the static prefix, used to route requests to the same provider-side cache."""
+        return hashlib.md5(self.system_prompt(base_prompt).encode("utf-8")).hexdigest()
+
+    def previous_clues_json(self, pending_guess=None) -> str:
+        """Summarise previous turns: one entry per (turn, clue) with all guess outcomes.
+
+        ``pending_guess`` is a history entry that is not in ``game_state.history`` yet; it is
+        included in the summary without being added to the cached one.
+        """
+        history = self.game_state.history
+        if history is not self._history or len(history) < self._history_seen:
+            # History was replaced or truncated: start over
+            self._history = history
+            self._history_seen = 0
+            self._previous_clues = {}
+            self._previous_clues_json = "[]"
+
+        if len(history) > self._history_seen:
+            for entry in history[self._history_seen:]:
+                self._add_to_summary(self._previous_clues, entry)
+            self._history_seen = len(history)
+            self._previous_clues_json = json.dumps(list(self._previous_clues.values()), separators=(",", ":"))
+
+        if pending_guess is None:
+            return self._previous_clues_json
+        summary = {key: dict(group, guesses=list(group["guesses"])) for key, group in self._previous_clues.items()}
+        self._add_to_summary(summary, pending_guess)
+        return json.dumps(list(summary.values()), separators=(",", ":"))
+
+    def _add_to_summary(self, summary, entry):
         key = (entry["turn"], entry["clue"])
-        if key not in turns_seen:
-            turns_seen[key] = {"turn": entry["turn"], "clue": entry["clue"], "confidence_level": entry.get("confidence"), "guesses": []}
-        turns_seen[key]["guesses"].append({
-            "card": entry.get("card") or game_state.board[entry["guess"]],
+        if key not in summary:
+            summary[key] = {"turn": entry["turn"], "clue": entry["clue"],
+                            "confidence_level": entry.get("confidence"), "guesses": []}
+        summary[key]["guesses"].append({
+            "card": entry.get("card") or self.game_state.board[entry["guess"]],
             "result": entry["result"]
         })
-    previous_clues = list(turns_seen.values())
 
-    if confidence_level is not None:
-        reason_instruction = "STRICT: Must follow the exact reasoning structure and sentence count based on the confidence level"
-    else:
-        reason_instruction = "One short, simple sentence explaining the most direct match"
-
-    confidence_str = confidence_level or "unknown"
-
-    return f"""
+    def build_user_prompt(self, clue_word, confidence_level=None, transcript="", board_in_system_prompt=False,
+                          pending_guess=None):
+        """Build the per-guess user prompt.
+
+        ``pending_guess`` is a history entry for a guess whose outcome is assumed but not recorded
+        yet; its card is treated as revealed. Used to prepare the next guess speculatively.
+        """
+        game_state = self.game_state
+        pending_idx = pending_guess["guess"] if pending_guess else None
+        unrevealed = [idx for idx in range(len(game_state.board))
+                      if idx not in game_state.revealed and idx != pending_idx]
+        if board_in_system_prompt:
+            unrevealed_str = ", ".join(str(idx) for idx in unrevealed)
+        else:
+            unrevealed_str = "\n".join(self.card_line(idx) for idx in unrevealed)
+
+        if confidence_level is not None:
+            reason_instruction = "STRICT: Must follow the exact reasoning structure and sentence count based on the confidence level"
+        else:
+            reason_instruction = "One short, simple sentence explaining the most direct match"
+
+        confidence_str = confidence_level or "unknown"
+
+        return f"""
 Current turn: {game_state.turn}
 
 Clue: "{clue_word}"
@@ -238,11 +324,11 @@ Spymaster confidence level: {confidence_str}
 Spymaster speech (raw transcript):
 "{transcript}"
 
-Unrevealed cards:
-{json.dumps(unrevealed, indent=2)}
+Unrevealed cards{" (indices on the board)" if board_in_system_prompt else " (index | card | description)"}:
+{unrevealed_str}
 
 Previous clues and outcomes:
-{json.dumps(previous_clues, indent=2)}
+{self.previous_clues_json(pending_guess)}
 
 Respond ONLY in JSON:
 {{
@@ -250,3 +336,8 @@ Respond ONLY in JSON:
   "reason": "{reason_instruction}"
 }}
 """
+
+
+def build_user_prompt(clue_word, game_state, confidence_level=None, transcript=""):
+    """Build a self-contained user prompt; use a ``PromptBuilder`` to reuse work across guesses."""
+    return PromptBuilder(game_state).build_user_prompt(clue_word, confidence_level, transcript)
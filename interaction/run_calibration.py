@@ -10,7 +10,9 @@ operator to trigger recordings interactively:
  - type 'q' + Enter to finish the participant
 
 Each recorded audio is processed by ImportantFeaturesExtractor and appended to
-multimodal_perception/data/calibration_phase/participant_{id}.csv
+multimodal_perception/data/calibration_phase/participant_{id}.csv. The recordings are kept in the
+audio archive (logs/audio/{id}/, turn "calibration_<config id>") so they can be reprocessed with
+interaction/run_reprocess.py.
 """
 
 import argparse
@@ -18,12 +20,14 @@ import os
 import pandas as pd
 from datetime import datetime, timezone
 
+from interaction.audio_archive import AudioArchive, CALIBRATION_TURN_PREFIX
 from multimodal_perception.audio.transcribe_audio import WhisperTranscriber
 from multimodal_perception.audio.recorder import AudioRecorder
 from multimodal_perception.audio.important_feature_extractor import ImportantFeaturesExtractor
 
 CALIB_FOLDER = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'multimodal_perception', 'data', 'calibration_phase'))
 os.makedirs(CALIB_FOLDER, exist_ok=True)
+AUDIO_ARCHIVE_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'logs', 'audio'))
 
 
 def append_row_to_csv(participant_id, row):
@@ -41,6 +45,7 @@ def run_for_participant(participant_id, config_ids, device_index=3):
     recorder = AudioRecorder(device_index=device_index, channels=2)
     whisper = WhisperTranscriber()
     extractor = ImportantFeaturesExtractor(whisper)
+    archive = AudioArchive(AUDIO_ARCHIVE_DIR, participant_id)
 
     remaining = list(config_ids)
     print("Interactive paper mode: type a config id (e.g. 1) and press Enter to record that config now.")
@@ -86,13 +91,12 @@ def run_for_participant(participant_id, config_ids, device_index=3):
 
         append_row_to_csv(participant_id, row)
 
-        try:
-            os.unlink(audio_path)
-        except Exception:
-            pass
+        archive.add(audio_path, f"{CALIBRATION_TURN_PREFIX}{cfg}")
 
         print("Done. Move to next configuration when ready.")
 
+    archive.close()
+
 
 def main():
     run_for_participant(
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Re-run archived recordings through the current feature extractor and confidence classifier.
+
+Walks the ``AudioPipeline`` session logs (``logs/session_*.jsonl`` and the older ``.json``) and
+the audio archive (``logs/audio/``), recomputes the features of every clip in parallel worker
+processes with ``ImportantFeaturesExtractor`` and classifies them with
+``ConfidenceClassifier.classify_batch``. Calibration recordings (archived by ``run_calibration``)
+are reprocessed first and the recomputed calibration is used for that participant's turns.
+
+The report (one row per clip) compares the recomputed confidence levels and features with the
+logged ones. Run from ``src/`` with the repository root on ``PYTHONPATH``, e.g.::
+
+    python ../interaction/run_reprocess.py --workers 4 --participant 12
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import soundfile as sf
+
+from interaction.audio_archive import AudioArchiveReader, CALIBRATION_TURN_PREFIX, read_clip
+from interaction.feature_workers import (
+    FeatureWorkerPool, PRIORITY_BACKGROUND, PRIORITY_CALIBRATION, default_extractor,
+)
+from interaction.session_log import read_session_log
+from multimodal_perception.model.confidence_classifier import BASE_FEATURES, ConfidenceClassifier
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+LOG_DIR = os.path.normpath(os.path.join(_HERE, "..", "logs"))
+CLIP_SECONDS = 60  # AudioPipeline extracts features from the last minute of a turn
+LEVELS = ["low", "medium", "high"]
+
+
+def collect_clips(log_dir=LOG_DIR, audio_root=None, participant_id=None):
+    """
+    Every clip to reprocess, as dicts with ``participant_id``, ``session``, ``turn``, ``clue``,
+    ``kind`` (``"turn"`` or ``"calibration"``), ``audio_path`` (``None`` when the recording is
+    gone), ``logged_level`` and ``logged_features``. Logged turns come first, then archived clips
+    no session log refers to.
+    """
+    audio_root = audio_root or os.path.join(log_dir, "audio")
+    pid_filter = str(participant_id) if participant_id is not None else None
+    clips = []
+    for log_path in sorted(glob.glob(os.path.join(log_dir, "session_*.json*"))):
+        for entry in read_session_log(log_path):
+            pid = str(entry.get("participant_id"))
+            if pid_filter is not None and pid != pid_filter:
+                continue
+            clips.append({
+                "participant_id": pid,
+                "session": os.path.basename(log_path),
+                "turn": entry.get("turn"),
+                "clue": entry.get("clue"),
+                "kind": "turn",
+                "audio_path": _locate_audio(entry.get("audio_file"), audio_root, pid),
+                "logged_level": entry.get("confidence_level"),
+                "logged_features": entry.get("features") or {},
+            })
+
+    logged = {os.path.abspath(c["audio_path"]) for c in clips if c["audio_path"]}
+    if os.path.isdir(audio_root):
+        for entry in AudioArchiveReader(audio_root).entries(pid_filter):
+            if os.path.abspath(entry["path"]) in logged:
+                continue
+            calibration = str(entry["turn"]).startswith(CALIBRATION_TURN_PREFIX)
+            clips.append({
+                "participant_id": entry["participant_id"],
+                "session": None,
+                "turn": entry["turn"],
+                "clue": None,
+                "kind": "calibration" if calibration else "turn",
+                "audio_path": entry["path"],
+                "logged_level": None,
+                "logged_features": {},
+            })
+    return clips
+
+
+def _locate_audio(audio_file, audio_root, participant_id):
+    """The logged recording, also when the logs were copied from another machine."""
+    if not audio_file:
+        return None
+    if os.path.isfile(audio_file):
+        return audio_file
+    moved = os.path.join(audio_root, participant_id, os.path.basename(audio_file))
+    return moved if os.path.isfile(moved) else None
+
+
+def _last_seconds_wav(audio_path, seconds):
+    """Decode the last ``seconds`` of a (compressed) clip into a temporary mono WAV."""
+    duration = sf.info(audio_path).duration
+    samples, sample_rate = read_clip(audio_path, start_s=max(0.0, duration - seconds))
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    fd, wav_path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    sf.write(wav_path, samples, sample_rate)
+    return wav_path
+
+
+def recompute_features(clips, workers=2, make_extractor=default_extractor, seconds=CLIP_SECONDS):
+    """
+    Extract the features of every clip with a recording on a pool of ``workers`` feature worker
+    processes. Sets ``features`` (or ``error``) on each clip and returns the wall time in seconds.
+    """
+    # Calibration clips first: the turns are classified against the recomputed calibration
+    todo = sorted((c for c in clips if c["audio_path"]), key=lambda c: c["kind"] != "calibration")
+    start = time.perf_counter()
+    pool = FeatureWorkerPool(workers, make_extractor=make_extractor, reserved_live_workers=0)
+    in_flight = {}  # future -> (clip, temporary WAV)
+    done = 0
+    try:
+        for clip in todo:
+            # Bound the decoded WAVs on disk to a few per worker
+            while len(in_flight) >= 2 * workers:
+                done += _finish(wait(in_flight, return_when=FIRST_COMPLETED).done, in_flight, done, len(todo))
+            try:
+                wav_path = _last_seconds_wav(clip["audio_path"], seconds)
+            except Exception as e:
+                clip["error"] = f"{type(e).__name__}: {e}"
+                print(f"[Reprocess] {clip['audio_path']}: {clip['error']}")
+                done += 1
+                continue
+            priority = PRIORITY_CALIBRATION if clip["kind"] == "calibration" else PRIORITY_BACKGROUND
+            in_flight[pool.submit(wav_path, priority)] = (clip, wav_path)
+        while in_flight:
+            done += _finish(wait(in_flight, return_when=FIRST_COMPLETED).done, in_flight, done, len(todo))
+    finally:
+        pool.shutdown()
+        for _, wav_path in in_flight.values():
+            os.unlink(wav_path)
+    return time.perf_counter() - start
+
+
+def _finish(futures, in_flight, done, total):
+    for future in futures:
+        clip, wav_path = in_flight.pop(future)
+        os.unlink(wav_path)
+        try:
+            clip["features"], _ = future.result()
+        except Exception as e:
+            clip["error"] = str(e)
+            print(f"[Reprocess] {clip['audio_path']}: {clip['error']}")
+        done += 1
+        if done % 10 == 0 or done == total:
+            print(f"[Reprocess] {done}/{total} clips")
+    return len(futures)
+
+
+def write_calibration(clips, out_dir):
+    """Write the recomputed calibration features per participant; returns ``{pid: csv path}``."""
+    rows = {}
+    for clip in clips:
+        if clip["kind"] == "calibration" and "features" in clip:
+            config_id = str(clip["turn"])[len(CALIBRATION_TURN_PREFIX):]
+            rows.setdefault(clip["participant_id"], []).append(
+                {"participant_id": clip["participant_id"], "config_id": config_id, **clip["features"]})
+    paths = {}
+    if rows:
+        os.makedirs(os.path.join(out_dir, "calibration_phase"), exist_ok=True)
+    for pid, participant_rows in rows.items():
+        paths[pid] = os.path.join(out_dir, "calibration_phase", f"participant_{pid}.csv")
+        pd.DataFrame(participant_rows).to_csv(paths[pid], index=False)
+    return paths
+
+
+def classify_clips(clips, calibration_paths=None):
+    """Set ``level`` and ``probs`` on every turn clip with recomputed features, per participant."""
+    calibration_paths = calibration_paths or {}
+    by_participant = {}
+    for clip in clips:
+        if clip["kind"] == "turn" and "features" in clip:
+            by_participant.setdefault(clip["participant_id"], []).append(clip)
+    for pid, participant_clips in by_participant.items():
+        classifier = ConfidenceClassifier(participant_id=pid)
+        if pid in calibration_paths:
+            classifier.load_calibration_from_csv(calibration_paths[pid])
+        probs, labels = classifier.classify_batch([c["features"] for c in participant_clips])
+        for clip, clip_probs, label in zip(participant_clips, probs, labels):
+            clip["probs"] = clip_probs
+            clip["level"] = label
+
+
+def build_report(clips):
+    """One row per turn clip: logged vs recomputed confidence level and base features."""
+    rows = []
+    for clip in clips:
+        if clip["kind"] != "turn":
+            continue
+        row = {key: clip[key] for key in ("participant_id", "session", "turn", "clue", "audio_path")}
+        row["status"] = ("missing_audio" if not clip["audio_path"] else
+                         "failed" if "error" in clip else "ok")
+        row["logged_level"] = clip["logged_level"]
+        row["new_level"] = clip.get("level")
+        row["changed"] = (row["status"] == "ok" and clip["logged_level"] is not None
+                          and clip["logged_level"] != clip.get("level"))
+        probs = clip.get("probs")
+        for i, level in enumerate(["high", "low", "medium"]):
+            row[f"p_{level}"] = float(probs[i]) if probs is not None else None
+        for name in BASE_FEATURES:
+            logged = clip["logged_features"].get(name)
+            new = clip.get("features", {}).get(name)
+            row[f"logged_{name}"] = logged
+            row[f"new_{name}"] = new
+            row[f"delta_{name}"] = (float(new) - float(logged)
+                                    if _is_number(logged) and _is_number(new) else None)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+
+def print_summary(report, clip_count, elapsed_s):
+    throughput = clip_count / elapsed_s if elapsed_s > 0 else 0.0
+    print(f"\nClips reprocessed: {clip_count} in {elapsed_s:.1f} s ({throughput:.2f} clips/s)")
+    if report.empty:
+        return
+    print(report["status"].value_counts().to_string())
+    compared = report[(report["status"] == "ok") & report["logged_level"].notna()]
+    if not compared.empty:
+        agreement = 1.0 - compared["changed"].mean()
+        print(f"\nConfidence level unchanged for {agreement:.1%} of {len(compared)} logged turns")
+        confusion = pd.crosstab(compared["logged_level"], compared["new_level"],
+                                rownames=["logged"], colnames=["recomputed"])
+        print(confusion.reindex(index=LEVELS, columns=LEVELS, fill_value=0).to_string())
+    deltas = report[[f"delta_{name}" for name in BASE_FEATURES]].apply(pd.to_numeric).abs().mean()
+    deltas = deltas.dropna()
+    if not deltas.empty:
+        print("\nMean absolute feature change:")
+        print(deltas.rename(lambda c: c[len("delta_"):]).to_string())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute features and confidence levels of archived clips.")
+    parser.add_argument("--log-dir", default=LOG_DIR, help="Directory with the session logs.")
+    parser.add_argument("--audio-root", default=None, help="Audio archive root (default: <log dir>/audio).")
+    parser.add_argument("--participant", default=None, help="Only reprocess this participant.")
+    parser.add_argument("--workers", type=int, default=2, help="Feature extraction processes.")
+    parser.add_argument("--out-dir", default=None, help="Where to write the report (default: <log dir>/reprocess).")
+    args = parser.parse_args(argv)
+
+    clips = collect_clips(args.log_dir, args.audio_root, args.participant)
+    with_audio = sum(1 for c in clips if c["audio_path"])
+    print(f"[Reprocess] {len(clips)} clips, {with_audio} with a recording, {args.workers} workers")
+    elapsed_s = recompute_features(clips, workers=args.workers) if with_audio else 0.0
+
+    out_dir = os.path.join(args.out_dir or os.path.join(args.log_dir, "reprocess"),
+                           datetime.now().strftime("%Y%m%d_%H%M%S"))
+    os.makedirs(out_dir, exist_ok=True)
+    classify_clips(clips, write_calibration(clips, out_dir))
+    report = build_report(clips)
+    report_path = os.path.join(out_dir, "report.csv")
+    report.to_csv(report_path, index=False)
+
+    print_summary(report, with_audio, elapsed_s)
+    print(f"\nReport: {report_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
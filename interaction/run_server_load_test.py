@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Measure /reveal latency of the game state server while the game process is busy.
+
+Run from ``src/`` (like ``main.py``) with the repository root on ``PYTHONPATH``, e.g.::
+
+    python ../interaction/run_server_load_test.py --mode pooled --busy-threads 2
+    python ../interaction/run_server_load_test.py --mode process --audio-path sample.wav
+
+The HTTP clients run in a separate process so they do not compete with the server for the GIL.
+"""
+import argparse
+import json
+import multiprocessing
+import statistics
+import threading
+import time
+import urllib.request
+
+from interaction.game_state import GameState, CARD_DESCRIPTIONS_PATH, RED
+from interaction.game_state_server import SERVER_MODES, SERVER_WORKERS
+
+NUM_CARDS = 20
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Load-test /reveal on the game state server while the game loop is busy."
+    )
+    parser.add_argument("--mode", choices=SERVER_MODES, default="pooled", help="Server mode to test.")
+    parser.add_argument("--port", type=int, default=8775, help="Port for the test server.")
+    parser.add_argument("--requests", type=int, default=500, help="Total number of /reveal requests.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent HTTP clients.")
+    parser.add_argument(
+        "--busy-threads",
+        type=int,
+        default=1,
+        help="Pure-Python threads hogging the GIL in the game process (stand-in for transcription).",
+    )
+    parser.add_argument(
+        "--audio-path",
+        type=str,
+        default=None,
+        help="Optional audio file; if given, Whisper transcribes it in a loop during the test.",
+    )
+    return parser
+
+
+def _busy_python(stop):
+    x = 0
+    while not stop.is_set():
+        for i in range(10000):
+            x = (x * 31 + i) % 1000003
+
+
+def _busy_transcribing(stop, audio_path):
+    from multimodal_perception.audio.transcribe_audio import WhisperTranscriber
+    transcriber = WhisperTranscriber()
+    while not stop.is_set():
+        transcriber.transcribe_audio(audio_path)
+
+
+def _client(port, n_requests, offset):
+    """Send ``n_requests`` reveals and return their latencies in seconds."""
+    latencies = []
+    for i in range(n_requests):
+        body = json.dumps({"idx": (offset + i) % NUM_CARDS, "team": RED}).encode("utf-8")
+        req = urllib.request.Request(
+            f"http://127.0.0.1:{port}/reveal", data=body, headers={"Content-Type": "application/json"}
+        )
+        start = time.perf_counter()
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            resp.read()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _wait_until_up(port, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ping", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Game state server did not come up on port {port}")
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    with open(CARD_DESCRIPTIONS_PATH) as f:
+        board = sorted(json.load(f))[:NUM_CARDS]
+    GameState(board=board, server_mode=args.mode, server_port=args.port)
+    _wait_until_up(args.port)
+
+    stop = threading.Event()
+    busy = [threading.Thread(target=_busy_python, args=(stop,), daemon=True) for _ in range(args.busy_threads)]
+    if args.audio_path:
+        busy.append(threading.Thread(target=_busy_transcribing, args=(stop, args.audio_path), daemon=True))
+    for t in busy:
+        t.start()
+
+    per_client = max(1, args.requests // args.concurrency)
+    ctx = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    with ctx.Pool(args.concurrency) as pool:
+        results = pool.starmap(_client, [(args.port, per_client, c * per_client) for c in range(args.concurrency)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+
+    latencies = [lat * 1000 for result in results for lat in result]
+    print(f"\nMode: {args.mode} | workers: {SERVER_WORKERS} | busy threads: {args.busy_threads}"
+          f"{' + whisper' if args.audio_path else ''}")
+    print(f"Requests: {len(latencies)} in {elapsed:.2f} s ({len(latencies) / elapsed:.1f} req/s)")
+    print(f"Latency ms: mean {statistics.mean(latencies):.1f} | p50 {_percentile(latencies, 50):.1f} | "
+          f"p95 {_percentile(latencies, 95):.1f} | p99 {_percentile(latencies, 99):.1f} | "
+          f"max {max(latencies):.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Play simulated games end to end and report per-phase latency (p50/p95).
+
+Runs the real ``GameLoop``/``TurnManager``/``LLMAgent`` and game state server against the offline
+stand-ins of ``interaction.simulation``: no robot, microphone, OpenAI or ElevenLabs needed.
+Phases are the spans of ``interaction.tracing`` (listen, say, tts_synth, prompt_llm, ...).
+
+Run from ``src/`` (like ``main.py``) with the repository root on ``PYTHONPATH``, e.g.::
+
+    python ../interaction/run_simulation.py --games 20 --seed 1 --json-out sim_baseline.json
+    python ../interaction/run_simulation.py --games 20 --seed 1 --baseline sim_baseline.json
+
+With ``--baseline`` the exit code is 1 when a phase got slower than the tolerance allows.
+"""
+import argparse
+import json
+import tempfile
+
+from agents.dialog_manager import InteractionConf
+from agents.guesser import Guesser
+from agents.llm_agent import LLMAgent
+from interaction import tracing
+from interaction.game import _load_config
+from interaction.game_loop import GameLoop
+from interaction.game_state import GameState
+from interaction.game_state_server import SERVER_MODES
+from interaction.simulation import (
+    DEFAULT_LATENCIES, GuessPolicy, LatencyModel, RevealDriver, ScriptedSpymaster, SimClock,
+    SimulatedAudioPipeline, SimulatedDialogManager, SimulatedOpenAIClient, find_regressions,
+    load_pilot_clues, phase_latencies, summarize,
+)
+
+PARTICIPANT_ID = "sim"
+
+
+class SimulatedGuesser(Guesser):
+    """``Guesser`` wired to the simulated services; everything else (utterances, reactions) is real."""
+
+    def __init__(self, interaction_conf, spymaster, clock, driver, board, guess_policy, audio_dir=None):
+        self.device_manager = None
+        self.dialog_manager = SimulatedDialogManager(interaction_conf, spymaster, clock)
+        self.llm_agent = LLMAgent(model="simulated", client=SimulatedOpenAIClient(guess_policy, clock))
+        self.defer_echo_guard = False
+        self.audio_pipeline = (SimulatedAudioPipeline(spymaster, clock, audio_dir=audio_dir)
+                               if interaction_conf.adaptive else None)
+        self.clock = clock
+        self.driver = driver
+        self.board = board
+
+    @tracing.traced("display_guess")
+    def display_guess(self, file_path):
+        self.clock.sleep("display")
+        self.driver.reveal_later(self.board.index(file_path))
+
+    def clear_display(self):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+class SimulatedGameLoop(GameLoop):
+    def __init__(self, *args, driver, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.driver = driver
+
+    def wait_for_red_card(self):
+        self.driver.place_red_card()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run simulated games and report per-phase latency.")
+    parser.add_argument("--games", type=int, default=10, help="Number of games to simulate.")
+    parser.add_argument("--max-turns", type=int, default=5, help="Turn limit per game.")
+    parser.add_argument("--board", type=int, default=3, help="Board configuration number.")
+    parser.add_argument("--baseline-condition", action="store_true",
+                        help="Play the non-adaptive condition (no audio features).")
+    parser.add_argument("--no-stream", action="store_true", help="Use non-streamed LLM guesses.")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for repeatable runs.")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Factor on every simulated delay.")
+    parser.add_argument("--human-scale", type=float, default=0.1,
+                        help="Extra factor on the spymaster's own delays (thinking, revealing).")
+    parser.add_argument("--latency", action="append", default=[], metavar="NAME=MEDIAN[:P95]",
+                        help=f"Override a latency model, one of: {', '.join(DEFAULT_LATENCIES)}.")
+    parser.add_argument("--audio-dir", default=None,
+                        help="Pilot recordings <clue_id>.wav to run through the real feature extractor.")
+    parser.add_argument("--mode", choices=SERVER_MODES, default="pooled", help="Game state server mode.")
+    parser.add_argument("--port", type=int, default=8785, help="Port for the game state server.")
+    parser.add_argument("--json-out", default=None, help="Write the per-phase summary to this file.")
+    parser.add_argument("--baseline", default=None, help="Summary of an earlier run to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative slowdown of a phase's p50/p95 against --baseline.")
+    return parser
+
+
+def parse_latencies(overrides):
+    latencies = {}
+    for override in overrides:
+        name, _, value = override.partition("=")
+        if name not in DEFAULT_LATENCIES:
+            raise ValueError(f"Unknown latency {name!r}, expected one of {list(DEFAULT_LATENCIES)}")
+        latencies[name] = LatencyModel.parse(value)
+    return latencies
+
+
+def run_games(args, log_dir):
+    clock = SimClock(parse_latencies(args.latency), time_scale=args.time_scale, human_scale=args.human_scale,
+                     seed=args.seed)
+    config = _load_config(args.board)
+    key_map = config["map"]
+    clues = load_pilot_clues()
+    conf = InteractionConf(participant_id=PARTICIPANT_ID, adaptive=not args.baseline_condition,
+                           stream_guesses=not args.no_stream)
+
+    game_state = GameState(board=config["cards"], server_mode=args.mode, server_port=args.port)
+    driver = RevealDriver(key_map, clock, port=args.port)
+    driver.game_state = game_state
+    spymaster = ScriptedSpymaster(clues, clock, driver)
+    guesser = SimulatedGuesser(conf, spymaster, clock, driver, game_state.board,
+                               GuessPolicy(key_map, game_state, clock), audio_dir=args.audio_dir)
+
+    results = []
+    for game in range(args.games):
+        game_state.reset()
+        spymaster.new_game()
+        with tracing.span("game", game=game):
+            loop = SimulatedGameLoop(guesser, game_state, max_turns=args.max_turns, participant_id=PARTICIPANT_ID,
+                                     is_adaptive=conf.adaptive, board=config["board_id"],
+                                     key_map=config["map_name"], log_dir=log_dir, driver=driver)
+            loop.play()
+        driver.wait_idle()
+        loop.turn_manager.actions.shutdown()
+        loop.turn_manager._executor.shutdown(wait=False, cancel_futures=True)
+        results.append({"win": game_state.win, "turns": game_state.turn})
+        print(f"[Simulation] Game {game + 1}/{args.games}: win={game_state.win} turns={game_state.turn}")
+    return results
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    log_dir = tempfile.mkdtemp(prefix="codenames_sim_")
+    trace_path = tracing.configure(PARTICIPANT_ID, trace_dir=log_dir)
+    try:
+        results = run_games(args, log_dir)
+    finally:
+        tracing.disable()
+
+    summary = summarize(phase_latencies(trace_path))
+    wins = sum(1 for r in results if r["win"])
+    print(f"\nGames: {len(results)} (won {wins}) | time scale {args.time_scale} | human scale {args.human_scale}")
+    print(f"Trace: {trace_path}")
+    print(f"{'phase':<22}{'count':>7}{'p50 s':>10}{'p95 s':>10}")
+    for name, stats in summary.items():
+        print(f"{name:<22}{stats['count']:>7}{stats['p50_s']:>10.3f}{stats['p95_s']:>10.3f}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(summary, json.load(f), tolerance=args.tolerance)
+        for regression in regressions:
+            print(f"[Simulation] Slower than baseline: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""Append-only JSONL log of per-turn audio results.
+
+Each entry is one JSON line, flushed and fsynced when it is written, so a turn is durable as soon
+as it is logged and a crash can at most cut off the line being written. With ``background=True``
+a writer thread does the writing, so logging never blocks turn processing. Appending to a closed
+log raises ``ValueError`` rather than dropping the entry.
+"""
+
+import json
+import os
+import threading
+from queue import Queue
+
+
+class SessionLog:
+    def __init__(self, path, background=False):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._queue = None
+        self._thread = None
+        self._closed = False
+        self._lock = threading.Lock()  # orders appends against close, so nothing lands after its stop marker
+        if background:
+            self._queue = Queue()
+            self._thread = threading.Thread(target=self._write_loop, daemon=True, name="session-log")
+            self._thread.start()
+
+    def append(self, entry):
+        line = json.dumps(entry)
+        with self._lock:
+            if self._closed:
+                raise ValueError("session log is closed")
+            if self._queue is not None:
+                self._queue.put(line)
+            else:
+                self._write(line)
+
+    def close(self, timeout=5.0):
+        """Write whatever is still queued and close the file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._queue is not None:
+                self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if not self._file.closed:
+            self._file.close()
+
+    def _write(self, line):
+        self._file.write(line + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _write_loop(self):
+        while True:
+            line = self._queue.get()
+            if line is None:
+                break
+            try:
+                self._write(line)
+            except Exception as e:
+                print(f"[SessionLog] Could not write entry: {e}")
+
+
+def read_session_log(path):
+    """
+    Load a session log as the list of entries. Reads the JSONL logs as well as the older
+    ``session_*.json`` files (one JSON list); a line cut off by a crash is skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    if content.lstrip().startswith("["):
+        return json.loads(content)
+    entries = []
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            print(f"[SessionLog] Skipping incomplete line in {path}")
+    return entries
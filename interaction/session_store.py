@@ -0,0 +1,249 @@
+"""One SQLite store (WAL mode) for everything a session records.
+
+Turns, audio features, utterances and references to the saved turn recordings of all sessions
+live in ``logs/sessions.db``, indexed by participant, session and turn, so cross-session questions
+are one query instead of globbing and parsing files::
+
+    store = session_store.SessionStore()
+    store.turns(confidence_level="low", with_audio=True)
+
+Like ``interaction.tracing`` the store is process-wide: ``open_session`` starts recording and the
+loggers of the game, the audio pipeline and the dialog manager write to ``current()`` when it is
+set. All writes go through a single background writer thread; WAL lets readers query the
+database while a session is being written.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from queue import Queue
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(_HERE, "..", "logs", "sessions.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    participant_id TEXT,
+    condition TEXT,
+    board TEXT,
+    key_map TEXT,
+    started_at REAL
+);
+CREATE TABLE IF NOT EXISTS turns (
+    session_id TEXT NOT NULL,
+    turn INTEGER NOT NULL,
+    clue_word TEXT,
+    clue_number INTEGER,
+    confidence_level TEXT,
+    guesses TEXT,
+    outcomes TEXT,
+    score INTEGER,
+    turn_duration_s REAL,
+    logged_at REAL,
+    PRIMARY KEY (session_id, turn)
+);
+CREATE TABLE IF NOT EXISTS features (
+    session_id TEXT NOT NULL,
+    turn INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value REAL,
+    text TEXT,
+    PRIMARY KEY (session_id, turn, name)
+);
+CREATE TABLE IF NOT EXISTS utterances (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    at REAL,
+    speaker TEXT,
+    text TEXT
+);
+CREATE TABLE IF NOT EXISTS audio (
+    session_id TEXT NOT NULL,
+    turn INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (session_id, turn, path)
+);
+CREATE INDEX IF NOT EXISTS sessions_participant ON sessions (participant_id);
+CREATE INDEX IF NOT EXISTS turns_confidence ON turns (confidence_level);
+CREATE INDEX IF NOT EXISTS features_name_value ON features (name, value);
+CREATE INDEX IF NOT EXISTS utterances_session ON utterances (session_id, at);
+"""
+
+_store = None
+
+
+class SessionStore:
+    """
+    Parameters
+    ----------
+    path : str
+        SQLite database file; created with the schema if missing.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self.session_id = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = self._connect()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        connection.close()
+        self._queue = Queue()
+        self._writer = None
+
+    # Writing ------------------------------------------------------------
+
+    def start_session(self, participant_id, condition=None):
+        """Start recording a new session; later writes belong to it."""
+        self.session_id = f"{participant_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self._execute("INSERT OR REPLACE INTO sessions (session_id, participant_id, condition, started_at) "
+                      "VALUES (?, ?, ?, ?)", (self.session_id, str(participant_id), condition, time.time()))
+        return self.session_id
+
+    def set_session_info(self, board=None, key_map=None):
+        self._execute("UPDATE sessions SET board = ?, key_map = ? WHERE session_id = ?",
+                      (_as_text(board), _as_text(key_map), self.session_id))
+
+    def log_turn(self, turn, clue_word, clue_number, confidence_level, guesses, outcomes, score,
+                 turn_duration_s, features=None):
+        self._execute("INSERT OR REPLACE INTO turns VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                      (self.session_id, turn, clue_word, clue_number, confidence_level, json.dumps(guesses),
+                       json.dumps(outcomes), score, turn_duration_s, time.time()))
+        if features:
+            self.log_features(turn, features)
+
+    def log_features(self, turn, features):
+        rows = []
+        for name, value in features.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                rows.append((self.session_id, turn, name, float(value), None))
+            elif value is not None:
+                rows.append((self.session_id, turn, name, None, _as_text(value)))
+        self._execute("INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?)", rows, many=True)
+
+    def log_utterance(self, speaker, text, at=None):
+        self._execute("INSERT INTO utterances (session_id, at, speaker, text) VALUES (?, ?, ?, ?)",
+                      (self.session_id, at or time.time(), speaker, text))
+
+    def log_audio(self, turn, path):
+        self._execute("INSERT OR REPLACE INTO audio VALUES (?, ?, ?)", (self.session_id, turn, path))
+
+    def flush(self, timeout=None):
+        """Block until everything written so far is committed."""
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join(timeout)
+        self._writer = None
+
+    def _execute(self, sql, params, many=False):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True, name="session-store")
+            self._writer.start()
+        self._queue.put((sql, params, many))
+
+    def _write_loop(self):
+        connection = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                if isinstance(item, threading.Event):
+                    connection.commit()
+                    item.set()
+                    continue
+                sql, params, many = item
+                try:
+                    if many:
+                        connection.executemany(sql, params)
+                    else:
+                        connection.execute(sql, params)
+                except sqlite3.Error as e:
+                    print(f"[SessionStore] Write failed: {e}")
+                # Commit once per burst of writes rather than per statement
+                if self._queue.empty():
+                    connection.commit()
+            connection.commit()
+        finally:
+            connection.close()
+
+    # Reading ------------------------------------------------------------
+
+    def query(self, sql, params=()):
+        """Run a read query on its own connection; rows come back as dicts."""
+        connection = self._connect()
+        try:
+            connection.row_factory = sqlite3.Row
+            return [dict(row) for row in connection.execute(sql, params)]
+        finally:
+            connection.close()
+
+    def turns(self, participant_id=None, session_id=None, confidence_level=None, with_audio=False):
+        """Turns across sessions with their participant (and audio path with ``with_audio``)."""
+        sql = ("SELECT s.participant_id, s.condition, t.*" + (", a.path AS audio_path" if with_audio else "") +
+               " FROM turns t JOIN sessions s USING (session_id)" +
+               (" JOIN audio a USING (session_id, turn)" if with_audio else ""))
+        conditions, params = [], []
+        for column, value in (("s.participant_id", participant_id), ("t.session_id", session_id),
+                              ("t.confidence_level", confidence_level)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(str(value) if column == "s.participant_id" else value)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        rows = self.query(sql + " ORDER BY t.session_id, t.turn", params)
+        for row in rows:
+            row["guesses"] = json.loads(row["guesses"]) if row["guesses"] else []
+            row["outcomes"] = json.loads(row["outcomes"]) if row["outcomes"] else []
+        return rows
+
+    def features(self, session_id, turn):
+        rows = self.query("SELECT name, value, text FROM features WHERE session_id = ? AND turn = ?",
+                          (session_id, turn))
+        return {row["name"]: row["value"] if row["text"] is None else row["text"] for row in rows}
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+
+def _as_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+
+def open_session(participant_id, condition=None, path=DEFAULT_DB_PATH):
+    """Record this process's session into the store at ``path``; see ``current``."""
+    global _store
+    if _store is not None:
+        _store.close()
+    _store = SessionStore(path)
+    _store.start_session(participant_id, condition)
+    print(f"[SessionStore] Recording session {_store.session_id} to {path}")
+    return _store
+
+
+def current():
+    """The store of the running session, or ``None`` when no session was opened."""
+    return _store
+
+
+def close():
+    global _store
+    if _store is not None:
+        _store.close()
+    _store = None
@@ -0,0 +1,466 @@
+"""Offline stand-ins for running the full game loop without a robot, microphone, OpenAI or ElevenLabs.
+
+The simulated pieces replace the external services the game talks to and keep the rest real
+(``GameLoop``, ``TurnManager``, ``LLMAgent`` streaming, the game state server, tracing):
+
+- ``ScriptedSpymaster`` answers ``listen()`` with pilot clues (``multimodal_perception/data``) and
+  confirmations, and places red cards through ``RevealDriver``.
+- ``RevealDriver`` reveals guessed cards over HTTP ``/reveal``, like the spymaster's UI does.
+- ``SimulatedOpenAIClient`` plugs into ``LLMAgent`` and answers (streamed or not) with a guess.
+- ``SimulatedDialogManager`` stands in for TTS/STT, ``SimulatedAudioPipeline`` for the feature worker.
+
+Every service delay is drawn from a ``LatencyModel``; ``SimClock`` holds the models and a seeded
+random generator, so runs are repeatable. See ``interaction/run_simulation.py`` for the benchmark.
+"""
+
+import contextvars
+import csv
+import json
+import math
+import os
+import random
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from agents.playback_gate import PlaybackGate
+from interaction import tracing
+from interaction.game_state import RED, BLUE, NEUTRAL, ASSASSIN
+from interaction.utils import parse_clue
+from multimodal_perception.model.confidence_classifier import ConfidenceClassifier
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+PILOT_CLUES_PATH = os.path.join(_HERE, "..", "multimodal_perception", "data", "pilot.csv")
+PILOT_FEATURES_PATH = os.path.join(_HERE, "..", "multimodal_perception", "data", "audio_features.csv")
+
+# Speaking rate of the simulated robot voice
+SPEECH_WORDS_PER_SECOND = 2.5
+# Characters per streamed LLM chunk
+LLM_CHUNK_CHARS = 4
+# Share of guesses the simulated LLM gets right (a blue card)
+GUESS_ACCURACY = 0.7
+# Delays that come from the human spymaster rather than from the system
+HUMAN_DELAYS = {"clue_thinking", "confirmation", "reveal", "red_card"}
+
+
+class LatencyModel:
+    """Log-normal delay with the given median and 95th percentile (seconds)."""
+
+    def __init__(self, median, p95=None):
+        self.median = median
+        self.p95 = median if p95 is None else p95
+        if self.p95 < self.median:
+            raise ValueError(f"p95 {self.p95} is below the median {self.median}")
+        self._sigma = math.log(self.p95 / self.median) / 1.645 if self.median > 0 else 0.0
+
+    @classmethod
+    def parse(cls, text):
+        """``"0.5"`` (fixed) or ``"0.5:1.2"`` (median:p95)."""
+        median, _, p95 = text.partition(":")
+        return cls(float(median), float(p95) if p95 else None)
+
+    def sample(self, rng):
+        if self.median <= 0:
+            return 0.0
+        return self.median * math.exp(rng.gauss(0.0, self._sigma))
+
+    def __repr__(self):
+        return f"LatencyModel({self.median}, {self.p95})"
+
+
+DEFAULT_LATENCIES = {
+    "clue_thinking": LatencyModel(6.0, 15.0),     # spymaster thinking before saying the clue
+    "confirmation": LatencyModel(1.0, 2.0),       # spymaster answering "did I get the clue right?"
+    "reveal": LatencyModel(4.0, 9.0),             # spymaster revealing a guessed card on the UI
+    "red_card": LatencyModel(3.0, 6.0),           # spymaster placing a red card between turns
+    "stt": LatencyModel(0.6, 1.5),                # end of speech until the transcript is ready
+    "llm_first_token": LatencyModel(0.5, 1.2),
+    "llm_chunk": LatencyModel(0.012, 0.03),       # between streamed chunks
+    "tts_synth": LatencyModel(0.25, 0.6),         # until the first audio of an utterance
+    "display": LatencyModel(0.08, 0.25),          # showing a card image
+    "features": LatencyModel(1.5, 3.0),           # audio feature extraction in the worker
+}
+
+
+class SimClock:
+    """
+    Draws and sleeps simulated delays.
+
+    Parameters
+    ----------
+    latencies : dict[str, LatencyModel] or None
+        Overrides of ``DEFAULT_LATENCIES``.
+    time_scale : float
+        Factor applied to every simulated delay, including speech playback.
+    human_scale : float
+        Extra factor for ``HUMAN_DELAYS``; the spymaster's own time is not system latency, so by
+        default it is shortened to keep simulated games quick.
+    seed : int or None
+        Seed of the random generator shared by all stand-ins.
+    """
+
+    def __init__(self, latencies=None, time_scale=1.0, human_scale=0.1, seed=None):
+        self.latencies = dict(DEFAULT_LATENCIES, **(latencies or {}))
+        self.time_scale = time_scale
+        self.human_scale = human_scale
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()  # stand-ins draw from several threads
+
+    def sample(self, name):
+        with self._lock:
+            seconds = self.latencies[name].sample(self.rng)
+        scale = self.time_scale * (self.human_scale if name in HUMAN_DELAYS else 1.0)
+        return seconds * scale
+
+    def sleep(self, name):
+        seconds = self.sample(name)
+        time.sleep(seconds)
+        return seconds
+
+    def choice(self, seq):
+        with self._lock:
+            return self.rng.choice(seq)
+
+    def random(self):
+        with self._lock:
+            return self.rng.random()
+
+
+class PilotClue:
+    def __init__(self, clue_id, text, features):
+        self.clue_id = clue_id
+        self.text = text
+        self.features = features
+
+
+def load_pilot_clues(clues_path=PILOT_CLUES_PATH, features_path=PILOT_FEATURES_PATH):
+    """Pilot clues that ``parse_clue`` accepts, with the audio features extracted from their recordings."""
+    features_by_id = {}
+    with open(features_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            features = {}
+            for key, value in row.items():
+                if key in ("clue_id", "confidence", "difficulty"):
+                    continue
+                if key == "transcript":
+                    features[key] = value.strip()
+                    continue
+                try:
+                    features[key] = float(value)
+                except ValueError:
+                    pass
+            features_by_id[row["clue_id"]] = features
+
+    clues = []
+    with open(clues_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            text = row["Clue"].strip().lower()
+            try:
+                parse_clue(text)
+            except ValueError:
+                continue
+            clues.append(PilotClue(row["clue_id"], text, features_by_id.get(row["clue_id"], {})))
+    return clues
+
+
+class RevealDriver:
+    """Plays the spymaster's part on the game UI: reveals cards through the game state server."""
+
+    def __init__(self, key_map, clock, port=8765):
+        self.key_map = key_map
+        self.clock = clock
+        self.url = f"http://127.0.0.1:{port}"
+        self.game_state = None  # set by the harness, used to skip cards that are already revealed
+        self._threads = []
+
+    def team_of(self, idx):
+        if idx == self.key_map[ASSASSIN]:
+            return ASSASSIN
+        for team in (BLUE, RED):
+            if idx in self.key_map[team]:
+                return team
+        # Some key maps leave a card out (e.g. card 14 of config 3): the spymaster treats it as neutral
+        return NEUTRAL
+
+    def reveal(self, idx, team=None):
+        body = json.dumps({"idx": idx, "team": team or self.team_of(idx)}).encode("utf-8")
+        req = urllib.request.Request(f"{self.url}/reveal", data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return json.loads(resp.read())["success"]
+
+    def reveal_later(self, idx):
+        """Reveal ``idx`` after the spymaster's reaction time, without blocking the caller."""
+        def run():
+            self.clock.sleep("reveal")
+            self.reveal(idx)
+
+        thread = threading.Thread(target=run, daemon=True, name=f"reveal-{idx}")
+        self._threads.append(thread)
+        thread.start()
+
+    def place_red_card(self):
+        """Reveal the next unrevealed red card, as the spymaster does for the opponent's turn."""
+        self.clock.sleep("red_card")
+        for idx in self.key_map[RED]:
+            if not self.game_state.is_revealed(idx):
+                self.reveal(idx, RED)
+                return idx
+        return None
+
+    def wait_idle(self, timeout=10):
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+
+class ScriptedSpymaster:
+    """
+    Answers the robot's ``listen()`` calls: "ready" once the initial red cards are placed, then for
+    every turn a pilot clue followed by a confirmation once the robot has repeated it.
+    """
+
+    def __init__(self, clues, clock, driver, initial_red=2):
+        self.clues = clues
+        self.clock = clock
+        self.driver = driver
+        self.initial_red = initial_red
+        self.current_clue = None
+        self._next_clue = 0
+        self._ready = False
+        self._awaiting_confirmation = False
+
+    def new_game(self):
+        self._ready = False
+        self._awaiting_confirmation = False
+
+    def listen(self):
+        if not self._ready:
+            for _ in range(self.initial_red):
+                self.driver.place_red_card()
+            self._ready = True
+            return "i'm ready"
+        if self._awaiting_confirmation:
+            self._awaiting_confirmation = False
+            self.clock.sleep("confirmation")
+            return "yes"
+        self.current_clue = self.clues[self._next_clue % len(self.clues)]
+        self._next_clue += 1
+        self._awaiting_confirmation = True
+        self.clock.sleep("clue_thinking")
+        return self.current_clue.text
+
+
+class GuessPolicy:
+    """Picks the simulated LLM's guess: a blue card with probability ``accuracy``, else any other card."""
+
+    def __init__(self, key_map, game_state, clock, accuracy=GUESS_ACCURACY):
+        self.key_map = key_map
+        self.game_state = game_state
+        self.clock = clock
+        self.accuracy = accuracy
+        self._last = None  # the previous guess may not be revealed yet
+
+    def __call__(self):
+        open_cards = [i for i in range(len(self.game_state.board))
+                      if not self.game_state.is_revealed(i) and i != self._last]
+        blue = [i for i in open_cards if i in self.key_map[BLUE]]
+        other = [i for i in open_cards if i not in self.key_map[BLUE]]
+        pool = blue if blue and (not other or self.clock.random() < self.accuracy) else other
+        self._last = self.clock.choice(pool)
+        return self._last
+
+
+class SimulatedOpenAIClient:
+    """Drop-in for ``OpenAI()`` inside ``LLMAgent``: ``chat.completions.create`` with or without ``stream``."""
+
+    REASONS = [
+        "This card fits the clue best. I'm fairly sure about it.",
+        "I see a clear link to the clue here. Let's try it.",
+        "This one feels related to the clue. It is worth a guess.",
+    ]
+
+    def __init__(self, choose_guess, clock):
+        self.choose_guess = choose_guess
+        self.clock = clock
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, stream=False, **kwargs):
+        content = json.dumps({"guess_index": self.choose_guess(), "reason": self.clock.choice(self.REASONS)})
+        if stream:
+            return self._stream(content)
+        self.clock.sleep("llm_first_token")
+        for _ in range(0, len(content), LLM_CHUNK_CHARS):
+            self.clock.sleep("llm_chunk")
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    def _stream(self, content):
+        self.clock.sleep("llm_first_token")
+        for i in range(0, len(content), LLM_CHUNK_CHARS):
+            if i:
+                self.clock.sleep("llm_chunk")
+            delta = SimpleNamespace(content=content[i:i + LLM_CHUNK_CHARS])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+
+
+class SimulatedDialogManager:
+    """TTS and STT stand-in with the ``DialogManager`` calls the game makes."""
+
+    def __init__(self, interaction_conf, spymaster, clock):
+        self.interaction_conf = interaction_conf
+        self.spymaster = spymaster
+        self.clock = clock
+        self.device_manager = None
+        self.stt_service = None
+        self.playback_gate = PlaybackGate()
+
+    def say(self, text, speaking_rate=None, sleep_time=None, animated=None, amplified=False,
+            always_regenerate=False):
+        with tracing.span("say", text=text):
+            with tracing.span("tts_synth", chars=len(text)):
+                self.clock.sleep("tts_synth")
+            duration = len(text.split()) / SPEECH_WORDS_PER_SECOND * self.clock.time_scale
+            with tracing.span("playback", audio_s=round(duration, 3)), self.playback_gate.playing(duration):
+                time.sleep(duration)
+
+    @tracing.traced("listen")
+    def listen(self):
+        text = self.spymaster.listen()
+        self.clock.sleep("stt")
+        return text
+
+    def animate_random(self):
+        pass
+
+    def animate_thinking(self):
+        pass
+
+    def shutdown_logging(self):
+        pass
+
+
+class SimulatedAudioPipeline:
+    """
+    Feature-worker stand-in: returns the pilot features of the spymaster's current clue after the
+    simulated extraction time and classifies them with the real ``ConfidenceClassifier``.
+
+    With ``audio_dir`` set, clues that have a recording ``<audio_dir>/<clue_id>.wav`` go through
+    the real feature extractor instead, so its latency is measured rather than simulated.
+    """
+
+    def __init__(self, spymaster, clock, participant_id=None, audio_dir=None):
+        self.spymaster = spymaster
+        self.clock = clock
+        self.audio_dir = audio_dir
+        self.classifier = ConfidenceClassifier(participant_id=participant_id)
+        self._extractor = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sim-audio-analysis")
+        self._speculation = None  # (pilot clue, future) started while the clue is confirmed
+
+    def start_recording(self):
+        pass
+
+    def pause_recording(self):
+        pass
+
+    def resume_recording(self):
+        pass
+
+    def stop_recording_if_active(self):
+        pass
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def speculate(self, turn):
+        self.discard_speculation()
+        context = contextvars.copy_context()
+        clue = self.spymaster.current_clue
+        self._speculation = (clue, self._executor.submit(context.run, self._analyse, clue, "speculative_analysis"))
+
+    def discard_speculation(self):
+        if self._speculation is not None:
+            self._speculation[1].cancel()
+            self._speculation = None
+
+    def submit(self, clue, turn):
+        pilot_clue = self.spymaster.current_clue
+        speculative = None
+        if self._speculation is not None and self._speculation[0] is pilot_clue:
+            speculative = self._speculation[1]
+            self._speculation = None
+        self.discard_speculation()
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, self._process, pilot_clue, clue, turn, speculative)
+
+    def stop_and_process(self, clue, turn):
+        return self.submit(clue, turn).result()
+
+    def _analyse(self, pilot_clue, span="wait_for_features"):
+        with tracing.span(span):
+            features = self._features(pilot_clue)
+        with tracing.span("classify"):
+            _, confidence_level = self.classifier.classify(features)
+        return features, confidence_level
+
+    def _process(self, pilot_clue, clue, turn, speculative):
+        with tracing.span("stop_and_process", turn=turn, speculative=speculative is not None):
+            if speculative is not None:
+                features, confidence_level = speculative.result()
+            else:
+                features, confidence_level = self._analyse(pilot_clue)
+        print(f"[Simulation] Turn {turn} | clue='{clue}' | confidence={confidence_level}")
+        return features, confidence_level
+
+    def _features(self, clue):
+        audio_path = os.path.join(self.audio_dir, f"{clue.clue_id}.wav") if self.audio_dir else None
+        if audio_path and os.path.isfile(audio_path):
+            if self._extractor is None:
+                from multimodal_perception.audio.important_feature_extractor import ImportantFeaturesExtractor
+                from multimodal_perception.audio.transcribe_audio import WhisperTranscriber
+                self._extractor = ImportantFeaturesExtractor(WhisperTranscriber())
+            return self._extractor.extract(audio_path)
+        self.clock.sleep("features")
+        return dict(clue.features)
+
+
+def phase_latencies(trace_path):
+    """Span durations (seconds) per span name from a trace written by ``interaction.tracing``."""
+    phases = {}
+    with open(trace_path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                phases.setdefault(span["name"], []).append(span["dur"])
+    return phases
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(phases):
+    """``{phase: {"count", "p50_s", "p95_s"}}`` for the output of ``phase_latencies``."""
+    return {
+        name: {"count": len(durations),
+               "p50_s": round(percentile(durations, 50), 4),
+               "p95_s": round(percentile(durations, 95), 4)}
+        for name, durations in sorted(phases.items())
+    }
+
+
+def find_regressions(summary, baseline, tolerance=0.2, min_delta_s=0.005):
+    """Phases whose p50 or p95 grew by more than ``tolerance`` (relative) and ``min_delta_s`` over ``baseline``."""
+    regressions = []
+    for name, stats in summary.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for key in ("p50_s", "p95_s"):
+            delta = stats[key] - before[key]
+            if delta > min_delta_s and delta > tolerance * before[key]:
+                regressions.append(f"{name} {key[:3]}: {before[key]:.3f}s -> {stats[key]:.3f}s")
+    return regressions
@@ -0,0 +1,201 @@
+"""Lightweight latency tracing for the interaction stack.
+
+Code marks the steps of a turn with nested spans::
+
+    with tracing.span("say", text=text):
+        with tracing.span("tts_synth"):
+            ...
+
+While tracing is not configured, ``span`` returns a shared no-op context manager, so instrumented
+code pays one global lookup per call. Once ``configure`` is called every finished span is appended
+as one JSON line to a per-session trace file by a background writer thread. Processes that set up
+tracing with the same path (e.g. the audio feature worker) append to the same file: every line is
+written with a single ``os.write`` on an ``O_APPEND`` descriptor, so lines of different processes
+never interleave.
+
+``to_chrome_trace`` converts a trace into the Chrome trace event format, which can be opened in
+``chrome://tracing`` or https://ui.perfetto.dev::
+
+    python -m interaction.tracing logs/traces/trace_1_20250101_120000.jsonl
+"""
+
+import contextvars
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from queue import Queue
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+TRACE_DIR = os.path.join(_HERE, "..", "logs", "traces")
+
+_NO_SPAN = nullcontext()
+_tracer = None
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """Writes finished spans of this process to ``path`` (JSON lines)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.pid = os.getpid()
+        self._ids = itertools.count(1)
+        self._queue = Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def next_id(self):
+        return f"{self.pid}-{next(self._ids)}"
+
+    def record(self, event):
+        self._queue.put(event)
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+
+    def _write_loop(self):
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            while True:
+                event = self._queue.get()
+                if event is None:
+                    break
+                os.write(fd, (json.dumps(event, default=str) + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "id", "parent", "start", "_token")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.id = self.tracer.next_id()
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self.id)
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.time()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.record(_event(self.tracer, self.name, self.id, self.parent, self.start, end - self.start,
+                                  self.args))
+        return False
+
+
+def _event(tracer, name, span_id, parent, start, duration, args):
+    return {
+        "name": name,
+        "id": span_id,
+        "parent": parent,
+        "start": start,
+        "dur": duration,
+        "pid": tracer.pid,
+        "tid": threading.get_ident(),
+        "thread": threading.current_thread().name,
+        "args": args,
+    }
+
+
+def configure(session_id="", trace_dir=TRACE_DIR, path=None):
+    """Start tracing into ``path`` (default: a new file per session in ``trace_dir``)."""
+    global _tracer
+    if path is None:
+        os.makedirs(trace_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(trace_dir, f"trace_{session_id}_{timestamp}.jsonl")
+    if _tracer is not None:
+        _tracer.close()
+    _tracer = Tracer(path)
+    print(f"[Tracing] Writing spans to {path}")
+    return path
+
+
+def disable():
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+    _tracer = None
+
+
+def trace_path():
+    """Path of the active trace, e.g. to hand to a worker process; ``None`` when disabled."""
+    return _tracer.path if _tracer is not None else None
+
+
+def span(name, **args):
+    """Context manager timing the enclosed block as a child of the current span."""
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return _Span(tracer, name, args)
+
+
+def record_span(name, start, duration, **args):
+    """Record an already measured span (``start`` in time.time() seconds) under the current span.
+    For code that cannot wrap a block in ``span``, e.g. a generator consumed across many calls."""
+    tracer = _tracer
+    if tracer is None:
+        return
+    tracer.record(_event(tracer, name, tracer.next_id(), _current_span.get(), start, duration, args))
+
+
+def traced(name=None):
+    """Decorator version of ``span``."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def to_chrome_trace(jsonl_path, out_path=None):
+    """Convert a JSONL trace to Chrome trace event format; returns the output path."""
+    out_path = out_path or os.path.splitext(jsonl_path)[0] + ".chrome.json"
+    events = []
+    threads = {}
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            s = json.loads(line)
+            threads[(s["pid"], s["tid"])] = s.get("thread", "")
+            events.append({
+                "name": s["name"],
+                "ph": "X",
+                "ts": s["start"] * 1e6,
+                "dur": s["dur"] * 1e6,
+                "pid": s["pid"],
+                "tid": s["tid"],
+                "args": dict(s.get("args") or {}, id=s["id"], parent=s["parent"]),
+            })
+    for (pid, tid), thread_name in threads.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return out_path
+
+
+if __name__ == "__main__":
+    for trace in sys.argv[1:]:
+        print(to_chrome_trace(trace))
@@ -1,9 +1,15 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from agents.guesser import Guesser
-from interaction.prompts import SYSTEM_PROMPT_ADAPTIVE, SYSTEM_PROMPT_CONTROL, build_user_prompt
+from interaction import tracing
+from interaction.action_scheduler import ActionScheduler, SPEECH, DISPLAY, MOTION
+from interaction.prompts import SYSTEM_PROMPT_ADAPTIVE, SYSTEM_PROMPT_CONTROL, PromptBuilder
 from interaction.game_state import RED, BLUE, NEUTRAL, ASSASSIN, TOTAL_BLUE, TOTAL_RED
 
+# Seconds between "waiting for feedback" log lines while the spymaster reveals a card
+FEEDBACK_REMINDER_SECONDS = 10
+
 
 def _count_blue(outcomes):
     """Return the number of blue (correct) outcomes in a list."""
@@ -11,89 +17,280 @@ def _count_blue(outcomes):
 
 
 class TurnManager:
-    def __init__(self, guesser: Guesser, game_state):
+    def __init__(self, guesser: Guesser, game_state, speculate=True):
         self.guesser = guesser
         self.game_state = game_state
+        self.guess_metrics = []  # per-guess latency metrics of streamed guesses
+        self.prompt_builder = PromptBuilder(game_state)
 
-    def make_guess(self, clue_word, confidence_level=None, features=None):
-        system_prompt = SYSTEM_PROMPT_ADAPTIVE if self.guesser.is_adaptive() else SYSTEM_PROMPT_CONTROL
+        # Speculative next-guess requests, issued while waiting for card feedback
+        self.speculate = speculate
+        self._speculation = None  # (user_prompt, future)
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="speculative-guess")
+        self.speculation_stats = {"issued": 0, "committed": 0, "discarded": 0}
+
+        # Display, animation and speech run as concurrent actions; speech never overlaps itself
+        self.actions = ActionScheduler()
+        self._last_speech = None  # most recently queued speech action
+        self._previous_guess_speech = None  # last speech about the previous guess of this turn
+
+    def _say(self, name, fn, *args, after=(), **kwargs):
+        """Queue a speech action; it starts after ``after`` and after any earlier speech."""
+        self._last_speech = self.actions.submit(name, fn, *args, after=after, resource=SPEECH, **kwargs)
+        return self._last_speech
+
+    def _display(self, name, fn, *args, after=()):
+        """Queue a display action; it starts after ``after`` and after the previous display action."""
+        return self.actions.submit(name, fn, *args, after=after, resource=DISPLAY)
+
+    def _build_prompts(self, clue_word, confidence_level=None, features=None, pending_guess=None):
+        base_prompt = SYSTEM_PROMPT_ADAPTIVE if self.guesser.is_adaptive() else SYSTEM_PROMPT_CONTROL
+        # The board is part of the static system prompt so the provider can cache it across guesses
+        system_prompt = self.prompt_builder.system_prompt(base_prompt)
+        prompt_cache_key = self.prompt_builder.prompt_cache_key(base_prompt)
         transcript = features.get("transcript",  "") if features else ""
-        response = self.guesser.prompt_llm(
-            system_prompt=system_prompt,
-            user_prompt=build_user_prompt(clue_word, self.game_state, confidence_level, transcript)
-        )
+        user_prompt = self.prompt_builder.build_user_prompt(clue_word, confidence_level, transcript,
+                                                            board_in_system_prompt=True,
+                                                            pending_guess=pending_guess)
+        return system_prompt, user_prompt, prompt_cache_key
+
+    def make_guess(self, clue_word, confidence_level=None, features=None):
+        system_prompt, user_prompt, prompt_cache_key = self._build_prompts(clue_word, confidence_level, features)
+
+        response = self._take_speculation(user_prompt)
+        if response is None and self.guesser.streams_guesses():
+            return self.make_streamed_guess(system_prompt, user_prompt, prompt_cache_key)
+
+        if response is None:
+            response = self.guesser.prompt_llm(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                prompt_cache_key=prompt_cache_key
+            )
 
         guess_idx = response["guess_index"]
-        self.guesser.display_guess(self.game_state.board[guess_idx])
-        
+        # The card replaces the previous one only once its reason and reaction have been spoken
+        shown = self._display("display_guess", self.guesser.display_guess, self.game_state.board[guess_idx],
+                              after=[self._previous_guess_speech])
+
+        # Speak once the card is visible; make_guess returns right away so feedback can come in meanwhile
         reason = response.get("reason", "")
         if reason:
-            self.guesser.say(reason)
+            self._say("say_reason", self.guesser.say, reason, after=[shown])
         else:
-            self.guesser.say_random_guess()
+            self._say("say_guess", self.guesser.say_random_guess, after=[shown])
 
         return guess_idx
 
+    def make_streamed_guess(self, system_prompt, user_prompt, prompt_cache_key=None):
+        """Show the card as soon as ``guess_index`` has streamed in and speak the reason
+        sentence by sentence while the rest of the completion is still arriving."""
+        start = time.perf_counter()
+        guess_idx = None
+        shown = None  # display action of the guessed card
+        held_sentences = []  # sentences that arrived before the guess was shown
+        spoken = 0
+        metrics = {"time_to_guess_s": None, "time_to_display_s": None, "time_to_first_word_s": None}
+
+        def say_sentence(sentence, first):
+            if first:
+                metrics["time_to_first_word_s"] = time.perf_counter() - start
+            self.guesser.say(sentence, animated=first, echo_guard=False)
+
+        def speak(sentence):
+            nonlocal spoken
+            self._say("say_reason_sentence", say_sentence, sentence, spoken == 0, after=[shown])
+            spoken += 1
+
+        def show(idx):
+            nonlocal guess_idx, shown
+            guess_idx = idx
+            metrics["time_to_guess_s"] = time.perf_counter() - start
+            shown = self._display("display_guess", self.guesser.display_guess, self.game_state.board[guess_idx],
+                                  after=[self._previous_guess_speech])
+            for held in held_sentences:
+                speak(held)
+            held_sentences.clear()
+
+        for event in self.guesser.stream_llm(system_prompt, user_prompt, prompt_cache_key=prompt_cache_key):
+            kind = event[0]
+            if kind == "field" and event[1] == "guess_index" and guess_idx is None:
+                show(int(event[2]))
+            elif kind == "sentence":
+                if guess_idx is None:
+                    held_sentences.append(event[1])
+                else:
+                    speak(event[1])
+            elif kind == "done" and guess_idx is None:
+                show(int(event[1]["guess_index"]))
+
+        metrics.update(self.guesser.llm_agent.last_stream_metrics or {})
+        self.guess_metrics.append(metrics)
+
+        def finish_guess():
+            if spoken:
+                self.guesser.echo_guard()
+            else:
+                self.guesser.say_random_guess()
+            if shown is not None and shown.finished_at:
+                metrics["time_to_display_s"] = shown.finished_at - start
+            print(f"[TurnManager] Streamed guess metrics: {metrics}")
+
+        self._say("finish_guess", finish_guess, after=[shown])
+        return guess_idx
+
+    def speculate_next_guess(self, clue_word, confidence_level, features, guess_number, guess_idx):
+        """Request the next guess in the background, assuming the card just guessed turns out blue."""
+        assumed = self._history_entry(clue_word, confidence_level, guess_number, guess_idx, BLUE)
+        self._speculate(clue_word, confidence_level, features, pending_guess=assumed)
+
+    def prefetch_guess(self, clue_word, confidence_level=None, features=None, submit=None):
+        """Request the first guess of a turn early, e.g. while the clue is still being confirmed.
+        It is only used if the turn ends up with exactly the same prompt. ``submit(fn, *args)``
+        starts the request and returns its future (default: this manager's thread pool)."""
+        if self.speculate:
+            self._speculate(clue_word, confidence_level, features, submit=submit)
+
+    def _speculate(self, clue_word, confidence_level, features, pending_guess=None, submit=None):
+        self.discard_speculation()
+        system_prompt, user_prompt, prompt_cache_key = self._build_prompts(clue_word, confidence_level, features,
+                                                                           pending_guess=pending_guess)
+        submit = submit or self._executor.submit
+        future = submit(self.guesser.prompt_llm, system_prompt, user_prompt, prompt_cache_key)
+        self._speculation = (user_prompt, future)
+        self.speculation_stats["issued"] += 1
+
+    def _take_speculation(self, user_prompt):
+        """Return the speculative response if it was made for exactly ``user_prompt``, else ``None``."""
+        if self._speculation is None:
+            return None
+        speculative_prompt, future = self._speculation
+        self._speculation = None
+        if speculative_prompt != user_prompt:
+            future.cancel()
+            self.speculation_stats["discarded"] += 1
+            return None
+        try:
+            response = future.result()
+        except Exception as e:
+            print(f"[TurnManager] Speculative guess failed, asking again: {e}")
+            self.speculation_stats["discarded"] += 1
+            return None
+        self.speculation_stats["committed"] += 1
+        print("[TurnManager] Using speculative guess")
+        return response
+
+    def discard_speculation(self):
+        """Drop a pending speculative request; its result is ignored if it is already running."""
+        if self._speculation is None:
+            return
+        _, future = self._speculation
+        future.cancel()
+        self._speculation = None
+        self.speculation_stats["discarded"] += 1
+
+    def _history_entry(self, clue_word, confidence_level, guess_number, guess_idx, result):
+        return {
+            "turn": self.game_state.turn,
+            "clue": clue_word,
+            "confidence": confidence_level,
+            "guess_number": guess_number,
+            "guess": guess_idx,
+            "card": self.game_state.board[guess_idx],
+            "result": result
+        }
+
     def get_feedback(self, guess_idx):
-        while guess_idx not in self.game_state.revealed:
-            print("Waiting for feedback...")
-            time.sleep(0.5)
+        with tracing.span("get_feedback", guess=guess_idx):
+            # Wakes up as soon as the card is revealed through the game state server
+            result = self.game_state.wait_for_reveal(guess_idx, timeout=FEEDBACK_REMINDER_SECONDS)
+            while result is None:
+                print("Waiting for feedback...")
+                result = self.game_state.wait_for_reveal(guess_idx, timeout=FEEDBACK_REMINDER_SECONDS)
+            return result
+
+    def play_turn(self, clue_word, max_guesses, confidence_level=None, features=None, analysis=None):
+        """
+        Play one turn. ``analysis`` is the future of ``(features, confidence_level)`` from
+        ``AudioPipeline.submit``: the turn starts right away and waits for it only where the
+        confidence is used. A ``confidence_level`` passed along with it overrides the classified one.
+        """
+        def turn_audio():
+            if analysis is None:
+                return features, confidence_level
+            try:
+                analysed_features, classified = analysis.result()
+            except Exception as e:
+                print(f"[TurnManager] Audio analysis failed, playing without it: {e}")
+                return None, confidence_level
+            return analysed_features, confidence_level or classified
 
-        return self.game_state.revealed[guess_idx]
+        def say_pre_guess():
+            # Say exactly one pre-guess utterance, chosen by a simple fallback:
+            #   confidence reaction → thinking filler
+            turn_features, turn_confidence = turn_audio()
+            confidence_text = self.guesser.get_confidence_level_reaction(turn_confidence, turn_features)
+            self.guesser.say(confidence_text or self.guesser.get_random_thinking())
 
-    def play_turn(self, clue_word, max_guesses, confidence_level=None, features=None):
-        # Say exactly one pre-guess utterance, chosen by a simple fallback:
-        #   confidence reaction → thinking filler
-        confidence_text = self.guesser.get_confidence_level_reaction(confidence_level, features)
-        utterance = confidence_text or self.guesser.get_random_thinking()
-        self.guesser.say(utterance)
-        self.guesser.say_confidence_based_thinking_style(confidence_level)
+        if analysis is not None and not analysis.done():
+            # The filler sounds cover the gap while the audio is still being processed
+            self._say("say_sounds", self.guesser.say_random_sounds)
+        self._say("say_confidence_reaction", say_pre_guess)
+        self._say("say_thinking_style", lambda: self.guesser.say_confidence_based_thinking_style(turn_audio()[1]))
 
+        # The first prompt needs the confidence level; the speech above waits for it on its own
+        with tracing.span("wait_for_confidence"):
+            features, confidence_level = turn_audio()
         self.game_state.confidence_history.append(confidence_level)
 
         guesses = 0
         turn_guesses = []
         turn_outcomes = []
+        self._previous_guess_speech = None
 
         while guesses < max_guesses and not self.game_state.game_over:
-            self.guesser.dialog_manager.animate_thinking()
-            self.guesser.say_random_thinking()
+            if guesses:
+                self._previous_guess_speech = self._last_speech
+            self.actions.submit("animate_thinking", self.guesser.dialog_manager.animate_thinking, resource=MOTION)
+            self._say("say_thinking", self.guesser.say_random_thinking)
 
-            guess_idx = self.make_guess(clue_word, confidence_level, features)
+            # The LLM request runs while the thinking lines are spoken
+            with tracing.span("make_guess", guess_number=guesses + 1):
+                guess_idx = self.make_guess(clue_word, confidence_level, features)
+            if self.speculate and guesses + 1 < max_guesses:
+                # The next prompt only differs by this card's colour: prepare it while the spymaster reveals it
+                self.speculate_next_guess(clue_word, confidence_level, features, guesses + 1, guess_idx)
             result = self.get_feedback(guess_idx)
+            if result != BLUE:
+                self.discard_speculation()
 
             self.game_state.revealed[guess_idx] = result
-            self.game_state.history.append({
-                "turn": self.game_state.turn,
-                "clue": clue_word,
-                "confidence": confidence_level,
-                "guess_number": guesses + 1,
-                "guess": guess_idx,
-                "card": self.game_state.board[guess_idx],
-                "result": result
-            })
+            self.game_state.history.append(
+                self._history_entry(clue_word, confidence_level, guesses + 1, guess_idx, result))
 
             turn_guesses.append(self.game_state.board[guess_idx])
             turn_outcomes.append(result)
             guesses += 1
 
             if result == ASSASSIN:
-                self.guesser.say_random_assassin_reaction()
+                self._say("say_assassin_reaction", self.guesser.say_random_assassin_reaction)
+                self.actions.wait()
                 self.game_state.game_over = True
                 self.game_state.win = False
                 score = _count_blue(turn_outcomes)
-                return {"guesses": turn_guesses, "outcomes": turn_outcomes, "score": score}
+                return {"guesses": turn_guesses, "outcomes": turn_outcomes, "score": score,
+                        "features": features, "confidence_level": confidence_level}
 
             if result == RED:
-                self.guesser.say_random_red_reaction()
+                self._say("say_red_reaction", self.guesser.say_random_red_reaction)
                 break
 
             if result == BLUE:
-                self.guesser.say_random_blue_reaction()
+                self._say("say_blue_reaction", self.guesser.say_random_blue_reaction)
                 continue
 
             if result == NEUTRAL:
-                self.guesser.say_random_neutral_reaction()
+                self._say("say_neutral_reaction", self.guesser.say_random_neutral_reaction)
                 continue
 
         if self.guessed_all_blue_cards():
@@ -103,11 +300,15 @@ class TurnManager:
             self.game_state.game_over = True
             self.game_state.win = False
 
+        self.discard_speculation()
         self.game_state.turn += 1
-        self.guesser.clear_display()
+        self._display("clear_display", self.guesser.clear_display, after=[self._last_speech])
+        # The game loop speaks and listens next: let every queued action finish first
+        self.actions.wait()
 
         score = _count_blue(turn_outcomes)
-        return {"guesses": turn_guesses, "outcomes": turn_outcomes, "score": score}
+        return {"guesses": turn_guesses, "outcomes": turn_outcomes, "score": score,
+                "features": features, "confidence_level": confidence_level}
 
     def guessed_all_blue_cards(self):
         blue_revealed = sum(1 for color in self.game_state.revealed.values() if color == BLUE)
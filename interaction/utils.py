@@ -16,6 +16,9 @@ NUMBER_WORDS = {
     "nine": 9,
     "ten": 10,
 }
+# Number words that are just as often ordinary words ("i want you to ..."): they count for the
+# final parse, but never as the end of a clue in a partial transcript
+HOMOPHONE_NUMBER_WORDS = {"to", "too", "for"}
 
 STOPWORDS = {
     "uh", "um", "uhm", "erm",
@@ -67,3 +70,48 @@ def parse_clue(clue_text: str):
         raise ValueError("No clue word found before number.")
 
     return clue_word, number
+
+
+class StreamingClueDetector:
+    """
+    Runs ``parse_clue`` on the partial transcripts of an utterance while it is being spoken.
+
+    A clue counts as stable once the same ``(word, number)`` was parsed from ``stable_partials``
+    consecutive partials and the number is the last thing said, i.e. the spymaster is not still
+    in the middle of a sentence like "river for ...". The number must be a digit or an
+    unambiguous number word: a partial ending in "to", "too" or "for" is most likely mid-sentence.
+    """
+
+    def __init__(self, stable_partials=2):
+        self.stable_partials = stable_partials
+        self.reset()
+
+    def reset(self):
+        self.clue = None
+        self._candidate = None
+        self._count = 0
+
+    def feed(self, partial_text: str):
+        """Return the clue once it is stable, else ``None``."""
+        candidate = self._parse_trailing_clue(partial_text)
+        if candidate != self._candidate:
+            self._candidate = candidate
+            self._count = 0
+            self.clue = None
+        if candidate is None:
+            return None
+        self._count += 1
+        if self._count >= self.stable_partials:
+            self.clue = candidate
+        return self.clue
+
+    @staticmethod
+    def _parse_trailing_clue(text):
+        try:
+            clue = parse_clue(text)
+        except ValueError:
+            return None
+        last = re.sub(r"[^\w\s]", " ", text.lower()).split()[-1]
+        if not (last.isdigit() or (last in NUMBER_WORDS and last not in HOMOPHONE_NUMBER_WORDS)):
+            return None
+        return clue
@@ -1,10 +1,12 @@
 import time
+from contextlib import nullcontext
 
 import librosa
 import numpy as np
 import pandas as pd
 import os
 
+from interaction import tracing
 from multimodal_perception.audio import feature_extractor
 
 # Fixed calibration folder (relative to this module)
@@ -17,30 +19,45 @@ class ImportantFeaturesExtractor:
     def __init__(self, whisper):
         self.whisper = whisper
 
-    def extract(self, audio_path: str) -> dict:
-        """Extract features from `audio_path` and return raw base features only."""
+    def extract(self, audio_path: str, profiler=None) -> dict:
+        """Extract features from `audio_path` and return raw base features only.
+
+        With a ``StageProfiler`` (``interaction.profiling``) each stage's wall and CPU time is recorded.
+        """
+        stage = profiler.stage if profiler is not None else _no_stage
 
         # load + preprocess
-        y, sr = feature_extractor.load_audio(audio_path)
+        with tracing.span("load_preprocess"):
+            with stage("load"):
+                y, sr = feature_extractor.load_audio(audio_path)
 
-        y = feature_extractor.trim_silence(y)
-        y = feature_extractor.normalize_audio(y)
-        y = feature_extractor.reduce_noise(y, sr)
+            with stage("trim"):
+                y = feature_extractor.trim_silence(y)
+            with stage("normalize"):
+                y = feature_extractor.normalize_audio(y)
+            with stage("denoise"):
+                y = feature_extractor.reduce_noise(y, sr)
 
         # transcription
         print("Transcribing audio with Whisper...")
-        transcript, asr_words = self.whisper.transcribe_audio(audio_path)
+        with tracing.span("transcribe"), stage("transcribe"):
+            transcript, asr_words = self.whisper.transcribe_audio(audio_path)
 
         # compute raw features
-        duration = librosa.get_duration(y=y, sr=sr)
-        pause_count, _, pause_max = feature_extractor.extract_pause_features_vad(y, sr)
-        _, pause_mid = feature_extractor.pause_position_features(asr_words)
-        verbal_hesitation_count = feature_extractor.count_hesitation_words(transcript)
-        speech_rate = feature_extractor.extract_speech_rate(transcript, duration)
-        mfcc_features = feature_extractor.extract_mfcc_features(y, sr)
-        mfcc_2 = mfcc_features.get("mfcc_2_mean", 0)
-        _, energy_std, energy_range, _, _ = feature_extractor.energy_features(y)
-        _, _, hnr = feature_extractor.extract_voice_quality(audio_path)
+        with tracing.span("compute_features"):
+            duration = librosa.get_duration(y=y, sr=sr)
+            with stage("vad"):
+                pause_count, _, pause_max = feature_extractor.extract_pause_features_vad(y, sr)
+            _, pause_mid = feature_extractor.pause_position_features(asr_words)
+            verbal_hesitation_count = feature_extractor.count_hesitation_words(transcript)
+            speech_rate = feature_extractor.extract_speech_rate(transcript, duration)
+            with stage("mfcc"):
+                mfcc_features = feature_extractor.extract_mfcc_features(y, sr)
+            mfcc_2 = mfcc_features.get("mfcc_2_mean", 0)
+            with stage("energy"):
+                _, energy_std, energy_range, _, _ = feature_extractor.energy_features(y)
+            with stage("hnr"):
+                _, _, hnr = feature_extractor.extract_voice_quality(audio_path)
 
         return {
             'transcript': transcript,
@@ -54,3 +71,7 @@ class ImportantFeaturesExtractor:
             'pause_mid_speech': pause_mid,
             'pause_count': pause_count,
         }
+
+
+def _no_stage(name):
+    return nullcontext()
@@ -1,5 +1,6 @@
 import tempfile
 import threading
+import time
 
 import numpy as np
 import sounddevice as sd
@@ -9,10 +10,14 @@ import soundfile as sf
 class AudioRecorder:
     """Records audio from the specified input device into a WAV file."""
 
-    def __init__(self, device_index=None, sample_rate=16000, channels=2):
+    def __init__(self, device_index=None, sample_rate=16000, channels=2, playback_gate=None, barge_in_detector=None):
         self.device_index = device_index
         self.sample_rate = sample_rate
         self.channels = channels
+        # Optional PlaybackGate: blocks overlapping the robot's own playback are dropped, like a pause
+        self.playback_gate = playback_gate
+        # Optional BargeInDetector fed with the level of every block
+        self.barge_in_detector = barge_in_detector
 
         self._frames = []
         self._stream = None
@@ -40,10 +45,39 @@ class AudioRecorder:
         """Resume recording after a pause."""
         self._paused_event.clear()
 
-    def _callback(self, indata, frames, time, status):
-        if not self._paused_event.is_set():
+    def _callback(self, indata, frames, time_info, status):
+        paused = self._paused_event.is_set()
+        if self.playback_gate is None:
+            if not paused:
+                self._frames.append(indata.copy())
+            return
+
+        block_end = time.time()
+        block_seconds = frames / self.sample_rate
+        during_playback = self.playback_gate.overlaps(block_end - block_seconds, block_end)
+        # Barge-in is also detected while paused, e.g. a "yes" over the clue confirmation
+        if self.barge_in_detector is not None:
+            rms = float(np.sqrt(np.mean(np.square(indata, dtype=np.float64))))
+            self.barge_in_detector.feed(rms, block_seconds, during_playback)
+        if not paused and not during_playback:
             self._frames.append(indata.copy())
 
+    def frame_count(self):
+        """Number of audio blocks captured so far; unchanged while paused."""
+        return len(self._frames)
+
+    def snapshot(self):
+        """
+        Save the audio captured so far to a temporary WAV file without stopping, e.g. while
+        paused. Returns the path, or None if nothing was recorded.
+        """
+        frames = list(self._frames)
+        if not frames:
+            return None
+        tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+        sf.write(tmp.name, np.concatenate(frames, axis=0), self.sample_rate)
+        return tmp.name
+
     def stop(self):
         """
         Stop recording and save the captured audio to a temporary WAV file.
@@ -177,9 +177,9 @@ class ConfidenceClassifier:
 
     @staticmethod
     def _softmax(z):
-        z = z - np.max(z)  # stability
+        z = z - np.max(z, axis=-1, keepdims=True)  # stability
         exp_z = np.exp(z)
-        return exp_z / np.sum(exp_z)
+        return exp_z / np.sum(exp_z, axis=-1, keepdims=True)
 
     def probs(self, features: dict) -> np.ndarray:
         x = self._features_to_vector(features)
@@ -201,3 +201,14 @@ class ConfidenceClassifier:
                                 and abs(low_prob - high_prob) < 0.1):
             label = CONFIDENCE_MEDIUM
         return probs, label
+
+    def classify_batch(self, features_list: list) -> (np.ndarray, list):
+        """Vectorized ``classify`` over many feature dicts: ``(probs of shape (n, 3), labels)``."""
+        X = np.array([self._features_to_vector(f) for f in features_list]).reshape(-1, len(SELECTED_FEATURES))
+        probs = self._softmax(X @ self.W.T + self.b)
+        high_prob, low_prob, medium_prob = probs[:, 0], probs[:, 1], probs[:, 2]
+        labels = np.array([CONFIDENCE_HIGH, CONFIDENCE_LOW, CONFIDENCE_MEDIUM])[np.argmax(probs, axis=1)]
+        split = ((probs.max(axis=1) < 0.66) & (low_prob > medium_prob) & (high_prob > medium_prob)
+                 & (np.abs(low_prob - high_prob) < 0.1))
+        labels[split] = CONFIDENCE_MEDIUM
+        return probs, labels.tolist()
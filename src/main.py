@@ -8,6 +8,7 @@ from agents.tts_manager import ElevenLabsTTSConf
 from interaction.game import CodenamesGame
 from interaction.game_state import GameState
 from interaction.game_loop import GameLoop
+from interaction import session_store, tracing
 from agents.guesser import Guesser
 
 # Configurations
@@ -19,9 +20,22 @@ robot_ip = '10.15.3.234'
 use_robot = True  # Set to False if you want to run without the robot (using desktop audio instead)
 stt_mic_device_index = 4  # This should be the robot's microphone (or desktop mic if not using the robot)
 audio_features_mic_device_index = 1  # This should be the external mic that the participant is wearing
+stream_guesses = True  # Show the guessed card and speak the reason while the LLM response is still streaming
+barge_in = False  # Stop speaking early when the participant talks over the robot (needs the external mic)
+state_server_mode = "pooled"  # "dev", "pooled" or "process" (game UI server in its own process)
+trace_latency = True  # Write per-turn latency spans to logs/traces (convert with `python -m interaction.tracing`)
+record_session_store = True  # Also record turns, features, utterances and audio paths in logs/sessions.db
+profile_feature_worker = False  # Log per-stage wall/CPU time and peak RSS of audio feature extraction each turn
+feature_workers = 1  # Feature extraction processes; one is kept for live turns, extra ones take background jobs
 
 
 def run():
+    if trace_latency:
+        # Before the guesser is built, so the audio feature worker traces into the same file
+        tracing.configure(participant_id)
+    if record_session_store:
+        session_store.open_session(participant_id, condition="adaptive" if is_adaptive else "baseline")
+
     # Conversational Agent Setup
     mic_conf = MicrophoneConf(device_index=stt_mic_device_index)
     device_manager = Desktop(speakers_conf=SpeakersConf(sample_rate=22050), mic_conf=mic_conf)
@@ -32,14 +46,18 @@ def run():
         real_time_stt=False,
         external_audio_device_id=audio_features_mic_device_index,
         participant_id=participant_id,
-        adaptive=is_adaptive
+        adaptive=is_adaptive,
+        stream_guesses=stream_guesses,
+        barge_in=barge_in,
+        profile_feature_worker=profile_feature_worker,
+        feature_workers=feature_workers
     )
 
     guesser = Guesser(device_manager, tts_conf, int_conf)
 
     # Build Game
     game = CodenamesGame(config_number=board_config_number)
-    game_state = GameState(board=game.board)
+    game_state = GameState(board=game.board, server_mode=state_server_mode)
 
     input("Press Enter to start the game")
 
@@ -58,6 +76,7 @@ def run():
     loop.play()
 
     # Shutdown
+    session_store.close()
     game.shutdown()
     guesser.shutdown()
 
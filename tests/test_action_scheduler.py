@@ -0,0 +1,68 @@
+import threading
+import time
+
+from interaction.action_scheduler import ActionScheduler, SPEECH
+
+
+class TestActionScheduler:
+    def test_dependent_action_starts_after_its_dependency(self):
+        scheduler = ActionScheduler(log=False)
+        events = []
+        shown = scheduler.submit("display", lambda: (time.sleep(0.05), events.append("display")))
+        scheduler.submit("speak", events.append, "speak", after=[shown])
+        assert scheduler.wait(timeout=2)
+        assert events == ["display", "speak"]
+
+    def test_actions_on_the_same_resource_do_not_overlap(self):
+        scheduler = ActionScheduler(max_workers=4, log=False)
+        running = []
+        overlaps = []
+        lock = threading.Lock()
+
+        def speak(text):
+            with lock:
+                if running:
+                    overlaps.append(text)
+                running.append(text)
+            time.sleep(0.02)
+            with lock:
+                running.remove(text)
+            return text
+
+        actions = [scheduler.submit(f"say_{i}", speak, str(i), resource=SPEECH) for i in range(4)]
+        assert scheduler.wait(timeout=2)
+        assert overlaps == []
+        assert [a.result() for a in actions] == ["0", "1", "2", "3"]
+        # Submission order is kept
+        assert [a.started_at for a in actions] == sorted(a.started_at for a in actions)
+
+    def test_independent_actions_run_concurrently(self):
+        scheduler = ActionScheduler(log=False)
+        barrier = threading.Barrier(2, timeout=1)
+        scheduler.submit("display", barrier.wait)
+        scheduler.submit("animate", barrier.wait)
+        assert scheduler.wait(timeout=2)
+        assert not barrier.broken
+
+    def test_failed_dependency_does_not_block_dependents(self):
+        scheduler = ActionScheduler(log=False)
+        failing = scheduler.submit("display", lambda: 1 / 0)
+        spoken = scheduler.submit("speak", lambda: "ok", after=[failing])
+        assert spoken.result(timeout=1) == "ok"
+
+    def test_timings_are_recorded(self):
+        scheduler = ActionScheduler(log=False)
+        scheduler.submit("display", time.sleep, 0.02, resource="display")
+        scheduler.wait(timeout=2)
+        timing = scheduler.timings[0]
+        assert timing["action"] == "display"
+        assert timing["resource"] == "display"
+        assert timing["run_s"] >= 0.02
+
+    def test_wait_times_out(self):
+        scheduler = ActionScheduler(log=False)
+        release = threading.Event()
+        scheduler.submit("speak", release.wait)
+        assert scheduler.wait(timeout=0.01) is False
+        release.set()
+        assert scheduler.wait(timeout=1) is True
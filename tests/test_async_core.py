@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+from agents.playback_gate import PlaybackGate
+from interaction.async_core import AsyncGuesser
+
+
+class _FakeGuesser:
+    def __init__(self, echo_guard_s=0.0, speech_chunks=0):
+        self.defer_echo_guard = False
+        self.calls = []
+        self.playback_gate = PlaybackGate(echo_tail=0.01)
+        self._echo_guard_s = echo_guard_s
+        self._echo_guard_until = 0.0
+        self._speech_chunks = speech_chunks  # 50 ms clips per utterance, skipped after a barge-in
+
+    def say(self, text, **kwargs):
+        self.calls.append(("say", text))
+        for _ in range(self._speech_chunks):
+            if self.playback_gate.barge_in_requested():
+                self.calls.append(("cut_off", text))
+                break
+            with self.playback_gate.playing():
+                time.sleep(0.05)
+        self._echo_guard_until = time.monotonic() + self._echo_guard_s
+
+    def stop_speaking(self):
+        self.playback_gate.signal_barge_in()
+
+    def echo_guard_remaining(self):
+        return max(0.0, self._echo_guard_until - time.monotonic())
+
+    def listen(self):
+        self.playback_gate.wait_until_quiet()  # like the STT services
+        self.calls.append(("listen", time.monotonic()))
+        return "ocean two"
+
+    def pause_recording(self):
+        self.calls.append(("pause",))
+
+    def resume_recording(self):
+        self.calls.append(("resume",))
+
+
+class TestAsyncGuesser:
+    def test_defers_the_echo_guard(self):
+        guesser = _FakeGuesser()
+        AsyncGuesser(guesser)
+        assert guesser.defer_echo_guard is True
+
+    def test_listen_waits_out_remaining_echo_guard(self):
+        guesser = _FakeGuesser(echo_guard_s=0.1)
+        io = AsyncGuesser(guesser)
+
+        async def scenario():
+            await io.say("hello")
+            said_at = time.monotonic()
+            assert await io.listen() == "ocean two"
+            return said_at
+
+        said_at = asyncio.run(scenario())
+        assert guesser.calls[-1][1] - said_at >= 0.09
+
+    def test_work_between_speaking_and_listening_overlaps_the_guard(self):
+        guesser = _FakeGuesser(echo_guard_s=0.1)
+        io = AsyncGuesser(guesser)
+
+        async def scenario():
+            await io.say("hello")
+            start = time.monotonic()
+            await asyncio.sleep(0.1)  # e.g. recording control or an LLM call
+            await io.listen()
+            return time.monotonic() - start
+
+        assert asyncio.run(scenario()) < 0.18
+
+
+class TestSpeakAndListen:
+    def test_listens_after_the_speech(self):
+        guesser = _FakeGuesser(speech_chunks=2)
+        io = AsyncGuesser(guesser)
+        assert asyncio.run(io.speak_and_listen(io.say("are you still there?"))) == "ocean two"
+        assert [c[0] for c in guesser.calls] == ["say", "listen"]
+
+    def test_barge_in_cancels_the_speech_and_starts_listening(self):
+        guesser = _FakeGuesser(speech_chunks=20)  # a one-second long-wait utterance
+        io = AsyncGuesser(guesser)
+        # The participant starts talking 0.1 s into the utterance
+        threading.Timer(0.1, guesser.playback_gate.signal_barge_in).start()
+
+        start = time.monotonic()
+        assert asyncio.run(io.speak_and_listen(io.say("take your time"))) == "ocean two"
+        assert time.monotonic() - start < 0.5
+        assert [c[0] for c in guesser.calls] == ["say", "cut_off", "listen"]
+
+    def test_cancelled_say_stops_playback(self):
+        guesser = _FakeGuesser(speech_chunks=20)
+        io = AsyncGuesser(guesser)
+
+        async def scenario():
+            task = asyncio.create_task(io.say("take your time"))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(scenario())
+        assert guesser.playback_gate.barge_in_requested()
+
+    def test_spawned_task_resolves_a_thread_safe_future(self):
+        io = AsyncGuesser(_FakeGuesser())
+
+        async def scenario():
+            future = io.spawn(lambda x: x * 2, 21)
+            # Waited on from a worker thread, like the turn manager's prefetched guess
+            return await asyncio.to_thread(future.result, 5)
+
+        assert asyncio.run(scenario()) == 42
@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pytest
+
+sf = pytest.importorskip("soundfile")
+
+from interaction.audio_archive import AudioArchive, AudioArchiveReader, FAILED_DIR  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+@pytest.fixture
+def stereo_wav(tmp_path):
+    """Three seconds of a stereo tone, as written by AudioRecorder."""
+    t = np.arange(3 * SAMPLE_RATE) / SAMPLE_RATE
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t)
+    path = str(tmp_path / "recording.wav")
+    sf.write(path, np.stack([tone, tone], axis=1), SAMPLE_RATE, subtype="PCM_16")
+    return path
+
+
+class TestAudioArchive:
+    def test_archives_mono_flac_with_manifest_and_removes_source(self, tmp_path, stereo_wav):
+        archive = AudioArchive(str(tmp_path / "audio"), "p01")
+        path, future = archive.add(stereo_wav, turn=2)
+        entry = future.result(timeout=10)
+        archive.close()
+
+        assert path.endswith(".flac") and os.path.isfile(path)
+        assert not os.path.exists(stereo_wav)
+        assert sf.info(path).channels == 1
+        assert entry["duration_s"] == pytest.approx(3.0)
+        assert entry["archived_bytes"] < entry["source_bytes"]
+
+        reader = AudioArchiveReader(str(tmp_path / "audio"))
+        (listed,) = reader.entries()
+        assert listed["path"] == path
+        assert reader.find("p01", 2)["sha256"] == entry["sha256"]
+        assert reader.verify(listed)
+
+    def test_reader_reads_ranges_and_streams_blocks(self, tmp_path, stereo_wav):
+        archive = AudioArchive(str(tmp_path / "audio"), "p01")
+        _, future = archive.add(stereo_wav, turn=0, delete_source=False)
+        future.result(timeout=10)
+        reader = AudioArchiveReader(str(tmp_path / "audio"))
+        entry = reader.find("p01", 0)
+
+        original, _ = sf.read(stereo_wav, dtype="float32")
+        samples, sample_rate = reader.read(entry, start_s=1.0, duration_s=0.5)
+        assert sample_rate == SAMPLE_RATE
+        assert len(samples) == SAMPLE_RATE // 2
+        np.testing.assert_allclose(samples, original[SAMPLE_RATE:SAMPLE_RATE + SAMPLE_RATE // 2, 0], atol=1e-3)
+
+        last, _ = reader.read_last(entry, 1.0)
+        assert len(last) == SAMPLE_RATE
+        blocks = list(reader.stream(entry, block_s=1.0))
+        assert [len(b) for b in blocks] == [SAMPLE_RATE] * 3
+
+    def test_verify_detects_a_changed_clip(self, tmp_path, stereo_wav):
+        archive = AudioArchive(str(tmp_path / "audio"), "p01")
+        path, future = archive.add(stereo_wav, turn=0)
+        entry = dict(future.result(timeout=10), path=path)
+        with open(path, "ab") as f:
+            f.write(b"\0")
+        assert not AudioArchiveReader.verify(entry)
+
+    def test_failed_encode_keeps_the_recording(self, tmp_path):
+        broken = tmp_path / "recording.wav"
+        broken.write_bytes(b"not a wav file")
+        archive = AudioArchive(str(tmp_path / "audio"), "p01")
+        path, future = archive.add(str(broken), turn=3)
+        with pytest.raises(Exception):
+            future.result(timeout=10)
+        archive.close()
+
+        assert not os.path.exists(path)
+        assert os.path.isfile(os.path.join(archive.directory, FAILED_DIR, "recording.wav"))
+        assert AudioArchiveReader(str(tmp_path / "audio")).entries() == []
+
+    def test_unknown_format_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            AudioArchive(str(tmp_path), "p01", fmt="mp3")
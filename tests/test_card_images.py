@@ -0,0 +1,53 @@
+import io
+
+from PIL import Image
+
+from interaction.card_images import CardImageCache
+
+
+def _png(tmp_path, name="card.png", size=(800, 1200)):
+    path = tmp_path / name
+    Image.new("RGB", size, "red").save(path)
+    return str(path)
+
+
+class TestCardImageCache:
+    def test_width_snaps_up_to_precomputed_variant(self):
+        cache = CardImageCache(widths=(200, 400))
+        assert cache.snap_width(150) == 200
+        assert cache.snap_width(300) == 400
+        assert cache.snap_width(1000) is None
+        assert cache.snap_width(None) is None
+
+    def test_original_size_is_served_untouched(self, tmp_path):
+        path = _png(tmp_path)
+        variant = CardImageCache().get(path)
+        with open(path, "rb") as f:
+            assert variant.data == f.read()
+        assert variant.mimetype == "image/png"
+
+    def test_variants_are_encoded_once(self, tmp_path, monkeypatch):
+        path = _png(tmp_path)
+        cache = CardImageCache()
+        calls = []
+        encode = CardImageCache._encode
+        monkeypatch.setattr(CardImageCache, "_encode", staticmethod(lambda *a: calls.append(a) or encode(*a)))
+        first = cache.get(path, 400, webp=True)
+        assert cache.get(path, 350, webp=True) is first
+        assert len(calls) == 1
+
+    def test_warm_skips_missing_files(self, tmp_path):
+        path = _png(tmp_path, size=(100, 150))
+        cache = CardImageCache(widths=(200,))
+        cache.warm([path, str(tmp_path / "missing.png")])
+        # Smaller images are not upscaled
+        assert Image.open(io.BytesIO(cache.get(path, 200).data)).width == 100
+
+    def test_warm_only_encodes_the_requested_widths(self, tmp_path, monkeypatch):
+        path = _png(tmp_path)
+        cache = CardImageCache(widths=(200, 400))
+        calls = []
+        encode = CardImageCache._encode
+        monkeypatch.setattr(CardImageCache, "_encode", staticmethod(lambda *a: calls.append(a) or encode(*a)))
+        cache.warm([path], widths=(350,))
+        assert sorted(calls) == [(path, 400, False), (path, 400, True)]
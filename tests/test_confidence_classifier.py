@@ -1,11 +1,14 @@
 import numpy as np
+import pandas as pd
 import pytest
 
 from multimodal_perception.model.confidence_classifier import (
+    BASE_FEATURES,
     ConfidenceClassifier,
     CONFIDENCE_HIGH,
     CONFIDENCE_LOW,
     CONFIDENCE_MEDIUM,
+    SELECTED_FEATURES,
 )
 
 
@@ -121,3 +124,37 @@ class TestClassifyProbabilityCalibration:
         clf = _PatchedClassifier(fixed)
         probs, _ = clf.classify({})
         np.testing.assert_array_almost_equal(probs, fixed)
+
+
+class TestClassifyBatch:
+    """classify_batch must agree with classify() row by row."""
+
+    @staticmethod
+    def _features(rng):
+        return {name: float(rng.normal(1.0, 2.0)) for name in BASE_FEATURES}
+
+    def test_matches_classify_with_calibration(self):
+        rng = np.random.default_rng(0)
+        clf = ConfidenceClassifier()
+        clf._load_calibration_from_df(pd.DataFrame([self._features(rng) for _ in range(5)]), participant_id="7")
+        batch = [self._features(rng) for _ in range(50)]
+
+        probs, labels = clf.classify_batch(batch)
+
+        assert probs.shape == (50, 3)
+        for row, features in enumerate(batch):
+            single_probs, single_label = clf.classify(features)
+            np.testing.assert_array_almost_equal(probs[row], single_probs)
+            assert labels[row] == single_label
+
+    def test_split_between_extremes_overrides_to_medium(self):
+        clf = ConfidenceClassifier()
+        clf.W = np.zeros((3, len(SELECTED_FEATURES)))
+        clf.b = np.log([0.42, 0.45, 0.13])
+        _, labels = clf.classify_batch([{}, {}])
+        assert labels == [CONFIDENCE_MEDIUM, CONFIDENCE_MEDIUM]
+
+    def test_empty_batch(self):
+        probs, labels = ConfidenceClassifier().classify_batch([])
+        assert probs.shape == (0, 3)
+        assert labels == []
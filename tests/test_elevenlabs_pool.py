@@ -0,0 +1,149 @@
+"""Tests for the ElevenLabs websocket pool, run against a local websocket stand-in."""
+
+import asyncio
+import base64
+import json
+
+import websockets
+
+from agents.tts_manager import ElevenLabsTTS, _ElevenLabsConnection
+
+
+class _FakeElevenLabsServer:
+    """Minimal stream-input stand-in: answers every flushed text with one audio message."""
+
+    def __init__(self, close_after_first_audio=False):
+        self.close_after_first_audio = close_after_first_audio
+        self.connections = 0
+        self.init_messages = []
+        self.texts = []
+        self.audio_sent = 0
+        self._server = None
+
+    async def _handler(self, websocket):
+        self.connections += 1
+        connection_id = self.connections
+        async for message in websocket:
+            data = json.loads(message)
+            if "xi_api_key" in data:
+                self.init_messages.append(data)
+                continue
+            self.texts.append(data["text"])
+            if not data.get("flush"):
+                continue
+            await asyncio.sleep(0.05)
+            audio = f"{connection_id}:{data['text']}".encode()
+            await websocket.send(json.dumps({"audio": base64.b64encode(audio).decode()}))
+            self.audio_sent += 1
+            if self.close_after_first_audio and self.audio_sent == 1:
+                await websocket.close()
+                return
+
+    async def __aenter__(self):
+        self._server = await websockets.serve(self._handler, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+def _make_tts(server, **kwargs):
+    return ElevenLabsTTS(elevenlabs_key="test-key", voice_id="voice", model_id="model",
+                         base_url=server.url, **kwargs)
+
+
+def test_connect_opens_authenticated_pool():
+    async def scenario():
+        async with _FakeElevenLabsServer() as server:
+            tts = _make_tts(server, pool_size=3)
+            await tts.connect()
+            await asyncio.sleep(0.05)
+            await tts.disconnect()
+            return server
+
+    server = asyncio.run(scenario())
+    assert server.connections == 3
+    assert all(m["xi_api_key"] == "test-key" for m in server.init_messages)
+
+
+def test_speak_returns_decoded_audio():
+    async def scenario():
+        async with _FakeElevenLabsServer() as server:
+            tts = _make_tts(server, pool_size=1)
+            await tts.connect()
+            audio = await tts.speak("hello")
+            await tts.disconnect()
+            return audio
+
+    assert asyncio.run(scenario()) == b"1:hello"
+
+
+def test_concurrent_speak_uses_separate_connections():
+    async def scenario():
+        async with _FakeElevenLabsServer() as server:
+            tts = _make_tts(server, pool_size=2)
+            await tts.connect()
+            results = await asyncio.gather(tts.speak("first"), tts.speak("second"))
+            await tts.disconnect()
+            return results
+
+    first, second = asyncio.run(scenario())
+    assert first.split(b":")[0] != second.split(b":")[0]
+
+
+def test_speak_skips_ping_when_connection_known_healthy(monkeypatch):
+    pings = []
+    original_ping = _ElevenLabsConnection.ping
+
+    async def counting_ping(self, *args, **kwargs):
+        pings.append(self)
+        return await original_ping(self, *args, **kwargs)
+
+    monkeypatch.setattr(_ElevenLabsConnection, "ping", counting_ping)
+
+    async def scenario():
+        async with _FakeElevenLabsServer() as server:
+            tts = _make_tts(server, pool_size=1, health_check_interval=60)
+            await tts.connect()
+            await tts.speak("one")
+            await tts.speak("two")
+            await tts.disconnect()
+
+    asyncio.run(scenario())
+    assert pings == []
+
+
+def test_speak_reconnects_after_server_closes_connection():
+    async def scenario():
+        async with _FakeElevenLabsServer(close_after_first_audio=True) as server:
+            tts = _make_tts(server, pool_size=1)
+            await tts.connect()
+            first = await tts.speak("one")
+            await asyncio.sleep(0.05)
+            # The stand-in closed the socket while it was still considered healthy
+            second = await tts.speak("two")
+            await tts.disconnect()
+            return first, second, server.connections
+
+    first, second, connections = asyncio.run(scenario())
+    assert first == b"1:one"
+    assert second == b"2:two"
+    assert connections == 2
+
+
+def test_health_check_sends_unbilled_keepalive():
+    async def scenario():
+        async with _FakeElevenLabsServer() as server:
+            tts = _make_tts(server, pool_size=2, health_check_interval=60)
+            await tts.connect()
+            await tts.check_health()
+            await asyncio.sleep(0.05)
+            await tts.disconnect()
+            return server
+
+    server = asyncio.run(scenario())
+    assert server.texts.count(" ") == 2
+    assert server.audio_sent == 0
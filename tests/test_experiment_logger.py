@@ -2,9 +2,13 @@ import csv
 import json
 import os
 
+import numpy as np
+import pandas as pd
 import pytest
 
-from interaction.experiment_logger import ExperimentLogger, FIELDNAMES
+from interaction.experiment_logger import (
+    ExperimentLogger, FIELDNAMES, compact_logs, load_experiments, read_experiment_csv,
+)
 
 
 @pytest.fixture
@@ -166,3 +170,91 @@ class TestLogTurn:
 
         assert json.loads(rows[0]["board"]) == ["a", "b"]
         assert json.loads(rows[0]["key_map"]) == {"blue": [0], "red": [1]}
+
+
+def _log(logger, turn=0, features=None):
+    logger.log_turn(
+        turn=turn,
+        clue_word="water",
+        clue_number=2,
+        features=features,
+        confidence_level="high",
+        guesses=["river", "mountain"],
+        outcomes=["blue", "red"],
+        score=1,
+        turn_duration_s=12.5,
+    )
+
+
+class TestTypedColumns:
+    def test_known_features_get_their_own_columns(self, logger):
+        _log(logger, features={"duration": np.float32(3.5), "pause_count": 2, "transcript": "water two"})
+        with open(logger.csv_path, newline="", encoding="utf-8") as f:
+            row = next(csv.DictReader(f))
+        assert row["feature_duration"] == "3.5"
+        assert row["feature_pause_count"] == "2"
+        assert row["feature_hnr"] == ""
+        assert json.loads(row["features"])["transcript"] == "water two"
+
+    def test_read_experiment_csv_returns_typed_frame(self, logger):
+        _log(logger, turn=0, features={"duration": 3.5})
+        _log(logger, turn=1)
+        logger.close(compact=False)
+
+        df = read_experiment_csv(logger.csv_path)
+        assert list(df["turn"]) == [0, 1]
+        assert df["feature_duration"].dtype == "float64"
+        assert df["feature_duration"].iloc[0] == 3.5
+        assert pd.isna(df["feature_duration"].iloc[1])
+        assert df["guesses"].iloc[0] == ["river", "mountain"]
+
+
+class TestFlushPolicy:
+    def test_rows_are_buffered_until_flush_every(self, log_dir):
+        logger = ExperimentLogger("p04", True, "01", log_dir=log_dir, flush_every=2)
+        _log(logger, turn=0)
+        with open(logger.csv_path, newline="", encoding="utf-8") as f:
+            assert list(csv.DictReader(f)) == []
+        _log(logger, turn=1)
+        with open(logger.csv_path, newline="", encoding="utf-8") as f:
+            assert len(list(csv.DictReader(f))) == 2
+        logger.close(compact=False)
+
+    def test_close_is_idempotent(self, logger):
+        _log(logger)
+        logger.close(compact=False)
+        assert logger.close() is None
+
+
+class TestCompaction:
+    def test_load_experiments_reads_uncompacted_csvs(self, log_dir):
+        for pid in ("p05", "p06"):
+            with ExperimentLogger(pid, True, "01", log_dir=log_dir) as logger:
+                _log(logger)
+        df = load_experiments(log_dir)
+        assert sorted(df["participant_id"]) == ["p05", "p06"]
+
+    def test_parquet_round_trip(self, log_dir):
+        pytest.importorskip("pyarrow")
+        logger = ExperimentLogger("p07", True, "01", log_dir=log_dir)
+        _log(logger, features={"duration": 3.5})
+        parquet_path = logger.close()
+        assert parquet_path.endswith(".parquet")
+        assert compact_logs(log_dir) == []  # already up to date
+
+        df = load_experiments(log_dir)
+        assert len(df) == 1
+        assert df["feature_duration"].iloc[0] == 3.5
+        assert list(df["outcomes"].iloc[0]) == ["blue", "red"]
+
+    def test_empty_session_loads_with_other_sessions(self, log_dir):
+        pytest.importorskip("pyarrow")
+        ExperimentLogger("p08", True, "01", log_dir=log_dir).close()  # closed before the first turn
+        with ExperimentLogger("p09", True, "01", log_dir=log_dir) as logger:
+            _log(logger, features={"duration": 2.0})
+            logger.log_turn(1, "fire", 1, None, None, [], [], 0, 5.0)
+
+        df = load_experiments(log_dir)
+        assert list(df["participant_id"]) == ["p09", "p09"]
+        assert list(df["guesses"].iloc[1]) == []
+        assert df["turn"].dtype == "Int64"
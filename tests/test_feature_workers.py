@@ -0,0 +1,131 @@
+import os
+import time
+
+import pytest
+
+from interaction.feature_workers import (
+    FeatureExtractionError, FeatureWorkerPool, PRIORITY_BACKGROUND, PRIORITY_CALIBRATION, PRIORITY_LIVE,
+)
+
+
+class _FakeExtractor:
+    """Jobs are "<name>:<seconds>"; "fail" raises and "crash" kills the worker process."""
+
+    def extract(self, audio_path, profiler=None):
+        if audio_path == "fail":
+            raise ValueError("unreadable file")
+        if audio_path == "crash":
+            os._exit(3)
+        name, seconds = audio_path.split(":")
+        if profiler is not None:
+            with profiler.stage("load"):
+                time.sleep(float(seconds))
+        else:
+            time.sleep(float(seconds))
+        return {"name": name, "pid": os.getpid(), "finished_at": time.time()}
+
+
+def _make_extractor():
+    return _FakeExtractor()
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(size=1, **kwargs):
+        kwargs.setdefault("reserved_live_workers", 0)
+        pools.append(FeatureWorkerPool(size, make_extractor=_make_extractor, **kwargs))
+        return pools[-1]
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def _finish_order(futures):
+    results = [f.result(timeout=10)[0] for f in futures]
+    return [r["name"] for r in sorted(results, key=lambda r: r["finished_at"])]
+
+
+class TestFeatureWorkerPool:
+    def test_pending_jobs_start_in_priority_order(self, make_pool):
+        pool = make_pool(1)
+        first = pool.submit("first:0.3", PRIORITY_BACKGROUND)
+        time.sleep(0.1)  # the first job is running
+        queued = [pool.submit("background:0", PRIORITY_BACKGROUND),
+                  pool.submit("calibration:0", PRIORITY_CALIBRATION),
+                  pool.submit("live:0", PRIORITY_LIVE)]
+
+        assert _finish_order([first] + queued) == ["first", "live", "calibration", "background"]
+
+    def test_reserved_worker_keeps_live_turns_from_waiting(self, make_pool):
+        pool = make_pool(2, reserved_live_workers=1)
+        background = [pool.submit(f"background{i}:0.5", PRIORITY_BACKGROUND) for i in range(2)]
+        time.sleep(0.1)
+        live = pool.submit("live:0", PRIORITY_LIVE)
+
+        features, _ = live.result(timeout=10)
+        # Only one background job was allowed to run, so the live turn ran at once on the other worker
+        assert not background[0].done()
+        assert pool.pending() == 1
+        assert features["pid"] != background[0].result(timeout=10)[0]["pid"]
+        background[1].result(timeout=10)
+
+    def test_futures_resolve_out_of_order(self, make_pool):
+        pool = make_pool(2)
+        slow = pool.submit("slow:0.5")
+        fast = pool.submit("fast:0")
+        assert fast.result(timeout=10)[0]["name"] == "fast"
+        assert not slow.done()
+        assert slow.result(timeout=10)[0]["name"] == "slow"
+
+    def test_extraction_error_fails_only_that_job(self, make_pool):
+        pool = make_pool(1)
+        with pytest.raises(FeatureExtractionError, match="unreadable file"):
+            pool.submit("fail").result(timeout=10)
+        assert pool.submit("next:0").result(timeout=10)[0]["name"] == "next"
+
+    def test_dead_worker_fails_its_job_and_is_restarted(self, make_pool):
+        pool = make_pool(1)
+        with pytest.raises(FeatureExtractionError, match="exited"):
+            pool.submit("crash").result(timeout=10)
+        assert pool.submit("after:0").result(timeout=10)[0]["name"] == "after"
+
+    def test_dead_worker_is_noticed_while_others_keep_returning_results(self, make_pool):
+        pool = make_pool(2)
+        crashed = pool.submit("crash")
+        deadline = time.monotonic() + 5
+        while not crashed.done() and time.monotonic() < deadline:
+            pool.submit("busy:0.1").result(timeout=10)
+        with pytest.raises(FeatureExtractionError, match="exited"):
+            crashed.result(timeout=0)
+
+    def test_stale_result_of_a_replaced_worker_is_ignored(self, make_pool):
+        pool = make_pool(1)
+        running = pool.submit("new:0.3")
+        time.sleep(0.1)
+        # A result the crashed predecessor of worker 0 sent before it was replaced
+        pool._result_q.put((0, -1, {"name": "stale"}, None, None))
+        assert running.result(timeout=5)[0]["name"] == "new"
+        assert pool.submit("next:0").result(timeout=5)[0]["name"] == "next"
+
+    def test_profiles_and_stack_dumps_come_back_with_the_features(self, make_pool, tmp_path):
+        pool = make_pool(1, profile=True)
+        (path,) = pool.request_profile_dump(str(tmp_path / "worker.txt"))
+        _, profile = pool.submit("job:0.2").result(timeout=10)
+
+        assert profile["stages"]["load"]["wall_s"] >= 0.2
+        assert profile["sampling_dump"] == path
+        assert os.path.getsize(path) > 0
+
+    def test_shutdown_cancels_jobs_that_did_not_start(self, make_pool):
+        pool = make_pool(1)
+        running = pool.submit("running:0.3")
+        time.sleep(0.1)
+        waiting = pool.submit("waiting:0")
+        pool.shutdown()
+        assert waiting.cancelled()
+        assert running.done()
+        with pytest.raises(RuntimeError):
+            pool.submit("late:0")
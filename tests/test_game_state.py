@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+
+import pytest
+
+from interaction import game_state as game_state_module
+from interaction.game_state import GameState, BLUE, RED
+
+
+@pytest.fixture
+def game_state(tmp_path, monkeypatch):
+    """A GameState with a tiny board and no web server."""
+    descriptions = tmp_path / "card_descriptions.json"
+    descriptions.write_text(json.dumps({"1.png": "a", "2.png": "b", "3.png": "c"}))
+    monkeypatch.setattr(game_state_module, "CARD_DESCRIPTIONS_PATH", str(descriptions))
+    monkeypatch.setattr(game_state_module, "start_game_state_server", lambda gs, **kwargs: None)
+    return GameState(board=["1.png", "2.png", "3.png"])
+
+
+class TestWaitForReveal:
+    def test_returns_immediately_when_already_revealed(self, game_state):
+        game_state.reveal_card(1, BLUE)
+        assert game_state.wait_for_reveal(1, timeout=0) == BLUE
+
+    def test_times_out_when_not_revealed(self, game_state):
+        assert game_state.wait_for_reveal(1, timeout=0.05) is None
+
+    def test_wakes_up_on_reveal_from_other_thread(self, game_state):
+        timer = threading.Timer(0.05, game_state.reveal_card, args=(2, RED))
+        start = time.perf_counter()
+        timer.start()
+        result = game_state.wait_for_reveal(2, timeout=5)
+        elapsed = time.perf_counter() - start
+        assert result == RED
+        assert elapsed < 0.5
+
+    def test_other_card_reveal_does_not_wake_waiter(self, game_state):
+        threading.Timer(0.01, game_state.reveal_card, args=(0, RED)).start()
+        assert game_state.wait_for_reveal(2, timeout=0.1) is None
+
+
+class TestSubscriptions:
+    def test_subscriber_receives_versioned_changes(self, game_state):
+        changes = []
+        game_state.subscribe(changes.append)
+        game_state.reveal_card(0, BLUE)
+        game_state.unreveal_card(0)
+        assert changes == [
+            {"type": "reveal", "idx": 0, "team": BLUE, "version": 1},
+            {"type": "unreveal", "idx": 0, "team": None, "version": 2},
+        ]
+        assert game_state.version == 2
+
+    def test_invalid_reveal_does_not_notify(self, game_state):
+        changes = []
+        game_state.subscribe(changes.append)
+        assert game_state.reveal_card(0, "purple") is False
+        assert game_state.unreveal_card(1) is False
+        assert changes == []
+        assert game_state.version == 0
+
+    def test_unsubscribe_stops_notifications(self, game_state):
+        changes = []
+        game_state.subscribe(changes.append)
+        game_state.unsubscribe(changes.append)
+        game_state.reveal_card(0, BLUE)
+        assert changes == []
+
+    def test_concurrent_changes_are_published_in_version_order(self, game_state):
+        seen = []
+        other = threading.Thread(target=game_state.reveal_card, args=(1, RED))
+
+        def slow(change):
+            if change["version"] == 1:
+                # A reveal from another thread while the first change is still being published
+                other.start()
+                other.join(0.1)
+            seen.append(change["version"])
+
+        game_state.subscribe(slow)
+        game_state.reveal_card(0, BLUE)
+        other.join()
+        assert seen == [1, 2]
+
+    def test_failing_subscriber_does_not_break_reveal(self, game_state):
+        def broken(change):
+            raise RuntimeError("boom")
+
+        game_state.subscribe(broken)
+        assert game_state.reveal_card(0, BLUE) is True
+        assert game_state.revealed[0] == BLUE
+
+
+class TestReset:
+    def test_reset_unreveals_cards_and_clears_progress(self, game_state):
+        changes = []
+        game_state.subscribe(changes.append)
+        game_state.reveal_card(0, RED)
+        game_state.reveal_card(2, BLUE)
+        game_state.turn = 3
+        game_state.game_over = True
+        game_state.win = False
+        game_state.history.append({"turn": 0})
+
+        game_state.reset()
+
+        assert game_state.revealed == {}
+        assert (game_state.turn, game_state.game_over, game_state.win, game_state.history) == (0, False, None, [])
+        assert [c["type"] for c in changes] == ["reveal", "reveal", "unreveal", "unreveal"]
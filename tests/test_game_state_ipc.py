@@ -0,0 +1,130 @@
+import json
+import queue
+import threading
+import urllib.request
+
+import pytest
+
+from interaction import game_state as game_state_module
+from interaction import game_state_server
+from interaction.game_state import GameState, BLUE, RED
+from interaction import game_state_ipc
+from interaction.game_state_ipc import GameStateIPCServer, RemoteGameState, ipc_authkey
+from interaction.game_state_server import PooledWSGIServer
+
+
+@pytest.fixture
+def game_state(tmp_path, monkeypatch):
+    descriptions = tmp_path / "card_descriptions.json"
+    descriptions.write_text(json.dumps({"1.png": "a", "2.png": "b"}))
+    monkeypatch.setattr(game_state_module, "CARD_DESCRIPTIONS_PATH", str(descriptions))
+    monkeypatch.setattr(game_state_module, "start_game_state_server", lambda gs, **kwargs: None)
+    return GameState(board=["1.png", "2.png"])
+
+
+@pytest.fixture
+def remote(game_state):
+    server = GameStateIPCServer(game_state, address=("127.0.0.1", 0)).start()
+    client = RemoteGameState(address=server.address)
+    yield client
+    client.close()
+    server.close()
+
+
+class TestRemoteGameState:
+    def test_reads_and_calls_go_to_the_game_process(self, game_state, remote):
+        assert remote.board == ["1.png", "2.png"]
+        assert remote.reveal_card(1, RED) is True
+        assert game_state.revealed == {1: RED}
+        assert remote.snapshot() == (1, {1: RED})
+        assert remote.version == 1
+
+    def test_invalid_calls_return_like_local_ones(self, remote):
+        assert remote.reveal_card(0, "purple") is False
+
+    def test_changes_are_pushed_to_subscribers(self, game_state, remote):
+        received = queue.Queue()
+        remote.subscribe(received.put)
+        # Wait until the game process registered the subscription
+        for _ in range(100):
+            if game_state._subscribers:
+                break
+            threading.Event().wait(0.01)
+        game_state.reveal_card(0, BLUE)
+        assert received.get(timeout=2) == {"type": "reveal", "idx": 0, "team": BLUE, "version": 1}
+
+    def test_private_methods_are_not_exposed(self, remote):
+        with pytest.raises(RuntimeError):
+            remote._request("call", "_record_change", ({},))
+
+    def test_stuck_subscriber_does_not_block_reveals(self, game_state):
+        class _StuckConnection:
+            """A web server process that stopped reading: send blocks until released."""
+
+            def __init__(self):
+                self.release = threading.Event()
+                self.closed = threading.Event()
+                self.sent = []
+
+            def send(self, change):
+                self.release.wait()
+                self.sent.append(change["version"])
+
+            def poll(self, timeout):
+                return self.closed.is_set()
+
+            def recv(self):
+                raise EOFError
+
+        server = GameStateIPCServer(game_state, address=("127.0.0.1", 0))
+        conn = _StuckConnection()
+        pusher = threading.Thread(target=server._push_changes, args=(conn,), daemon=True)
+        pusher.start()
+        for _ in range(100):
+            if game_state._subscribers:
+                break
+            threading.Event().wait(0.01)
+
+        done = threading.Event()
+        threading.Thread(target=lambda: (game_state.reveal_card(0, BLUE), game_state.reveal_card(1, RED),
+                                         done.set()), daemon=True).start()
+        assert done.wait(2)
+
+        conn.release.set()
+        for _ in range(100):
+            if len(conn.sent) == 2:
+                break
+            threading.Event().wait(0.01)
+        assert conn.sent == [1, 2]
+        conn.closed.set()
+        pusher.join(5)
+        assert game_state._subscribers == []
+        server.close()
+
+
+class TestAuthkey:
+    def test_wrong_key_is_rejected(self, game_state):
+        server = GameStateIPCServer(game_state, address=("127.0.0.1", 0), authkey=b"right").start()
+        with pytest.raises(Exception):
+            RemoteGameState(address=server.address, authkey=b"wrong")
+        server.close()
+
+    def test_key_comes_from_the_environment_or_is_generated_per_run(self, monkeypatch):
+        monkeypatch.delenv(game_state_ipc.IPC_AUTHKEY_ENV, raising=False)
+        generated = ipc_authkey()
+        assert len(generated) >= 16 and ipc_authkey() == generated
+        monkeypatch.setenv(game_state_ipc.IPC_AUTHKEY_ENV, "from-config")
+        assert ipc_authkey() == b"from-config"
+
+
+class TestPooledWSGIServer:
+    def test_serves_requests_from_the_pool(self):
+        server = PooledWSGIServer("127.0.0.1", 0, game_state_server.app, workers=2)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/ping"
+            results = [urllib.request.urlopen(url, timeout=5).read() for _ in range(5)]
+            assert results == [b"OK"] * 5
+        finally:
+            server.shutdown()
+            server.server_close()
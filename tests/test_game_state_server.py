@@ -0,0 +1,174 @@
+import http.client
+import io
+import json
+import threading
+
+import pytest
+
+from interaction import game_state as game_state_module
+from interaction import game_state_server
+from interaction.game_state import GameState, BLUE, RED
+from interaction.game_state_server import ChangeFeed, PooledWSGIServer
+
+
+@pytest.fixture
+def game_state(tmp_path, monkeypatch):
+    """A GameState wired to the server module's change feed, without starting the web server."""
+    descriptions = tmp_path / "card_descriptions.json"
+    descriptions.write_text(json.dumps({"1.png": "a", "2.png": "b", "3.png": "c"}))
+    monkeypatch.setattr(game_state_module, "CARD_DESCRIPTIONS_PATH", str(descriptions))
+    monkeypatch.setattr(game_state_module, "start_game_state_server", lambda gs, **kwargs: None)
+    gs = GameState(board=["1.png", "2.png", "3.png"])
+    feed = ChangeFeed()
+    gs.subscribe(feed.publish)
+    monkeypatch.setattr(game_state_server, "game_state", gs)
+    monkeypatch.setattr(game_state_server, "change_feed", feed)
+    return gs
+
+
+def _parse_event(raw):
+    fields = dict(line.split(": ", 1) for line in raw.strip().split("\n"))
+    return fields["event"], int(fields["id"]), json.loads(fields["data"])
+
+
+class TestChangeFeed:
+    def test_since_returns_newer_changes(self):
+        feed = ChangeFeed()
+        for v in (1, 2, 3):
+            feed.publish({"version": v})
+        assert [c["version"] for c in feed.since(1)] == [2, 3]
+        assert feed.since(3) == []
+
+    def test_since_reports_dropped_changes(self):
+        feed = ChangeFeed(maxlen=2)
+        for v in (1, 2, 3):
+            feed.publish({"version": v})
+        assert feed.since(0) is None
+        assert [c["version"] for c in feed.since(1)] == [2, 3]
+
+    def test_wait_times_out_without_changes(self):
+        assert ChangeFeed().wait(0, timeout=0.01) == []
+
+
+class TestEventStream:
+    def test_new_client_gets_snapshot_then_changes(self, game_state):
+        game_state.reveal_card(0, RED)
+        stream = game_state_server._event_stream(keepalive=0.01)
+
+        event, version, data = _parse_event(next(stream))
+        assert event == "snapshot"
+        assert version == 1
+        assert data["revealed"] == {"0": RED}
+
+        game_state.reveal_card(2, BLUE)
+        event, version, data = _parse_event(next(stream))
+        assert (event, version) == ("change", 2)
+        assert data == {"type": "reveal", "idx": 2, "team": BLUE, "version": 2}
+
+    def test_reconnecting_client_catches_up_from_version(self, game_state):
+        game_state.reveal_card(0, RED)
+        game_state.reveal_card(1, BLUE)
+        game_state.unreveal_card(0)
+        stream = game_state_server._event_stream(since=1, keepalive=0.01)
+        events = [_parse_event(next(stream)) for _ in range(2)]
+        assert [(e, v) for e, v, _ in events] == [("change", 2), ("change", 3)]
+        assert events[1][2]["type"] == "unreveal"
+
+    def test_client_ahead_of_server_gets_snapshot(self, game_state):
+        stream = game_state_server._event_stream(since=42, keepalive=0.01)
+        event, version, _ = _parse_event(next(stream))
+        assert (event, version) == ("snapshot", 0)
+
+    def test_idle_stream_sends_keepalive(self, game_state):
+        stream = game_state_server._event_stream(since=0, keepalive=0.01)
+        assert next(stream).startswith(":")
+
+    def test_stream_ends_when_feed_closes(self, game_state):
+        stream = game_state_server._event_stream(since=0, keepalive=5)
+        game_state_server.change_feed.close()
+        assert list(stream) == []
+
+
+class TestPooledServer:
+    @pytest.fixture
+    def server(self, game_state, monkeypatch):
+        monkeypatch.setattr(game_state_server, "sse_slots", threading.BoundedSemaphore(1))
+        server = PooledWSGIServer("127.0.0.1", 0, game_state_server.app, workers=2)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    @staticmethod
+    def _get(server, path):
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        conn.request("GET", path)
+        return conn.getresponse()
+
+    def test_workers_are_daemon_threads(self, server):
+        workers = [t for t in threading.enumerate() if t.name.startswith("state-server-")]
+        assert len(workers) >= 2
+        assert all(t.daemon for t in workers)
+
+    def test_extra_stream_is_told_to_retry(self, server):
+        first = self._get(server, "/events")
+        assert first.readline().startswith(b"event: snapshot")
+        second = self._get(server, "/events")
+        assert second.read().startswith(b"retry:")
+        # The open stream leaves a worker for ordinary requests
+        assert self._get(server, "/state").status == 200
+        first.close()
+
+    def test_server_close_ends_open_streams(self, server):
+        stream = self._get(server, "/events")
+        stream.readline()
+        server.shutdown()
+        server.server_close()
+        stream.read()  # returns at the end of the stream instead of timing out
+        assert stream.isclosed()
+
+
+def test_state_route_includes_version(game_state):
+    game_state.reveal_card(1, BLUE)
+    response = game_state_server.app.test_client().get("/state")
+    assert response.get_json() == {"revealed": {"1": BLUE}, "version": 1}
+
+
+class TestCardImages:
+    @pytest.fixture
+    def client(self, game_state, tmp_path, monkeypatch):
+        from PIL import Image
+        cards = tmp_path / "cards"
+        cards.mkdir()
+        for name in game_state.board:
+            Image.new("RGB", (800, 1200), "white").save(cards / name)
+        monkeypatch.setattr(game_state_server, "CARDS_DIR", str(cards))
+        monkeypatch.setattr(game_state_server, "image_cache", None)
+        return game_state_server.app.test_client()
+
+    def test_resized_variant_with_validators(self, client):
+        resp = client.get("/card/0?w=400", headers={"Accept": "image/webp,*/*"})
+        assert resp.status_code == 200
+        assert resp.mimetype == "image/webp"
+        assert resp.headers["ETag"]
+        assert "no-cache" in resp.headers["Cache-Control"]
+
+        from PIL import Image
+        assert Image.open(io.BytesIO(resp.data)).width == 400
+
+    def test_conditional_request_gets_304(self, client):
+        etag = client.get("/card/1").headers["ETag"]
+        resp = client.get("/card/1", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.data == b""
+
+    def test_board_token_urls_are_immutable(self, client):
+        token = game_state_server.board_token()
+        resp = client.get(f"/card/2?w=200&b={token}")
+        assert resp.mimetype == "image/png"
+        assert "immutable" in resp.headers["Cache-Control"]
+        assert "max-age" in resp.headers["Cache-Control"]
+
+    def test_unknown_card_is_404(self, client):
+        assert client.get("/card/99").status_code == 404
@@ -1,6 +1,6 @@
 import pytest
 
-from interaction.utils import parse_clue
+from interaction.utils import parse_clue, StreamingClueDetector
 
 
 # ---------------------------------------------------------------------------
@@ -97,3 +97,47 @@ class TestErrorCases:
         # Only stopwords before the number
         with pytest.raises(ValueError):
             parse_clue("the a an 3")
+
+
+# ---------------------------------------------------------------------------
+# Streaming detection on partial transcripts
+# ---------------------------------------------------------------------------
+
+class TestStreamingClueDetector:
+    def test_clue_is_reported_once_stable(self):
+        detector = StreamingClueDetector(stable_partials=2)
+        assert detector.feed("ocean") is None
+        assert detector.feed("ocean 2") is None
+        assert detector.feed("ocean 2.") == ("ocean", 2)
+
+    def test_changed_clue_restarts_stability(self):
+        detector = StreamingClueDetector(stable_partials=2)
+        detector.feed("river 2")
+        assert detector.feed("river 3") is None
+        assert detector.feed("river 3") == ("river", 3)
+
+    def test_number_must_end_the_partial(self):
+        detector = StreamingClueDetector(stable_partials=1)
+        # "for" is heard as 4 while the spymaster is still talking
+        assert detector.feed("river for the") is None
+        assert detector.feed("river 4") == ("river", 4)
+
+    def test_homophone_number_word_does_not_end_the_clue(self):
+        detector = StreamingClueDetector(stable_partials=1)
+        assert detector.feed("i want you to") is None
+        assert detector.feed("river too") is None
+        assert detector.feed("river two") == ("river", 2)
+        # The final parse still reads the homophone as a number
+        assert parse_clue("river too") == ("river", 2)
+
+    def test_losing_the_clue_clears_it(self):
+        detector = StreamingClueDetector(stable_partials=1)
+        assert detector.feed("castle 5") == ("castle", 5)
+        assert detector.feed("castle 5 no wait") is None
+        assert detector.clue is None
+
+    def test_reset(self):
+        detector = StreamingClueDetector(stable_partials=2)
+        detector.feed("fire 3")
+        detector.reset()
+        assert detector.feed("fire 3") is None
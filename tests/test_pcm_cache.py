@@ -0,0 +1,58 @@
+from agents.tts_manager import PCMCache
+
+
+class TestPCMCacheKey:
+    def test_unamplified_key_ignores_amplification_parameters(self):
+        assert PCMCache.make_key("abc") == PCMCache.make_key("abc", compression_strength=5.0)
+
+    def test_amplified_and_plain_keys_differ(self):
+        assert PCMCache.make_key("abc") != PCMCache.make_key("abc", amplified=True)
+
+    def test_amplification_parameters_are_part_of_key(self):
+        assert (PCMCache.make_key("abc", amplified=True, target_level=0.9)
+                != PCMCache.make_key("abc", amplified=True, target_level=0.5))
+
+
+class TestPCMCache:
+    def test_get_returns_stored_clip(self):
+        cache = PCMCache()
+        key = PCMCache.make_key("abc")
+        cache.put(key, b"\x00\x01" * 10, 22050)
+        assert cache.get(key) == (b"\x00\x01" * 10, 22050)
+
+    def test_missing_key_returns_none(self):
+        assert PCMCache().get(PCMCache.make_key("missing")) is None
+
+    def test_least_recently_used_clip_is_evicted(self):
+        cache = PCMCache(max_bytes=30)
+        a, b, c = (PCMCache.make_key(k) for k in "abc")
+        cache.put(a, b"a" * 10, 22050)
+        cache.put(b, b"b" * 10, 22050)
+        cache.get(a)  # a is now more recent than b
+        cache.put(c, b"c" * 15, 22050)
+        assert a in cache
+        assert b not in cache
+        assert c in cache
+        assert cache.size_bytes == 25
+
+    def test_clip_larger_than_budget_is_not_cached(self):
+        cache = PCMCache(max_bytes=5)
+        cache.put(PCMCache.make_key("big"), b"x" * 10, 22050)
+        assert len(cache) == 0
+
+    def test_replacing_a_clip_updates_size(self):
+        cache = PCMCache()
+        key = PCMCache.make_key("abc")
+        cache.put(key, b"x" * 10, 22050)
+        cache.put(key, b"y" * 4, 22050)
+        assert cache.size_bytes == 4
+        assert cache.get(key) == (b"y" * 4, 22050)
+
+    def test_invalidate_drops_all_variants(self):
+        cache = PCMCache()
+        cache.put(PCMCache.make_key("abc"), b"x" * 4, 22050)
+        cache.put(PCMCache.make_key("abc", amplified=True), b"y" * 4, 22050)
+        cache.put(PCMCache.make_key("def"), b"z" * 4, 22050)
+        cache.invalidate("abc")
+        assert len(cache) == 1
+        assert cache.size_bytes == 4
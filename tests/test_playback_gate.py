@@ -0,0 +1,84 @@
+import time
+
+from agents.playback_gate import PlaybackGate, BargeInDetector
+
+
+class TestPlaybackGate:
+    def test_playback_interval_includes_echo_tail(self):
+        gate = PlaybackGate(echo_tail=0.05)
+        with gate.playing():
+            assert gate.is_playing()
+        end = time.time()
+        assert gate.is_playing(end + 0.01)
+        assert not gate.is_playing(end + 0.2)
+
+    def test_duration_covers_non_blocking_players(self):
+        gate = PlaybackGate(echo_tail=0.0)
+        with gate.playing(duration=0.5):
+            pass
+        assert gate.is_playing(time.time() + 0.3)
+        assert 0.3 < gate.remaining() <= 0.5
+
+    def test_overlaps_only_robot_intervals(self):
+        gate = PlaybackGate(echo_tail=0.0)
+        before = time.time()
+        time.sleep(0.02)
+        with gate.playing():
+            time.sleep(0.02)
+        assert not gate.overlaps(before - 1, before)
+        assert gate.overlaps(before, time.time())
+
+    def test_wait_until_quiet_only_waits_for_the_tail(self):
+        gate = PlaybackGate(echo_tail=0.05)
+        with gate.playing():
+            pass
+        start = time.time()
+        assert gate.wait_until_quiet(timeout=1)
+        assert time.time() - start < 0.2
+        assert gate.remaining() == 0.0
+
+    def test_quiet_gate_does_not_wait(self):
+        assert PlaybackGate().remaining() == 0.0
+
+
+class TestBargeInDetector:
+    def test_sustained_speech_during_playback_is_barge_in(self):
+        gate = PlaybackGate()
+        detector = BargeInDetector(gate, rms_threshold=0.1, min_seconds=0.3, calibration_seconds=0)
+        for _ in range(2):
+            detector.feed(0.5, 0.1, during_playback=True)
+        assert not gate.barge_in_requested()
+        detector.feed(0.5, 0.1, during_playback=True)
+        assert gate.barge_in_requested()
+        gate.clear_barge_in()
+        assert not gate.barge_in_requested()
+
+    def test_quiet_blocks_or_silence_reset_the_count(self):
+        gate = PlaybackGate()
+        detector = BargeInDetector(gate, rms_threshold=0.1, min_seconds=0.3, calibration_seconds=0)
+        detector.feed(0.5, 0.2, during_playback=True)
+        detector.feed(0.01, 0.1, during_playback=True)
+        detector.feed(0.5, 0.2, during_playback=True)
+        detector.feed(0.5, 0.2, during_playback=False)
+        assert not gate.barge_in_requested()
+
+    def test_loud_playback_echo_alone_is_not_barge_in(self):
+        gate = PlaybackGate()
+        detector = BargeInDetector(gate, rms_threshold=0.05, min_seconds=0.3, calibration_seconds=1.0)
+        # The robot speaks alone: its echo on the mic is far above the fixed threshold
+        for i in range(50):
+            detector.feed(0.2 + 0.02 * (i % 3), 0.1, during_playback=True)
+        assert not gate.barge_in_requested()
+        assert 0.2 <= detector.echo_level() <= 0.25
+
+        # The participant talks over the robot
+        for _ in range(3):
+            detector.feed(0.8, 0.1, during_playback=True)
+        assert gate.barge_in_requested()
+
+    def test_nothing_fires_while_the_echo_is_measured(self):
+        gate = PlaybackGate()
+        detector = BargeInDetector(gate, rms_threshold=0.05, min_seconds=0.3, calibration_seconds=1.0)
+        for _ in range(9):
+            detector.feed(0.8, 0.1, during_playback=True)
+        assert not gate.barge_in_requested()
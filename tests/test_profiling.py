@@ -0,0 +1,70 @@
+import time
+
+from interaction.profiling import SamplingProfiler, StageProfiler, peak_rss_mb
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestStageProfiler:
+    def test_records_wall_and_cpu_time_per_stage(self):
+        profiler = StageProfiler()
+        with profiler.stage("mfcc"):
+            _busy(0.05)
+        with profiler.stage("transcribe"):
+            time.sleep(0.05)
+        with profiler.stage("mfcc"):
+            _busy(0.05)
+
+        result = profiler.result()
+
+        assert list(result["stages"]) == ["mfcc", "transcribe"]
+        assert result["stages"]["mfcc"]["wall_s"] >= 0.1
+        assert result["stages"]["mfcc"]["cpu_s"] > 0.05
+        # Sleeping takes wall time but (almost) no CPU time
+        assert result["stages"]["transcribe"]["cpu_s"] < result["stages"]["transcribe"]["wall_s"]
+        assert result["total_wall_s"] >= 0.15
+
+    def test_stage_is_recorded_when_it_raises(self):
+        profiler = StageProfiler()
+        try:
+            with profiler.stage("load"):
+                raise RuntimeError("unreadable file")
+        except RuntimeError:
+            pass
+        assert "load" in profiler.result()["stages"]
+
+    def test_reset_starts_a_new_job(self):
+        profiler = StageProfiler()
+        with profiler.stage("load"):
+            pass
+        profiler.reset()
+        assert profiler.result()["stages"] == {}
+
+    def test_peak_rss(self):
+        peak = peak_rss_mb()
+        assert peak is None or peak > 0
+
+
+def _hot_function():
+    _busy(0.2)
+
+
+class TestSamplingProfiler:
+    def test_dumps_collapsed_stacks_of_the_sampled_thread(self, tmp_path):
+        sampler = SamplingProfiler(interval=0.002)
+        sampler.start()
+        _hot_function()
+        sampler.stop()
+
+        path = sampler.dump(str(tmp_path / "profiles" / "worker.txt"))
+
+        lines = open(path, encoding="utf-8").read().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert any("_hot_function" in line for line in lines)
+        assert "sampling-profiler" not in stack
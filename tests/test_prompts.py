@@ -2,7 +2,7 @@ import json
 
 import pytest
 
-from interaction.prompts import SYSTEM_PROMPT_ADAPTIVE, build_user_prompt
+from interaction.prompts import SYSTEM_PROMPT_ADAPTIVE, PromptBuilder, build_user_prompt, compact_card_description
 
 
 # ---------------------------------------------------------------------------
@@ -249,6 +249,84 @@ class TestBuildUserPromptHistory:
         assert len(parsed) == 1
 
 
+
+# ---------------------------------------------------------------------------
+# Compact, cached prompt building
+# ---------------------------------------------------------------------------
+
+class TestCompactCardDescription:
+    def test_dict_description_is_flattened_to_one_line(self):
+        description = {"objects": ["house", "moon"], "setting_environment": "nighttime"}
+        assert compact_card_description(description) == "objects: house, moon; setting_environment: nighttime"
+
+    def test_string_description_is_unchanged(self):
+        assert compact_card_description("A red fruit") == "A red fruit"
+
+
+class TestPromptBuilder:
+    def test_user_prompt_matches_stateless_builder(self):
+        state = _FakeGameState()
+        state.revealed[0] = "blue"
+        assert PromptBuilder(state).build_user_prompt("peak", "low") == build_user_prompt("peak", state, "low")
+
+    def test_system_prompt_prefix_is_reused_across_guesses(self):
+        state = _FakeGameState()
+        builder = PromptBuilder(state)
+        first = builder.system_prompt(SYSTEM_PROMPT_ADAPTIVE)
+        state.revealed[1] = "red"
+        state.history.append({"turn": 1, "clue": "peak", "guess_number": 1, "guess": 1, "result": "red"})
+        assert builder.system_prompt(SYSTEM_PROMPT_ADAPTIVE) is first
+        assert first.startswith(SYSTEM_PROMPT_ADAPTIVE.rstrip())
+        assert "A flowing body of water" in first
+
+    def test_board_in_system_prompt_lists_only_unrevealed_indices(self):
+        state = _FakeGameState()
+        state.revealed[1] = "red"
+        prompt = PromptBuilder(state).build_user_prompt("fruit", board_in_system_prompt=True)
+        assert "0, 2" in prompt
+        assert "A red fruit" not in prompt
+
+    def test_history_summary_updates_incrementally(self):
+        state = _FakeGameState()
+        builder = PromptBuilder(state)
+        assert _extract_previous_clues(builder.build_user_prompt("water")) == []
+
+        state.history.append({"turn": 1, "clue": "water", "guess_number": 1, "guess": 0, "result": "blue"})
+        parsed = _extract_previous_clues(builder.build_user_prompt("water"))
+        assert parsed[0]["guesses"] == [{"card": "river", "result": "blue"}]
+
+        state.history.append({"turn": 1, "clue": "water", "guess_number": 2, "guess": 1, "result": "red"})
+        parsed = _extract_previous_clues(builder.build_user_prompt("water"))
+        assert len(parsed) == 1
+        assert [g["card"] for g in parsed[0]["guesses"]] == ["river", "mountain"]
+
+    def test_replaced_history_is_resummarised(self):
+        state = _FakeGameState()
+        builder = PromptBuilder(state)
+        state.history.append({"turn": 1, "clue": "water", "guess_number": 1, "guess": 0, "result": "blue"})
+        builder.build_user_prompt("water")
+        state.history = []
+        assert _extract_previous_clues(builder.build_user_prompt("water")) == []
+
+    def test_pending_guess_prompt_matches_prompt_after_recording_it(self):
+        state = _FakeGameState()
+        builder = PromptBuilder(state)
+        entry = {"turn": 1, "clue": "water", "confidence": "high", "guess_number": 1,
+                 "guess": 0, "card": "river", "result": "blue"}
+        speculative = builder.build_user_prompt("water", "high", board_in_system_prompt=True, pending_guess=entry)
+        # The cached summary is not touched by the pending guess
+        assert _extract_previous_clues(builder.build_user_prompt("water")) == []
+
+        state.revealed[0] = "blue"
+        state.history.append(entry)
+        assert builder.build_user_prompt("water", "high", board_in_system_prompt=True) == speculative
+
+    def test_prompt_cache_key_is_stable(self):
+        state = _FakeGameState()
+        builder = PromptBuilder(state)
+        assert builder.prompt_cache_key(SYSTEM_PROMPT_ADAPTIVE) == PromptBuilder(state).prompt_cache_key(SYSTEM_PROMPT_ADAPTIVE)
+
+
 def _extract_previous_clues(prompt):
     """Extract the JSON list from the 'Previous clues and outcomes' section."""
     marker = "Previous clues and outcomes:"
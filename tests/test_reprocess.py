@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import pytest
+
+sf = pytest.importorskip("soundfile")
+
+from interaction.audio_archive import AudioArchive  # noqa: E402
+from interaction.run_reprocess import (  # noqa: E402
+    build_report, classify_clips, collect_clips, recompute_features, write_calibration,
+)
+
+SAMPLE_RATE = 16000
+
+
+class _DurationExtractor:
+    """Stands in for ImportantFeaturesExtractor: the only feature is the clip duration."""
+
+    def extract(self, audio_path, profiler=None):
+        return {"duration": sf.info(audio_path).duration, "hnr": 1.0}
+
+
+def _make_extractor():
+    return _DurationExtractor()
+
+
+def _archive_clip(root, participant_id, turn, seconds, tmp_path):
+    wav_path = str(tmp_path / f"{turn}.wav")
+    sf.write(wav_path, np.zeros((int(seconds * SAMPLE_RATE), 2)), SAMPLE_RATE)
+    archive = AudioArchive(str(root), participant_id)
+    path, future = archive.add(wav_path, turn)
+    future.result(timeout=10)
+    archive.close()
+    return path
+
+
+@pytest.fixture
+def logs(tmp_path):
+    log_dir = tmp_path / "logs"
+    audio_root = log_dir / "audio"
+    turn_path = _archive_clip(audio_root, "7", 1, 2.0, tmp_path)
+    _archive_clip(audio_root, "7", "calibration_3", 1.0, tmp_path)
+    _archive_clip(audio_root, "8", 1, 1.0, tmp_path)
+    with open(log_dir / "session_7_20250101_120000.jsonl", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"participant_id": "7", "turn": 1, "clue": "ocean", "features": {"duration": 1.5},
+                            "confidence_level": "low", "audio_file": turn_path}) + "\n")
+        f.write(json.dumps({"participant_id": "7", "turn": 2, "clue": "tree", "features": {},
+                            "confidence_level": "high", "audio_file": None}) + "\n")
+    return log_dir
+
+
+class TestReprocess:
+    def test_collects_logged_turns_and_unlogged_archive_clips(self, logs):
+        clips = collect_clips(str(logs), participant_id="7")
+
+        assert [(c["turn"], c["kind"]) for c in clips] == [(1, "turn"), (2, "turn"), ("calibration_3", "calibration")]
+        assert clips[0]["logged_level"] == "low"
+        assert clips[1]["audio_path"] is None
+
+    def test_recomputes_in_parallel_and_reports_against_logged_levels(self, logs, tmp_path):
+        clips = collect_clips(str(logs), participant_id="7")
+
+        elapsed = recompute_features(clips, workers=2, make_extractor=_make_extractor)
+        calibration = write_calibration(clips, str(tmp_path / "out"))
+        classify_clips(clips, calibration)
+        report = build_report(clips)
+
+        assert elapsed > 0
+        assert clips[2]["features"]["duration"] == pytest.approx(1.0)
+        assert set(calibration) == {"7"}
+        assert list(report["status"]) == ["ok", "missing_audio"]
+        ok = report.iloc[0]
+        assert ok["new_level"] in ("low", "medium", "high")
+        assert ok["changed"] == (ok["new_level"] != "low")
+        assert ok["delta_duration"] == pytest.approx(0.5)
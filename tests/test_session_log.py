@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from interaction.session_log import SessionLog, read_session_log
+
+
+class TestSessionLog:
+    def test_entries_round_trip_in_order(self, tmp_path):
+        path = str(tmp_path / "session.jsonl")
+        log = SessionLog(path)
+        log.append({"turn": 0, "clue": "water"})
+        log.append({"turn": 1, "clue": "fire"})
+        # Durable before close: every entry is flushed when it is written
+        assert read_session_log(path) == [{"turn": 0, "clue": "water"}, {"turn": 1, "clue": "fire"}]
+        log.close()
+
+    def test_background_writer_writes_everything_by_close(self, tmp_path):
+        path = str(tmp_path / "session.jsonl")
+        log = SessionLog(path, background=True)
+        for turn in range(50):
+            log.append({"turn": turn})
+        log.close()
+        assert [e["turn"] for e in read_session_log(path)] == list(range(50))
+
+    @pytest.mark.parametrize("background", [False, True])
+    def test_append_after_close_raises_instead_of_dropping(self, tmp_path, background):
+        path = str(tmp_path / "session.jsonl")
+        log = SessionLog(path, background=background)
+        log.append({"turn": 0})
+        log.close()
+        with pytest.raises(ValueError, match="closed"):
+            log.append({"turn": 1})
+        log.close()  # closing twice is harmless
+        assert read_session_log(path) == [{"turn": 0}]
+
+    def test_appends_to_an_existing_log(self, tmp_path):
+        path = str(tmp_path / "session.jsonl")
+        first = SessionLog(path)
+        first.append({"turn": 0})
+        first.close()
+        second = SessionLog(path)
+        second.append({"turn": 1})
+        second.close()
+        assert len(read_session_log(path)) == 2
+
+    def test_reader_skips_a_line_cut_off_by_a_crash(self, tmp_path):
+        path = tmp_path / "session.jsonl"
+        path.write_text('{"turn": 0}\n{"turn": 1, "cl')
+        assert read_session_log(str(path)) == [{"turn": 0}]
+
+    def test_reader_loads_old_json_list_logs(self, tmp_path):
+        path = tmp_path / "session.json"
+        path.write_text(json.dumps([{"turn": 0}, {"turn": 1}], indent=2))
+        assert read_session_log(str(path)) == [{"turn": 0}, {"turn": 1}]
@@ -0,0 +1,79 @@
+import sqlite3
+
+import pytest
+
+from interaction import session_store
+from interaction.experiment_logger import ExperimentLogger
+from interaction.session_store import SessionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.db"))
+    yield store
+    store.close()
+
+
+def _log_turn(store, turn, confidence_level, features=None):
+    store.log_turn(turn, "water", 2, confidence_level, ["river"], ["blue"], 1, 10.0, features=features)
+
+
+class TestSessionStore:
+    def test_database_uses_wal(self, store):
+        assert store.query("PRAGMA journal_mode")[0]["journal_mode"] == "wal"
+
+    def test_turns_features_audio_and_utterances_round_trip(self, store):
+        session_id = store.start_session("p01", condition="adaptive")
+        store.set_session_info(board="01", key_map={"blue": [0]})
+        _log_turn(store, 0, "low", features={"duration": 3.5, "transcript": "water two"})
+        store.log_audio(0, "/audio/turn_0.wav")
+        store.log_utterance("robot", "Your move")
+        assert store.flush(timeout=2)
+
+        (turn,) = store.turns()
+        assert (turn["participant_id"], turn["condition"], turn["turn"]) == ("p01", "adaptive", 0)
+        assert turn["guesses"] == ["river"]
+        assert store.features(session_id, 0) == {"duration": 3.5, "transcript": "water two"}
+        assert store.query("SELECT key_map FROM sessions")[0]["key_map"] == '{"blue": [0]}'
+        assert store.query("SELECT speaker, text FROM utterances") == [{"speaker": "robot", "text": "Your move"}]
+
+    def test_cross_session_query_for_low_confidence_turns_with_audio(self, store):
+        for pid in ("p01", "p02"):
+            store.start_session(pid)
+            _log_turn(store, 0, "low")
+            store.log_audio(0, f"/audio/{pid}_0.wav")
+            _log_turn(store, 1, "high")
+            store.log_audio(1, f"/audio/{pid}_1.wav")
+            _log_turn(store, 2, "low")  # no recording
+            store.session_id = None
+        store.flush(timeout=2)
+
+        rows = store.turns(confidence_level="low", with_audio=True)
+        assert [r["audio_path"] for r in rows] == ["/audio/p01_0.wav", "/audio/p02_0.wav"]
+        assert len(store.turns(participant_id="p02")) == 3
+
+    def test_readers_see_committed_rows_while_the_writer_is_open(self, store, tmp_path):
+        store.start_session("p01")
+        _log_turn(store, 0, "medium")
+        store.flush(timeout=2)
+        reader = sqlite3.connect(str(tmp_path / "sessions.db"))
+        assert reader.execute("SELECT COUNT(*) FROM turns").fetchone()[0] == 1
+        reader.close()
+
+
+class TestCurrentSession:
+    def test_experiment_logger_writes_to_the_open_session(self, tmp_path):
+        store = session_store.open_session("p03", condition="baseline", path=str(tmp_path / "sessions.db"))
+        try:
+            logger = ExperimentLogger("p03", False, "02", key_map="7", log_dir=str(tmp_path))
+            logger.log_turn(turn=0, clue_word="fire", clue_number=1, features={"duration": 2.0},
+                            confidence_level=None, guesses=["sun"], outcomes=["red"], score=0, turn_duration_s=4.0)
+            logger.close(compact=False)
+            store.flush(timeout=2)
+            (turn,) = store.turns()
+            assert (turn["clue_word"], turn["confidence_level"], turn["outcomes"]) == ("fire", None, ["red"])
+            assert store.query("SELECT board, key_map FROM sessions") == [{"board": "02", "key_map": "7"}]
+            assert store.features(store.session_id, 0) == {"duration": 2.0}
+        finally:
+            session_store.close()
+        assert session_store.current() is None
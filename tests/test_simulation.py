@@ -0,0 +1,158 @@
+import json
+
+import pytest
+
+from agents.llm_agent import LLMAgent
+from interaction import simulation
+from interaction.game_state import BLUE
+from interaction.simulation import (
+    GuessPolicy, LatencyModel, RevealDriver, ScriptedSpymaster, SimClock, SimulatedAudioPipeline, SimulatedOpenAIClient, PilotClue,
+    find_regressions, load_pilot_clues, summarize,
+)
+from interaction.utils import parse_clue
+
+KEY_MAP = {"blue": [0, 1], "red": [2, 3], "neutral": [4], "assassin": 5}
+
+
+class FakeGameState:
+    def __init__(self, size=6):
+        self.board = [f"{i}.png" for i in range(size)]
+        self.revealed = {}
+
+    def is_revealed(self, idx):
+        return idx in self.revealed
+
+
+class FakeDriver:
+    def __init__(self):
+        self.red_cards = 0
+
+    def place_red_card(self):
+        self.red_cards += 1
+
+
+def instant_clock(seed=0):
+    return SimClock(time_scale=0.0, seed=seed)
+
+
+class TestLatencyModel:
+    def test_samples_follow_median_and_p95(self):
+        model = LatencyModel(1.0, 2.0)
+        clock = SimClock(latencies={"stt": model}, seed=3)
+        samples = sorted(clock.sample("stt") for _ in range(4000))
+        assert samples[2000] == pytest.approx(1.0, rel=0.1)
+        assert samples[3800] == pytest.approx(2.0, rel=0.15)
+
+    def test_parse(self):
+        assert (LatencyModel.parse("0.5").median, LatencyModel.parse("0.5").p95) == (0.5, 0.5)
+        assert LatencyModel.parse("0.5:1.5").p95 == 1.5
+        with pytest.raises(ValueError):
+            LatencyModel(2.0, 1.0)
+
+    def test_human_delays_get_the_extra_scale(self):
+        clock = SimClock(latencies={"reveal": LatencyModel(1.0), "stt": LatencyModel(1.0)},
+                         time_scale=0.5, human_scale=0.1)
+        assert clock.sample("reveal") == pytest.approx(0.05)
+        assert clock.sample("stt") == pytest.approx(0.5)
+
+
+class TestPilotClues:
+    def test_pilot_clues_parse_and_carry_features(self):
+        clues = load_pilot_clues()
+        assert len(clues) > 50
+        for clue in clues:
+            parse_clue(clue.text)
+        with_features = [c for c in clues if c.features]
+        assert with_features
+        assert isinstance(with_features[0].features["duration"], float)
+        assert isinstance(with_features[0].features["transcript"], str)
+
+
+class TestScriptedSpymaster:
+    def test_ready_then_clue_and_confirmation_per_turn(self):
+        clues = [PilotClue("1", "door 2", {}), PilotClue("2", "animal 3", {})]
+        driver = FakeDriver()
+        spymaster = ScriptedSpymaster(clues, instant_clock(), driver)
+        said = [spymaster.listen() for _ in range(5)]
+        assert said == ["i'm ready", "door 2", "yes", "animal 3", "yes"]
+        assert driver.red_cards == 2
+        assert spymaster.current_clue is clues[1]
+
+        spymaster.new_game()
+        assert spymaster.listen() == "i'm ready"
+        assert spymaster.listen() == "door 2"
+
+
+class TestGuessPolicy:
+    def test_never_repeats_revealed_or_pending_cards(self):
+        game_state = FakeGameState()
+        policy = GuessPolicy(KEY_MAP, game_state, instant_clock(), accuracy=1.0)
+        first = policy()
+        second = policy()
+        assert {first, second} == {0, 1}
+        game_state.revealed = {0: BLUE, 1: BLUE}
+        assert policy() in (2, 3, 4, 5)
+
+
+class TestRevealDriver:
+    def test_cards_missing_from_the_key_map_are_neutral(self):
+        driver = RevealDriver(KEY_MAP, instant_clock())
+        assert [driver.team_of(i) for i in range(7)] == ["blue", "blue", "red", "red", "neutral", "assassin", "neutral"]
+
+
+class TestSimulatedAudioPipeline:
+    def make_pipeline(self):
+        clues = load_pilot_clues()[:2]
+        spymaster = ScriptedSpymaster(clues, instant_clock(), FakeDriver())
+        spymaster.current_clue = clues[0]
+        return spymaster, clues, SimulatedAudioPipeline(spymaster, instant_clock())
+
+    def test_submit_returns_a_future_of_the_turn_analysis(self):
+        _, _, pipeline = self.make_pipeline()
+        features, confidence_level = pipeline.submit("door", 0).result(timeout=5)
+        assert (features, confidence_level) == pipeline.stop_and_process("door", 0)
+        assert confidence_level in ("low", "medium", "high")
+        pipeline.shutdown()
+
+    def test_speculation_is_used_only_for_the_same_clue(self):
+        spymaster, clues, pipeline = self.make_pipeline()
+        pipeline.speculate(0)
+        spymaster.current_clue = clues[1]  # the clue was repeated differently
+        features, _ = pipeline.submit("animal", 0).result(timeout=5)
+        assert features == pipeline._features(clues[1])
+
+        pipeline.speculate(1)
+        speculative = pipeline._speculation[1]
+        pipeline.submit("animal", 1).result(timeout=5)
+        assert speculative.done() and pipeline._speculation is None
+        pipeline.shutdown()
+
+
+class TestSimulatedOpenAIClient:
+    def make_agent(self, guess=3):
+        return LLMAgent(model="simulated", client=SimulatedOpenAIClient(lambda: guess, instant_clock()))
+
+    def test_prompt_llm_returns_a_guess(self):
+        response = self.make_agent().prompt_llm("system", "user")
+        assert response["guess_index"] == 3
+        assert response["reason"]
+
+    def test_stream_llm_yields_guess_field_and_sentences(self):
+        events = list(self.make_agent(guess=4).stream_llm("system", "user"))
+        assert ("field", "guess_index", 4) in events
+        assert any(e[0] == "sentence" for e in events)
+        assert events[-1][0] == "done" and events[-1][1]["guess_index"] == 4
+
+
+class TestSummary:
+    def test_summarize_trace_and_find_regressions(self, tmp_path):
+        trace = tmp_path / "trace.jsonl"
+        spans = [{"name": "say", "dur": d} for d in (0.1, 0.2, 0.3)] + [{"name": "listen", "dur": 1.0}]
+        trace.write_text("\n".join(json.dumps(s) for s in spans) + "\n")
+        summary = summarize(simulation.phase_latencies(str(trace)))
+        assert summary["say"] == {"count": 3, "p50_s": 0.2, "p95_s": 0.3}
+
+        baseline = {"say": {"p50_s": 0.2, "p95_s": 0.3}, "listen": {"p50_s": 0.5, "p95_s": 0.5}}
+        assert find_regressions(summary, baseline) == ["listen p50: 0.500s -> 1.000s",
+                                                       "listen p95: 0.500s -> 1.000s"]
+        assert find_regressions(summary, summary) == []
@@ -0,0 +1,115 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from agents.llm_agent import LLMAgent
+from agents.streaming_json import StreamingJSONParser, SentenceSplitter
+
+
+def _feed_in_pieces(parser, text, size=3):
+    for i in range(0, len(text), size):
+        parser.feed(text[i:i + size])
+
+
+# ---------------------------------------------------------------------------
+# StreamingJSONParser
+# ---------------------------------------------------------------------------
+
+class TestStreamingJSONParser:
+    def test_number_field_emitted_before_object_closes(self):
+        fields = []
+        parser = StreamingJSONParser(on_field=lambda k, v: fields.append((k, v)))
+        parser.feed('{"guess_index": 12, "reason": "I think')
+        assert fields == [("guess_index", 12)]
+        assert not parser.done
+
+    def test_all_fields_parsed_in_pieces(self):
+        payload = {"guess_index": 7, "reason": "It fits. Nothing else does!"}
+        parser = StreamingJSONParser()
+        _feed_in_pieces(parser, json.dumps(payload, indent=2))
+        assert parser.fields == payload
+        assert parser.done
+
+    def test_string_deltas_are_decoded(self):
+        deltas = []
+        parser = StreamingJSONParser(on_string_delta=lambda k, t: deltas.append((k, t)))
+        _feed_in_pieces(parser, json.dumps({"reason": 'say "hi"\n café'}), size=1)
+        assert "".join(t for _, t in deltas) == 'say "hi"\n café'
+        assert {k for k, _ in deltas} == {"reason"}
+
+    def test_unicode_escape_split_across_pieces(self):
+        parser = StreamingJSONParser()
+        _feed_in_pieces(parser, '{"reason": "caf\\u00e9"}', size=2)
+        assert parser.fields["reason"] == "café"
+
+    def test_leading_markdown_fence_is_skipped(self):
+        parser = StreamingJSONParser()
+        parser.feed('```json\n{"guess_index": 3, "ok": true, "none": null}\n```')
+        assert parser.fields == {"guess_index": 3, "ok": True, "none": None}
+
+
+# ---------------------------------------------------------------------------
+# SentenceSplitter
+# ---------------------------------------------------------------------------
+
+class TestSentenceSplitter:
+    def test_sentence_emitted_once_followed_by_whitespace(self):
+        splitter = SentenceSplitter()
+        assert splitter.feed("I think you meant the river.") == []
+        assert splitter.feed(" It flows") == ["I think you meant the river."]
+        assert splitter.flush() == ["It flows"]
+
+    def test_multiple_sentences_in_one_piece(self):
+        splitter = SentenceSplitter()
+        assert splitter.feed("Yes! Is it? Maybe… ok") == ["Yes!", "Is it?", "Maybe…"]
+
+    def test_flush_on_empty_returns_nothing(self):
+        assert SentenceSplitter().flush() == []
+
+
+# ---------------------------------------------------------------------------
+# LLMAgent.stream_llm
+# ---------------------------------------------------------------------------
+
+class _FakeCompletions:
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.kwargs = None
+
+    def create(self, **kwargs):
+        self.kwargs = kwargs
+        return iter(
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=p))])
+            for p in self.pieces
+        )
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    return LLMAgent()
+
+
+def test_stream_llm_yields_guess_before_reason_sentences(agent):
+    pieces = ['{"guess_', 'index": 4', ', "reason": "I think you ', 'meant the tree. ', 'It has leaves."}']
+    completions = _FakeCompletions(pieces)
+    agent.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    events = list(agent.stream_llm("system", "user"))
+
+    assert completions.kwargs["stream"] is True
+    assert events[0] == ("field", "guess_index", 4)
+    sentences = [e[1] for e in events if e[0] == "sentence"]
+    assert sentences == ["I think you meant the tree.", "It has leaves."]
+    assert events[-1] == ("done", {"guess_index": 4, "reason": "I think you meant the tree. It has leaves."})
+    metrics = agent.last_stream_metrics
+    assert metrics["field_times_s"]["guess_index"] <= metrics["time_to_first_sentence_s"]
+    assert metrics["total_s"] is not None
+
+
+def test_stream_llm_raises_on_invalid_json(agent):
+    completions = _FakeCompletions(['{"guess_index": 4, "reason": "cut off'])
+    agent.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    with pytest.raises(RuntimeError):
+        list(agent.stream_llm("system", "user"))
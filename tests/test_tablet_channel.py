@@ -0,0 +1,75 @@
+import http.client
+import json
+
+import pytest
+
+from agents.pepper_tablet.tablet_channel import TabletChannel, start_tablet_server, list_images
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / "images").mkdir()
+    (tmp_path / "images" / "1.png").write_bytes(b"png")
+    (tmp_path / "images" / "notes.txt").write_text("not an image")
+    (tmp_path / "index.html").write_text("<html></html>")
+    channel = TabletChannel(preload=list_images(str(tmp_path)))
+    httpd = start_tablet_server(str(tmp_path), channel, port=0)
+    yield channel, httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _read_event(response):
+    lines = []
+    while True:
+        line = response.fp.readline().decode("utf-8").rstrip("\n")
+        if not line:
+            if lines:
+                break
+            continue
+        if not line.startswith(":"):
+            lines.append(line)
+    fields = dict(line.split(": ", 1) for line in lines)
+    return fields["event"], json.loads(fields["data"])
+
+
+class TestTabletChannel:
+    def test_wait_ack_times_out_without_page(self):
+        channel = TabletChannel()
+        seq = channel.show("images/1.png")
+        assert channel.wait_ack(seq, timeout=0.01) is False
+        channel.ack(seq)
+        assert channel.wait_ack(seq, timeout=0.01) is True
+
+    def test_later_ack_confirms_earlier_updates(self):
+        channel = TabletChannel()
+        first = channel.show("images/1.png")
+        channel.ack(channel.show("images/2.png"))
+        assert channel.wait_ack(first, timeout=0.01) is True
+
+
+class TestTabletServer:
+    def test_page_gets_preload_list_and_pushed_images(self, server):
+        channel, port = server
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", "/events")
+        response = conn.getresponse()
+        assert _read_event(response) == ("preload", ["images/1.png"])
+        assert channel.wait_for_client(timeout=1)
+
+        seq = channel.show("images/1.png")
+        assert _read_event(response) == ("show", {"seq": seq, "src": "images/1.png"})
+
+        ack = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        ack.request("POST", "/ack", body=str(seq))
+        assert ack.getresponse().status == 204
+        assert channel.wait_ack(seq, timeout=1)
+        conn.close()
+
+    def test_images_are_cacheable(self, server):
+        _, port = server
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", "/images/1.png")
+        response = conn.getresponse()
+        assert response.status == 200
+        assert "max-age" in response.getheader("Cache-Control")
@@ -0,0 +1,104 @@
+import json
+import multiprocessing
+import threading
+
+import pytest
+
+from interaction import tracing
+from interaction.action_scheduler import ActionScheduler
+
+
+def _read_spans(path):
+    tracing.disable()  # flushes the writer thread
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _write_spans(path, count=200, size=20000):
+    tracing.configure(path=path)
+    for i in range(count):
+        with tracing.span("worker_span", i=i, payload="w" * size):
+            pass
+    tracing.disable()
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tracing.configure(path=str(tmp_path / "trace.jsonl"))
+    yield path
+    tracing.disable()
+
+
+class TestTracing:
+    def test_disabled_span_is_a_shared_no_op(self):
+        tracing.disable()
+        assert tracing.trace_path() is None
+        assert tracing.span("a") is tracing.span("b", x=1)
+        with tracing.span("noop"):
+            pass
+        tracing.record_span("noop", 0.0, 1.0)
+
+    def test_nested_spans_record_their_parent(self, trace_file):
+        with tracing.span("turn", turn=2):
+            with tracing.span("say", text="hi"):
+                pass
+        spans = {s["name"]: s for s in _read_spans(trace_file)}
+        assert spans["turn"]["parent"] is None
+        assert spans["say"]["parent"] == spans["turn"]["id"]
+        assert spans["turn"]["args"] == {"turn": 2}
+        assert spans["say"]["args"] == {"text": "hi"}
+        assert spans["turn"]["start"] <= spans["say"]["start"]
+        assert spans["turn"]["dur"] >= spans["say"]["dur"]
+
+    def test_exception_is_recorded_and_propagated(self, trace_file):
+        with pytest.raises(ValueError):
+            with tracing.span("parse_clue"):
+                raise ValueError("no number")
+        (span,) = _read_spans(trace_file)
+        assert span["args"]["error"] == "ValueError"
+
+    def test_traced_decorator_and_recorded_span(self, trace_file):
+        @tracing.traced("prompt_llm")
+        def prompt():
+            tracing.record_span("stream_llm", 10.0, 0.5, tokens=3)
+            return 42
+
+        assert prompt() == 42
+        spans = {s["name"]: s for s in _read_spans(trace_file)}
+        assert spans["stream_llm"]["parent"] == spans["prompt_llm"]["id"]
+        assert spans["stream_llm"]["dur"] == 0.5
+
+    def test_scheduled_actions_nest_under_the_submitting_span(self, trace_file):
+        scheduler = ActionScheduler(log=False)
+        with tracing.span("make_guess"):
+            scheduler.submit("display", tracing.traced("display_guess")(lambda: None))
+        assert scheduler.wait(timeout=2)
+        spans = {s["name"]: s for s in _read_spans(trace_file)}
+        assert spans["display_guess"]["parent"] == spans["make_guess"]["id"]
+        assert spans["display_guess"]["tid"] != threading.get_ident()
+
+    def test_chrome_trace_conversion(self, trace_file, tmp_path):
+        with tracing.span("listen"):
+            pass
+        _read_spans(trace_file)
+        out = tracing.to_chrome_trace(trace_file, str(tmp_path / "trace.chrome.json"))
+        with open(out, encoding="utf-8") as f:
+            events = json.load(f)["traceEvents"]
+        (complete,) = [e for e in events if e["ph"] == "X"]
+        assert complete["name"] == "listen"
+        assert complete["dur"] >= 0
+        assert complete["args"]["parent"] is None
+        assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in events)
+
+    def test_processes_sharing_a_trace_never_split_lines(self, trace_file):
+        # Lines longer than any write buffer, from the game process and a worker at the same time
+        worker = multiprocessing.get_context("spawn").Process(target=_write_spans, args=(trace_file,))
+        worker.start()
+        written = 0
+        while worker.is_alive() or written < 200:
+            with tracing.span("game_span", i=written, payload="g" * 20000):
+                pass
+            written += 1
+        worker.join(30)
+        spans = _read_spans(trace_file)
+        assert sorted(s["name"] for s in spans) == ["game_span"] * written + ["worker_span"] * 200
@@ -105,7 +105,7 @@ def _get_receive_clue_long_wait_ast():
     for node in ast.walk(tree):
         if isinstance(node, ast.ClassDef) and node.name == "GameLoop":
             for item in node.body:
-                if isinstance(item, ast.FunctionDef) and item.name == "receive_clue":
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name == "receive_clue":
                     for n in ast.walk(item):
                         if isinstance(n, ast.If):
                             for stmt in n.body: